@@ -2,3 +2,5 @@
 # Licensed under the BSD license.
 
 import mssql.functions  # noqa
+import mssql.options  # noqa
+import mssql.search  # noqa
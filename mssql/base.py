@@ -475,21 +475,27 @@ class DatabaseWrapper(BaseDatabaseWrapper):
         return _known_versions[self.alias]
 
     @cached_property
-    def to_azure_sql_db(self, _known_azures={}):
+    def engine_edition(self, _known_editions={}):
         """
-        Whether this connection is to a Microsoft Azure database server
+        Get SERVERPROPERTY('EngineEdition') of the server
 
-        The _known_azures default dictionary is created on the class. This is
+        The _known_editions default dictionary is created on the class. This is
         intentional - it allows us to cache this property's value across instances.
         Therefore, when Django creates a new database connection using the same
         alias, we won't need query the server again.
         """
-        if self.alias not in _known_azures:
+        if self.alias not in _known_editions:
             with self.temporary_connection() as cursor:
                 cursor.execute("SELECT CAST(SERVERPROPERTY('EngineEdition') AS integer)")
-                edition = cursor.fetchone()[0]
-                _known_azures[self.alias] = edition == EDITION_AZURE_SQL_DB or edition == EDITION_AZURE_SQL_MANAGED_INSTANCE
-        return _known_azures[self.alias]
+                _known_editions[self.alias] = cursor.fetchone()[0]
+        return _known_editions[self.alias]
+
+    @cached_property
+    def to_azure_sql_db(self):
+        """
+        Whether this connection is to a Microsoft Azure database server
+        """
+        return self.engine_edition in (EDITION_AZURE_SQL_DB, EDITION_AZURE_SQL_MANAGED_INSTANCE)
 
     def _execute_foreach(self, sql, table_names=None):
         cursor = self.cursor()
@@ -1,7 +1,6 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the BSD license.
 
-import types
 from itertools import chain
 
 import django
@@ -18,6 +17,8 @@ if django.VERSION >= (3, 1):
 if django.VERSION >= (4, 2):
     from django.core.exceptions import EmptyResultSet, FullResultSet
 
+from .options import is_memory_optimized
+
 def _as_sql_agv(self, compiler, connection):
     return self.as_sql(compiler, connection, template='%(function)s(CONVERT(float, %(field)s))')
 
@@ -110,15 +111,18 @@ def _as_sql_stddev(self, compiler, connection):
 
 
 def _as_sql_strindex(self, compiler, connection):
-    self.source_expressions.reverse()
-    sql = self.as_sql(compiler, connection, function='CHARINDEX')
-    self.source_expressions.reverse()
-    return sql
+    # CHARINDEX takes its arguments in the reverse order of STRPOS/INSTR
+    expression, expression_params = compiler.compile(self.source_expressions[0])
+    substring, substring_params = compiler.compile(self.source_expressions[1])
+    return 'CHARINDEX(%s, %s)' % (substring, expression), [*substring_params, *expression_params]
 
 
 def _as_sql_substr(self, compiler, connection):
     if len(self.get_source_expressions()) < 3:
-        self.get_source_expressions().append(Value(2**31 - 1))
+        # SUBSTRING requires a length, so default to the maximum nvarchar length
+        node = self.copy()
+        node.set_source_expressions([*self.get_source_expressions(), Value(2**31 - 1)])
+        return node.as_sql(compiler, connection)
     return self.as_sql(compiler, connection)
 
 
@@ -197,6 +201,72 @@ def _cursor_iter(cursor, sentinel, col_count, itersize):
 compiler.cursor_iter = _cursor_iter
 
 
+# Expression classes mapped to the function rendering them for SQL Server.
+# Renderers are called as ``renderer(node, compiler, connection)`` and must
+# not modify the node, which may be shared between querysets.
+_renderers = {
+    Avg: _as_sql_agv,
+    Chr: _as_sql_chr,
+    ConcatPair: _as_sql_concatpair,
+    Count: _as_sql_count,
+    Greatest: _as_sql_greatest,
+    Least: _as_sql_least,
+    Length: _as_sql_length,
+    LPad: _as_sql_lpad,
+    Repeat: _as_sql_repeat,
+    RPad: _as_sql_rpad,
+    StdDev: _as_sql_stddev,
+    StrIndex: _as_sql_strindex,
+    Substr: _as_sql_substr,
+    Trim: _as_sql_trim,
+    Variance: _as_sql_variance,
+}
+if django.VERSION >= (3, 1):
+    _renderers[json_KeyTransform] = _as_sql_json_keytransform
+if django.VERSION >= (4, 1):
+    _renderers[Window] = _as_sql_window
+
+# Renderer resolved for each concrete node class (None if there isn't one)
+_renderer_cache = {}
+
+
+def register_renderer(expression_class, renderer):
+    """
+    Register ``renderer(node, compiler, connection)`` to produce the SQL of
+    ``expression_class`` and its subclasses on SQL Server, in place of the
+    expression's own ``as_sql()``/``as_microsoft()``.
+    """
+    _renderers[expression_class] = renderer
+    _renderer_cache.clear()
+
+
+def unregister_renderer(expression_class):
+    """
+    Remove the renderer registered for ``expression_class``, if any, so the
+    renderers of its bases apply again.
+    """
+    _renderers.pop(expression_class, None)
+    _renderer_cache.clear()
+
+
+def get_renderer(expression_class):
+    """
+    Return the renderer registered for ``expression_class`` or the nearest of
+    its bases, or None.
+    """
+    try:
+        return _renderer_cache[expression_class]
+    except KeyError:
+        pass
+    renderer = None
+    for klass in expression_class.__mro__:
+        if klass in _renderers:
+            renderer = _renderers[klass]
+            break
+    _renderer_cache[expression_class] = renderer
+    return renderer
+
+
 class SQLCompiler(compiler.SQLCompiler):
 
     def as_sql(self, with_limits=True, with_col_aliases=False):
@@ -328,11 +398,20 @@ class SQLCompiler(compiler.SQLCompiler):
                         raise NotSupportedError('SKIP LOCKED is not supported on this database backend.')
                     elif of and not self.connection.features.has_select_for_update_of:
                         raise NotSupportedError('FOR UPDATE OF is not supported on this database backend.')
-                    for_update_part = self.connection.ops.for_update_sql(
-                        nowait=nowait,
-                        skip_locked=skip_locked,
-                        of=self.get_select_for_update_of_arguments(),
-                    )
+                    if is_memory_optimized(self.query.model):
+                        # Memory-optimized tables reject locking hints; rows
+                        # read with SERIALIZABLE are validated at commit instead
+                        if nowait or skip_locked:
+                            raise NotSupportedError(
+                                'NOWAIT and SKIP LOCKED are not supported on memory-optimized tables.'
+                            )
+                        for_update_part = 'WITH (SERIALIZABLE)'
+                    else:
+                        for_update_part = self.connection.ops.for_update_sql(
+                            nowait=nowait,
+                            skip_locked=skip_locked,
+                            of=self.get_select_for_update_of_arguments(),
+                        )
 
                 if for_update_part and self.connection.features.for_update_after_from:
                     from_.insert(1, for_update_part)
@@ -438,7 +517,9 @@ class SQLCompiler(compiler.SQLCompiler):
             self.query.reset_refcounts(refcounts_before)
 
     def compile(self, node, *args, **kwargs):
-        node = self._as_microsoft(node)
+        renderer = get_renderer(type(node))
+        if renderer is not None:
+            return renderer(node, self, self.connection)
         return super().compile(node, *args, **kwargs)
 
     def collapse_group_by(self, expressions, having):
@@ -483,49 +564,6 @@ class SQLCompiler(compiler.SQLCompiler):
     def _is_subquery(self, expression):
         return isinstance(expression, Subquery)
 
-    def _as_microsoft(self, node):
-        as_microsoft = None
-        if isinstance(node, Avg):
-            as_microsoft = _as_sql_agv
-        elif isinstance(node, Chr):
-            as_microsoft = _as_sql_chr
-        elif isinstance(node, ConcatPair):
-            as_microsoft = _as_sql_concatpair
-        elif isinstance(node, Count):
-            as_microsoft = _as_sql_count
-        elif isinstance(node, Greatest):
-            as_microsoft = _as_sql_greatest
-        elif isinstance(node, Least):
-            as_microsoft = _as_sql_least
-        elif isinstance(node, Length):
-            as_microsoft = _as_sql_length
-        elif isinstance(node, RPad):
-            as_microsoft = _as_sql_rpad
-        elif isinstance(node, LPad):
-            as_microsoft = _as_sql_lpad
-        elif isinstance(node, Repeat):
-            as_microsoft = _as_sql_repeat
-        elif isinstance(node, StdDev):
-            as_microsoft = _as_sql_stddev
-        elif isinstance(node, StrIndex):
-            as_microsoft = _as_sql_strindex
-        elif isinstance(node, Substr):
-            as_microsoft = _as_sql_substr
-        elif isinstance(node, Trim):
-            as_microsoft = _as_sql_trim
-        elif isinstance(node, Variance):
-            as_microsoft = _as_sql_variance
-        if django.VERSION >= (3, 1):
-            if isinstance(node, json_KeyTransform):
-                as_microsoft = _as_sql_json_keytransform
-        if django.VERSION >= (4, 1):
-            if isinstance(node, Window):
-                as_microsoft = _as_sql_window
-        if as_microsoft:
-            node = node.copy()
-            node.as_microsoft = types.MethodType(as_microsoft, node)
-        return node
-
 
 class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
     def get_returned_fields(self):
@@ -549,6 +587,11 @@ class SQLInsertCompiler(compiler.SQLInsertCompiler, SQLCompiler):
             auto_field_column = opts.auto_field.db_column or opts.auto_field.column
             columns = [f.column for f in fields]
             if auto_field_column in columns:
+                if is_memory_optimized(opts.model):
+                    raise NotSupportedError(
+                        'Explicit values cannot be inserted into the identity column of '
+                        'memory-optimized table %s.' % opts.db_table
+                    )
                 id_insert_sql = []
                 table = qn(opts.db_table)
                 sql_format = 'SET IDENTITY_INSERT %s ON; %s; SET IDENTITY_INSERT %s OFF'
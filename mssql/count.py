@@ -0,0 +1,99 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the BSD license.
+
+from django.db import DatabaseError, NotSupportedError, connections, router
+from django.db.models import Aggregate, BigIntegerField, QuerySet
+
+
+class ApproxCountDistinct(Aggregate):
+    """
+    Approximate number of distinct non-null values, computed by
+    APPROX_COUNT_DISTINCT (SQL Server 2019+ and Azure SQL) in far less memory
+    than COUNT(DISTINCT ...).
+    """
+    function = 'APPROX_COUNT_DISTINCT'
+    name = 'ApproxCountDistinct'
+    output_field = BigIntegerField()
+    empty_result_set_value = 0
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError('ApproxCountDistinct is only supported on SQL Server.')
+
+    def as_microsoft(self, compiler, connection, **extra_context):
+        if not connection.features.supports_approx_count_distinct:
+            raise NotSupportedError('ApproxCountDistinct requires SQL Server 2019 or later.')
+        return super().as_sql(compiler, connection, **extra_context)
+
+
+class ApproximateCountQuerySet(QuerySet):
+    """
+    QuerySet whose count() of a whole table is read from the row counts in
+    sys.dm_db_partition_stats instead of scanning it. The figure can trail
+    uncommitted or very recent changes, so tables with fewer rows than
+    ``approximate_count_threshold`` are still counted exactly, in the same
+    query, as are querysets with filters, joins, distinct or slicing.
+
+        class Event(models.Model):
+            ...
+            objects = ApproximateCountQuerySet.as_manager()
+    """
+    approximate_count_threshold = 1000000
+    # Heaps have index 0, clustered indexes index 1
+    sql_partition_row_count = (
+        "SELECT SUM(row_count) AS row_count FROM sys.dm_db_partition_stats "
+        "WHERE object_id = OBJECT_ID(%s) AND index_id IN (0, 1)"
+    )
+
+    def count(self):
+        if self._result_cache is None:
+            connection = self._table_count_connection()
+            if connection is not None:
+                table = connection.ops.quote_name(self.model._meta.db_table)
+                count = self._table_count(
+                    connection,
+                    "SELECT CASE WHEN s.row_count >= %%s THEN s.row_count ELSE (SELECT COUNT_BIG(*) FROM %s) END "
+                    "FROM (%s) AS s" % (table, self.sql_partition_row_count),
+                    [self.approximate_count_threshold, table],
+                )
+                if count is not None:
+                    return count
+        return super().count()
+
+    def approximate_count(self):
+        """
+        Return the number of rows of the table from its partition statistics,
+        or None if the queryset isn't a plain count of the table or the
+        statistics can't be read.
+        """
+        connection = self._table_count_connection()
+        if connection is None:
+            return None
+        return self._table_count(
+            connection, self.sql_partition_row_count, [connection.ops.quote_name(self.model._meta.db_table)],
+        )
+
+    def _table_count_connection(self):
+        """
+        Return the connection to count the table on, or None if the queryset
+        isn't a plain count of the table.
+        """
+        query = self.query
+        if (
+            query.where or query.distinct or query.low_mark or query.high_mark is not None or
+            query.combinator or query.group_by is not None or query.extra_tables or len(query.alias_map) > 1
+        ):
+            return None
+        connection = connections[self._db or router.db_for_read(self.model)]
+        if connection.vendor != 'microsoft':
+            return None
+        return connection
+
+    def _table_count(self, connection, sql, params):
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+        except DatabaseError:
+            # VIEW DATABASE STATE is needed to read partition statistics
+            return None
+        return row[0] if row else None
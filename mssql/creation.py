@@ -3,13 +3,51 @@
 
 import binascii
 import os
+import threading
+import time
 
-from django.db.utils import InterfaceError
+from django.db.utils import DatabaseError, InterfaceError
 from django.db.backends.base.creation import BaseDatabaseCreation
 from django import VERSION as django_version
 
+# Threads copying test database clones, and the errors of the copies that
+# failed, by clone name
+_clone_threads = {}
+_clone_errors = {}
+_clone_threads_lock = threading.Lock()
+
+# States of a database that is still being restored or copied
+_cloning_states = {'RESTORING', 'RECOVERING', 'COPYING'}
+
+
+def _join_clone_threads():
+    with _clone_threads_lock:
+        threads = list(_clone_threads.values())
+        _clone_threads.clear()
+    for thread in threads:
+        thread.join()
+    with _clone_threads_lock:
+        errors = list(_clone_errors.values())
+    if errors:
+        raise errors[0]
+
+
+if hasattr(os, 'register_at_fork'):
+    # Forked test workers inherit none of the copying threads, so the clones
+    # must be complete before the test runner forks them.
+    os.register_at_fork(before=_join_clone_threads)
+
 
 class DatabaseCreation(BaseDatabaseCreation):
+    # Seconds a test worker waits for its clone of the test database, and
+    # for the clone to appear at all
+    clone_timeout = 600
+    clone_start_timeout = 30
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Backup files of the databases cloned by this process
+        self._clone_backups = {}
 
     def cursor(self):
         if django_version >= (3, 1):
@@ -44,6 +82,12 @@ class DatabaseCreation(BaseDatabaseCreation):
         # ourselves. Connect to the previous database (not the test database)
         # to do so, because it's not allowed to delete a database while being
         # connected to it.
+        with _clone_threads_lock:
+            thread = _clone_threads.pop(test_database_name, None)
+        if thread is not None:
+            thread.join()
+        with _clone_threads_lock:
+            _clone_errors.pop(test_database_name, None)
         with self.cursor() as cursor:
             to_azure_sql_db = self.connection.to_azure_sql_db
             if not to_azure_sql_db:
@@ -51,6 +95,150 @@ class DatabaseCreation(BaseDatabaseCreation):
                                % self.connection.ops.quote_name(test_database_name))
             cursor.execute("DROP DATABASE %s"
                            % self.connection.ops.quote_name(test_database_name))
+            if test_database_name in self._clone_backups:
+                self._delete_clone_backup(cursor, test_database_name)
+
+    def _clone_test_db(self, suffix, verbosity, keepdb=False):
+        """
+        Copy the test database for a parallel test worker, through BACKUP and
+        RESTORE, or CREATE DATABASE ... AS COPY OF on Azure SQL Database. The
+        copy runs in the background so that the clones are made concurrently;
+        test workers wait for theirs to be online.
+        """
+        source_database_name = self.connection.settings_dict['NAME']
+        target_database_name = self.get_test_db_clone_settings(suffix)['NAME']
+        quote_name = self.connection.ops.quote_name
+        with self.cursor() as cursor:
+            state = self._get_database_state(cursor, target_database_name)
+            if state == 'ONLINE' and keepdb:
+                return
+            if state is not None:
+                if verbosity >= 1:
+                    self.log('Destroying old test database for alias %s...' % (
+                        self._get_database_display_str(verbosity, target_database_name),
+                    ))
+                self._destroy_test_db(target_database_name, verbosity)
+            if self.connection.to_azure_sql_db:
+                sql = ['CREATE DATABASE %s AS COPY OF %s' % (
+                    quote_name(target_database_name), quote_name(source_database_name),
+                )]
+            else:
+                sql = [self._restore_clone_sql(cursor, source_database_name, target_database_name)]
+        thread = threading.Thread(
+            target=self._copy_test_db, args=(target_database_name, sql), daemon=True,
+        )
+        with _clone_threads_lock:
+            _clone_threads[target_database_name] = thread
+            _clone_errors.pop(target_database_name, None)
+        thread.start()
+
+    def _restore_clone_sql(self, cursor, source_database_name, target_database_name):
+        """
+        Return the RESTORE statement of a clone, backing up the source
+        database the first time it's cloned.
+        """
+        quote_name = self.connection.ops.quote_name
+        backups = self._clone_backups
+        if source_database_name not in backups:
+            # A relative path is in the server's default backup directory
+            backups[source_database_name] = '%s_clone.bak' % source_database_name
+            cursor.execute('BACKUP DATABASE %s TO DISK = %s WITH COPY_ONLY, INIT' % (
+                quote_name(source_database_name), self._quote_string(backups[source_database_name]),
+            ))
+            while cursor.nextset():
+                pass
+        # The clone's files are next to those of the source database
+        cursor.execute(
+            'SELECT file_id, name, physical_name FROM sys.master_files WHERE database_id = DB_ID(%s)',
+            [source_database_name],
+        )
+        moves = []
+        for file_id, name, physical_name in cursor.fetchall():
+            directory_end = max(physical_name.rfind('/'), physical_name.rfind('\\')) + 1
+            extension = os.path.splitext(physical_name[directory_end:])[1]
+            moves.append('MOVE %s TO %s' % (self._quote_string(name), self._quote_string(
+                '%s%s_%d%s' % (physical_name[:directory_end], target_database_name, file_id, extension),
+            )))
+        return 'RESTORE DATABASE %s FROM DISK = %s WITH %s, RECOVERY, REPLACE' % (
+            quote_name(target_database_name), self._quote_string(backups[source_database_name]), ', '.join(moves),
+        )
+
+    def _delete_clone_backup(self, cursor, source_database_name):
+        """
+        Delete the backup file the clones of a database were restored from.
+        Its full path, in the server's default backup directory, is read
+        from the backup history.
+        """
+        backup = self._clone_backups.pop(source_database_name)
+        try:
+            cursor.execute(
+                'SELECT TOP 1 f.physical_device_name FROM msdb.dbo.backupset AS s '
+                'INNER JOIN msdb.dbo.backupmediafamily AS f ON f.media_set_id = s.media_set_id '
+                'WHERE s.database_name = %s AND f.physical_device_name LIKE %s '
+                'ORDER BY s.backup_finish_date DESC',
+                [source_database_name, '%' + backup],
+            )
+            row = cursor.fetchone()
+            if row is not None:
+                # xp_delete_file only removes SQL Server backup files (type 0)
+                cursor.execute('EXEC master.sys.xp_delete_file 0, %s' % self._quote_string(row[0]))
+        except Exception as e:
+            self.log('Got an error deleting the backup file %s: %s' % (backup, e))
+
+    def _quote_string(self, value):
+        return "N'%s'" % value.replace("'", "''")
+
+    def _copy_test_db(self, database_name, sql):
+        try:
+            with self.cursor() as cursor:
+                for statement in sql:
+                    cursor.execute(statement)
+                    while cursor.nextset():
+                        pass
+                # CREATE DATABASE ... AS COPY OF returns before the copy is done
+                self._wait_for_database(cursor, database_name)
+        except Exception as e:
+            # Raised again by _join_clone_threads and by the worker using
+            # the clone
+            with _clone_threads_lock:
+                _clone_errors[database_name] = e
+
+    def _get_database_state(self, cursor, database_name):
+        cursor.execute('SELECT state_desc FROM sys.databases WHERE name = %s', [database_name])
+        row = cursor.fetchone()
+        return row[0] if row else None
+
+    def _wait_for_database(self, cursor, database_name):
+        # Spawned workers don't share _clone_errors. A failed copy leaves the
+        # database missing or in another state, such as SUSPECT.
+        started = time.monotonic()
+        while True:
+            state = self._get_database_state(cursor, database_name)
+            if state == 'ONLINE':
+                return
+            elapsed = time.monotonic() - started
+            if state is None and elapsed > self.clone_start_timeout or (
+                state is not None and state not in _cloning_states
+            ):
+                raise DatabaseError('The test database %s is %s, its copy failed.' % (
+                    database_name, state or 'missing',
+                ))
+            if elapsed > self.clone_timeout:
+                raise TimeoutError('The test database %s was not online after %d seconds.' % (
+                    database_name, self.clone_timeout,
+                ))
+            time.sleep(1)
+
+    def setup_worker_connection(self, _worker_id):
+        database_name = self.get_test_db_clone_settings(str(_worker_id))['NAME']
+        with _clone_threads_lock:
+            error = _clone_errors.get(database_name)
+        if error is not None:
+            raise error
+        # Workers that aren't forked can start while their clone is copied
+        with self.cursor() as cursor:
+            self._wait_for_database(cursor, database_name)
+        super().setup_worker_connection(_worker_id)
 
     def sql_table_creation_suffix(self):
         suffix = []
@@ -11,6 +11,7 @@ class DatabaseFeatures(BaseDatabaseFeatures):
     can_introspect_autofield = True
     can_introspect_json_field = False
     can_introspect_small_integer_field = True
+    can_rename_index = True
     can_return_columns_from_insert = True
     can_return_id_from_insert = True
     can_return_rows_from_bulk_insert = False
@@ -67,9 +68,69 @@ class DatabaseFeatures(BaseDatabaseFeatures):
 
     @cached_property
     def has_zoneinfo_database(self):
+        return bool(self.time_zone_names)
+
+    @cached_property
+    def time_zone_names(self):
+        # sys.time_zone_info and AT TIME ZONE arrived in SQL Server 2016
+        if self.connection.sql_server_version < 2016 and not self.connection.to_azure_sql_db:
+            return frozenset()
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT name FROM sys.time_zone_info")
+            return frozenset(row[0] for row in cursor.fetchall())
+
+    @cached_property
+    def can_clone_databases(self):
+        # Managed Instance (EngineEdition 8) can only back up to URLs
+        return self.connection.engine_edition != 8
+
+    @cached_property
+    def supports_session_context(self):
+        return self.connection.sql_server_version >= 2016 or self.connection.to_azure_sql_db
+
+    @cached_property
+    def database_collation(self):
+        # Columns without db_collation get the database default collation
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT CONVERT(nvarchar(128), DATABASEPROPERTYEX(DB_NAME(), 'Collation'))")
+            return cursor.fetchone()[0]
+
+    @cached_property
+    def supports_fulltext_search(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("SELECT FULLTEXTSERVICEPROPERTY('IsFulltextInstalled')")
+            return cursor.fetchone()[0] == 1
+
+    @cached_property
+    def supports_memory_optimized_tables(self):
+        # Outside Azure the database needs a MEMORY_OPTIMIZED_DATA filegroup
         with self.connection.cursor() as cursor:
-            cursor.execute("SELECT TOP 1 1 FROM sys.time_zone_info")
-            return cursor.fetchone() is not None
+            cursor.execute(
+                "SELECT CAST(SERVERPROPERTY('IsXTPSupported') AS int), "
+                "(SELECT COUNT(*) FROM sys.filegroups WHERE type = 'FX')"
+            )
+            supported, filegroups = cursor.fetchone()
+        return supported == 1 and (filegroups > 0 or self.connection.to_azure_sql_db)
+
+    @cached_property
+    def supports_online_index_operations(self):
+        # EngineEdition 3 is Enterprise, Developer and Evaluation
+        return self.connection.engine_edition == 3 or self.connection.to_azure_sql_db
+
+    @cached_property
+    def supports_metadata_only_add_column(self):
+        # Adding a column with a constant default leaves existing rows alone
+        return self.connection.engine_edition == 3 or self.connection.to_azure_sql_db
+
+    @cached_property
+    def supports_resumable_index_operations(self):
+        return self.supports_online_index_operations and (
+            self.connection.to_azure_sql_db or self.connection.sql_server_version >= 2019
+        )
+
+    @cached_property
+    def supports_approx_count_distinct(self):
+        return self.connection.sql_server_version >= 2019 or self.connection.to_azure_sql_db
 
     @cached_property
     def supports_json_field(self):
@@ -2,24 +2,29 @@
 # Licensed under the BSD license.
 
 import json
+import re
 
 from django import VERSION
 from django.core import validators
 from django.db import NotSupportedError, connections, transaction
 from django.db.models import BooleanField, CheckConstraint, Value
-from django.db.models.expressions import Case, Exists, OrderBy, When, Window
-from django.db.models.fields import BinaryField, Field
+from django.db.models.expressions import Case, Col, Exists, OrderBy, When, Window
+from django.db.models.fields import BinaryField, CharField, Field, TextField
 from django.db.models.functions import Cast, NthValue, MD5, SHA1, SHA224, SHA256, SHA384, SHA512
 from django.db.models.functions.datetime import Now
 from django.db.models.functions.math import ATan2, Ln, Log, Mod, Round, Degrees, Radians, Power
 from django.db.models.functions.text import Replace
-from django.db.models.lookups import In, Lookup
+from django.db.models.lookups import BuiltinLookup, IContains, IEndsWith, IExact, In, IStartsWith, Lookup, Regex
 from django.db.models.query import QuerySet
 from django.db.models.sql.query import Query
 
+from .indexes import get_json_path_index
+from .regex import BINARY_COLLATION, translate as translate_regex
+
 if VERSION >= (3, 1):
     from django.db.models.fields.json import (
         KeyTransform, KeyTransformIn, KeyTransformExact,
+        KeyTransformGt, KeyTransformGte, KeyTransformLt, KeyTransformLte,
         HasKeyLookup, compile_json_path)
 
 if VERSION >= (3, 2):
@@ -153,6 +158,68 @@ def sqlserver_lookup(self, compiler, connection):
     return lookup.as_sql(compiler, connection)
 
 
+def sqlserver_regex(self, compiler, connection):
+    # Translate the pattern to LIKE where possible, so it doesn't need the
+    # CLR function and an anchored prefix can use an index seek.
+    patterns = None
+    if (
+        self.rhs_is_direct_value() and isinstance(self.rhs, str) and not self.bilateral_transforms and
+        isinstance(self.lhs.output_field, (CharField, TextField))
+    ):
+        patterns = translate_regex(self.rhs, case_insensitive=self.lookup_name == 'iregex')
+    if not patterns:
+        return self.as_sql(compiler, connection)
+    lhs, lhs_params = self.process_lhs(compiler, connection)
+    match_lhs = 'UPPER(%s)' % lhs if self.lookup_name == 'iregex' else lhs
+    conditions = []
+    params = []
+    for pattern, prefix in patterns:
+        condition = "%s COLLATE %s LIKE %%s ESCAPE '\\'" % (match_lhs, BINARY_COLLATION)
+        if prefix:
+            condition = "(%s LIKE %%s ESCAPE '\\' AND %s)" % (lhs, condition)
+            params.extend((*lhs_params, prefix))
+        conditions.append(condition)
+        params.extend((*lhs_params, pattern))
+    return '(%s)' % ' OR '.join(conditions), params
+
+
+def _case_insensitive_collation(lookup, connection):
+    """
+    Return the COLLATE clause that makes a comparison on the lookup's column
+    case-insensitive: '' if the column's collation already is, None if it
+    can't be done without UPPER() on both sides.
+    """
+    if (
+        not isinstance(lookup.lhs, Col) or not lookup.rhs_is_direct_value() or lookup.bilateral_transforms or
+        not isinstance(lookup.lhs.output_field, (CharField, TextField)) or
+        connection.settings_dict.get('OPTIONS', {}).get('collation')
+    ):
+        return None
+    # Columns are assumed to have the database default collation unless
+    # db_collation says otherwise, which is read once per connection.
+    collation = getattr(lookup.lhs.target, 'db_collation', None) or connection.features.database_collation
+    if not collation:
+        return None
+    if '_CI' in collation:
+        return ''
+    if '_CS' in collation:
+        return ' COLLATE %s' % collation.replace('_CS', '_CI')
+    # Binary collations have no case-insensitive counterpart
+    return None
+
+
+def sqlserver_case_insensitive_lookup(self, compiler, connection):
+    # UPPER() on the column prevents index seeks, and is redundant when the
+    # column's collation is case-insensitive.
+    collate = _case_insensitive_collation(self, connection)
+    if collate is None:
+        return self.as_sql(compiler, connection)
+    lhs_sql, params = Lookup.process_lhs(self, compiler, connection)
+    rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+    operator = '= %s' if self.lookup_name == 'iexact' else "LIKE %s ESCAPE '\\'"
+    return '%s%s %s' % (lhs_sql, collate, operator % rhs_sql), [*params, *rhs_params]
+
+
 def sqlserver_orderby(self, compiler, connection):
     template = None
     if self.nulls_last:
@@ -212,6 +279,64 @@ def unquote_json_rhs(rhs_params):
     return rhs_params
 
 
+def _json_path_index_accepts(output_type, values):
+    """
+    Return whether comparing the computed column of a JSONPathIndex of
+    output_type with values gives the same result as comparing the JSON
+    value: integers with integer columns, and strings shorter than the
+    column (which truncates longer ones) with string columns.
+    """
+    output_type = output_type.lower().replace(' ', '')
+    if VERSION < (4, 2):
+        # JSONField.get_prep_value() serialized the values
+        try:
+            values = [json.loads(value) for value in values]
+        except (TypeError, ValueError):
+            return False
+    if not values:
+        return False
+    if re.match(r'^(big|small|tiny)?int$', output_type):
+        return all(isinstance(value, int) and not isinstance(value, bool) for value in values)
+    match = re.match(r'^n?(?:var)?char\((\d+|max)\)$', output_type)
+    if match:
+        return all(
+            isinstance(value, str) and (match[1] == 'max' or len(value) < int(match[1])) for value in values
+        )
+    return False
+
+
+def json_path_index_lhs(lookup, compiler, connection, values):
+    """
+    Return the SQL of the computed column of the JSONPathIndex on the key
+    transform compared by lookup, or None if there's no such index or values
+    aren't all scalars of the column's type.
+    """
+    if not isinstance(lookup.lhs, KeyTransform) or any(hasattr(value, 'resolve_expression') for value in values):
+        return None
+    column = lookup.lhs
+    while isinstance(column, KeyTransform):
+        column = column.lhs
+    if not isinstance(column, Col):
+        return None
+    *_, key_transforms = lookup.lhs.preprocess_lhs(compiler, connection)
+    index = get_json_path_index(column.target, key_transforms)
+    if index is None or not _json_path_index_accepts(index.output_type, values):
+        return None
+    sql = connection.ops.quote_name(index.column)
+    if column.alias is not None:
+        sql = '%s.%s' % (compiler.quote_name_unless_alias(column.alias), sql)
+    return sql, []
+
+
+def json_KeyTransform_process_lhs(self, compiler, connection, lhs=None):
+    # Scalar comparisons can use the computed column of a JSONPathIndex
+    if lhs is None and connection.vendor == 'microsoft':
+        column = json_path_index_lhs(self, compiler, connection, [self.rhs])
+        if column is not None:
+            return column
+    return BuiltinLookup.process_lhs(self, compiler, connection, lhs)
+
+
 def json_KeyTransformExact_process_rhs(self, compiler, connection):
     rhs, rhs_params = key_transform_exact_process_rhs(self, compiler, connection)
     if connection.vendor == 'microsoft':
@@ -220,7 +345,11 @@ def json_KeyTransformExact_process_rhs(self, compiler, connection):
 
 
 def json_KeyTransformIn(self, compiler, connection):
-    lhs, _ = super(KeyTransformIn, self).process_lhs(compiler, connection)
+    values = list(self.rhs) if isinstance(self.rhs, (list, tuple, set)) else []
+    lhs, _ = (
+        json_path_index_lhs(self, compiler, connection, values) or
+        super(KeyTransformIn, self).process_lhs(compiler, connection)
+    )
     rhs, rhs_params = super(KeyTransformIn, self).process_rhs(compiler, connection)
 
     return (lhs + ' IN ' + rhs, unquote_json_rhs(rhs_params))
@@ -229,19 +358,15 @@ def json_KeyTransformIn(self, compiler, connection):
 def json_HasKeyLookup(self, compiler, connection):
     # Process JSON path from the left-hand side.
     if isinstance(self.lhs, KeyTransform):
-        lhs, _, lhs_key_transforms = self.lhs.preprocess_lhs(compiler, connection)
+        lhs, lhs_params, lhs_key_transforms = self.lhs.preprocess_lhs(compiler, connection)
         lhs_json_path = compile_json_path(lhs_key_transforms)
     else:
-        lhs, _ = self.process_lhs(compiler, connection)
+        lhs, lhs_params = self.process_lhs(compiler, connection)
         lhs_json_path = '$'
-    if connection.sql_server_version >= 2022:
-        sql = "JSON_PATH_EXISTS(%s, '%%s') > 0" % lhs
-    else:
-        sql = lhs + ' IN (SELECT ' + lhs + ' FROM ' + self.lhs.output_field.model._meta.db_table + \
-        ' CROSS APPLY OPENJSON(' + lhs + ') WITH ( [json_path_value] char(1) \'%s\') WHERE [json_path_value] IS NOT NULL)'
-    # Process JSON path from the right-hand side.
+    # Process JSON path from the right-hand side, as the path to the object
+    # holding the key and the key itself.
     rhs = self.rhs
-    rhs_params = []
+    rhs_keys = []
     if not isinstance(rhs, (list, tuple)):
         rhs = [rhs]
     for key in rhs:
@@ -249,21 +374,46 @@ def json_HasKeyLookup(self, compiler, connection):
             *_, rhs_key_transforms = key.preprocess_lhs(compiler, connection)
         else:
             rhs_key_transforms = [key]
-        if VERSION >= (4, 1):
-            *rhs_key_transforms, final_key = rhs_key_transforms
-            rhs_json_path = compile_json_path(rhs_key_transforms, include_root=False)
-            rhs_json_path += self.compile_json_path_final_key(final_key)
-            rhs_params.append(lhs_json_path + rhs_json_path)
+        *rhs_key_transforms, final_key = rhs_key_transforms
+        parent_path = lhs_json_path + compile_json_path(rhs_key_transforms, include_root=False)
+        # An integer final key is an array index, as in other lookups
+        is_index = isinstance(final_key, int)
+        if is_index or VERSION < (4, 1):
+            json_path = parent_path + compile_json_path([final_key], include_root=False)
+            is_index = json_path.endswith(']')
+        else:
+            json_path = parent_path + self.compile_json_path_final_key(final_key)
+        rhs_keys.append((json_path, parent_path, str(final_key), is_index))
+    # Add condition for each key. Paths are inlined as literals (not
+    # parameters), as OPENJSON requires before SQL Server 2017.
+    conditions = []
+    params = []
+    for json_path, parent_path, final_key, is_index in rhs_keys:
+        if connection.sql_server_version >= 2022:
+            json_path = json_path.replace("'", "''").replace('%', '%%')
+            conditions.append("JSON_PATH_EXISTS(%s, '%s') > 0" % (lhs, json_path))
+            params.extend(lhs_params)
         else:
-            rhs_params.append('%s%s' % (
-            lhs_json_path,
-            compile_json_path(rhs_key_transforms, include_root=False),
-        ))
-    # Add condition for each key.
+            # Evaluated row by row rather than with a self-join on the table.
+            # JSON_VALUE can't tell a missing key from a null value or a
+            # string over 4000 characters, so the keys of the object (or the
+            # indexes of the array) holding it are listed instead. Unlike
+            # COALESCE(JSON_QUERY(), JSON_VALUE()), this can't be matched to
+            # a persisted computed column.
+            parent_path = parent_path.replace("'", "''").replace('%', '%%')
+            condition = "EXISTS (SELECT 1 FROM OPENJSON(%s, '%s') WHERE [key] = %%s)" % (lhs, parent_path)
+            params.extend(lhs_params)
+            params.append(final_key)
+            if is_index:
+                # OPENJSON lists object keys and array indexes alike
+                condition = "(%s AND LEFT(JSON_QUERY(%s, '%s'), 1) = '[')" % (condition, lhs, parent_path)
+                params.extend(lhs_params)
+            conditions.append(condition)
+    sql = conditions[0]
     if self.logical_operator:
-        sql = '(%s)' % self.logical_operator.join([sql] * len(rhs_params))
+        sql = '(%s)' % self.logical_operator.join(conditions)
 
-    return sql % tuple(rhs_params), []
+    return sql, tuple(params)
 
 
 def BinaryField_init(self, *args, **kwargs):
@@ -359,46 +509,46 @@ def bulk_update_with_default(self, objs, fields, batch_size=None, default=None):
     return rows_updated
 
 
-def sqlserver_md5(self, compiler, connection, **extra_context):
+def _hash_cast_length(expression):
+    """
+    Return the VARCHAR length used to cast the hashed expression to UTF-8.
+
+    The length comes from the source field's max_length so the SQL is the same
+    on every compile and no data has to be read to produce it. A UTF-8
+    character takes up to 4 bytes, anything that may not fit in VARCHAR(8000)
+    (or has no declared length) is cast to VARCHAR(max).
+    """
+    source_fields = expression.get_source_fields()
+    max_length = getattr(source_fields[0], 'max_length', None) if source_fields else None
+    if isinstance(max_length, int) and 0 < max_length * 4 <= 8000:
+        return max_length * 4
+    return 'max'
+
+
+def _sqlserver_hash(self, compiler, connection, algorithm, hex_length, **extra_context):
     # UTF-8 support added in SQL Server 2019
     if (connection.sql_server_version < 2019):
         raise NotSupportedError("Hashing is not supported on this version SQL Server. Upgrade to 2019 or above")
 
-    column_name = self.get_source_fields()[0].name
-
-    with connection.cursor() as cursor:
-        cursor.execute("SELECT MAX(DATALENGTH(%s)) FROM %s" % (column_name, compiler.query.model._meta.db_table))
-        max_size = cursor.fetchone()[0]
-
     # Collation of SQL Server by default is UTF-16 but Django always assumes UTF-8 enconding
     # https://docs.djangoproject.com/en/4.0/ref/unicode/#general-string-handling
     return self.as_sql(
         compiler,
         connection,
-        template="LOWER(CONVERT(CHAR(32), HASHBYTES('%s', CAST(%s COLLATE Latin1_General_100_CI_AI_SC_UTF8 AS VARCHAR(%s))), 2))" % ('%(function)s', column_name, max_size),
+        template=(
+            "LOWER(CONVERT(CHAR(%s), HASHBYTES('%s', "
+            "CAST(%%(expressions)s COLLATE Latin1_General_100_CI_AI_SC_UTF8 AS VARCHAR(%s))), 2))"
+        ) % (hex_length, algorithm, _hash_cast_length(self)),
         **extra_context,
     )
 
 
-def sqlserver_sha1(self, compiler, connection, **extra_context):
-    # UTF-8 support added in SQL Server 2019
-    if (connection.sql_server_version < 2019):
-        raise NotSupportedError("Hashing is not supported on this version SQL Server. Upgrade to 2019 or above")
-
-    column_name = self.get_source_fields()[0].name
+def sqlserver_md5(self, compiler, connection, **extra_context):
+    return _sqlserver_hash(self, compiler, connection, 'MD5', 32, **extra_context)
 
-    # Collation of SQL Server by default is UTF-16 but Django always assumes UTF-8 enconding
-    # https://docs.djangoproject.com/en/4.0/ref/unicode/#general-string-handling
-    with connection.cursor() as cursor:
-        cursor.execute("SELECT MAX(DATALENGTH(%s)) FROM %s" % (column_name, compiler.query.model._meta.db_table))
-        max_size = cursor.fetchone()[0]
 
-    return self.as_sql(
-        compiler,
-        connection,
-        template="LOWER(CONVERT(CHAR(40), HASHBYTES('%s', CAST(%s COLLATE Latin1_General_100_CI_AI_SC_UTF8 AS VARCHAR(%s))), 2))" % ('%(function)s', column_name, max_size),
-        **extra_context,
-    )
+def sqlserver_sha1(self, compiler, connection, **extra_context):
+    return _sqlserver_hash(self, compiler, connection, 'SHA1', 40, **extra_context)
 
 
 def sqlserver_sha224(self, compiler, connection, **extra_context):
@@ -406,24 +556,7 @@ def sqlserver_sha224(self, compiler, connection, **extra_context):
 
 
 def sqlserver_sha256(self, compiler, connection, **extra_context):
-    # UTF-8 support added in SQL Server 2019
-    if (connection.sql_server_version < 2019):
-        raise NotSupportedError("Hashing is not supported on this version SQL Server. Upgrade to 2019 or above")
-
-    column_name = self.get_source_fields()[0].name
-
-    # Collation of SQL Server by default is UTF-16 but Django always assumes UTF-8 enconding
-    # https://docs.djangoproject.com/en/4.0/ref/unicode/#general-string-handling
-    with connection.cursor() as cursor:
-        cursor.execute("SELECT MAX(DATALENGTH(%s)) FROM %s" % (column_name, compiler.query.model._meta.db_table))
-        max_size = cursor.fetchone()[0]
-
-    return self.as_sql(
-        compiler,
-        connection,
-        template="LOWER(CONVERT(CHAR(64), HASHBYTES('SHA2_256', CAST(%s COLLATE Latin1_General_100_CI_AI_SC_UTF8 AS VARCHAR(%s))), 2))" % (column_name, max_size),
-        **extra_context,
-    )
+    return _sqlserver_hash(self, compiler, connection, 'SHA2_256', 64, **extra_context)
 
 
 def sqlserver_sha384(self, compiler, connection, **extra_context):
@@ -431,24 +564,7 @@ def sqlserver_sha384(self, compiler, connection, **extra_context):
 
 
 def sqlserver_sha512(self, compiler, connection, **extra_context):
-    # UTF-8 support added in SQL Server 2019
-    if (connection.sql_server_version < 2019):
-        raise NotSupportedError("Hashing is not supported on this version SQL Server. Upgrade to 2019 or above")
-
-    column_name = self.get_source_fields()[0].name
-
-    # Collation of SQL Server by default is UTF-16 but Django always assumes UTF-8 enconding
-    # https://docs.djangoproject.com/en/4.0/ref/unicode/#general-string-handling
-    with connection.cursor() as cursor:
-        cursor.execute("SELECT MAX(DATALENGTH(%s)) FROM %s" % (column_name, compiler.query.model._meta.db_table))
-        max_size = cursor.fetchone()[0]
-
-    return self.as_sql(
-        compiler,
-        connection,
-        template="LOWER(CONVERT(CHAR(128), HASHBYTES('SHA2_512', CAST(%s COLLATE Latin1_General_100_CI_AI_SC_UTF8 AS VARCHAR(%s))), 2))" % (column_name, max_size),
-        **extra_context,
-    )
+    return _sqlserver_hash(self, compiler, connection, 'SHA2_512', 128, **extra_context)
 
 
 # `as_microsoft` called by django.db.models.sql.compiler based on connection.vendor
@@ -461,6 +577,8 @@ if VERSION >= (3, 1):
     # Need copy of old KeyTransformExact.process_rhs to call later
     key_transform_exact_process_rhs = KeyTransformExact.process_rhs
     KeyTransformExact.process_rhs = json_KeyTransformExact_process_rhs
+    for lookup in (KeyTransformExact, KeyTransformGt, KeyTransformGte, KeyTransformLt, KeyTransformLte):
+        lookup.process_lhs = json_KeyTransform_process_lhs
     HasKeyLookup.as_microsoft = json_HasKeyLookup
 Cast.as_microsoft = sqlserver_cast
 Degrees.as_microsoft = sqlserver_degrees
@@ -492,4 +610,9 @@ else:
     Exists.as_microsoft = sqlserver_exists
 
 OrderBy.as_microsoft = sqlserver_orderby
+Regex.as_microsoft = sqlserver_regex
+IExact.as_microsoft = sqlserver_case_insensitive_lookup
+IContains.as_microsoft = sqlserver_case_insensitive_lookup
+IStartsWith.as_microsoft = sqlserver_case_insensitive_lookup
+IEndsWith.as_microsoft = sqlserver_case_insensitive_lookup
 QuerySet.bulk_update = bulk_update_with_default
@@ -0,0 +1,266 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the BSD license.
+
+from django.db.models import Index
+
+DATA_COMPRESSIONS = ('NONE', 'ROW', 'PAGE')
+
+
+def get_index_options(online=None, resumable=False, max_duration=None, sort_in_tempdb=None,
+                      maxdop=None, fillfactor=None, data_compression=None):
+    """
+    Validate index build options and return them as a dict of WITH clause
+    options. The schema editor leaves out those the server can't use.
+    """
+    options = {}
+    if resumable:
+        if online is False:
+            raise ValueError('Resumable index operations must be online.')
+        online = True
+    elif max_duration is not None:
+        raise ValueError('max_duration requires resumable=True.')
+    if fillfactor is not None and not 0 < fillfactor <= 100:
+        raise ValueError('fillfactor must be between 1 and 100.')
+    if maxdop is not None and maxdop < 0:
+        raise ValueError('maxdop must be a positive integer or 0.')
+    if data_compression is not None and data_compression not in DATA_COMPRESSIONS:
+        raise ValueError('data_compression must be one of %s.' % ', '.join(DATA_COMPRESSIONS))
+    if online is not None:
+        options['ONLINE'] = 'ON' if online else 'OFF'
+    if resumable:
+        options['RESUMABLE'] = 'ON'
+    if max_duration is not None:
+        options['MAX_DURATION'] = '%d MINUTES' % max_duration
+    if sort_in_tempdb is not None:
+        options['SORT_IN_TEMPDB'] = 'ON' if sort_in_tempdb else 'OFF'
+    if maxdop is not None:
+        options['MAXDOP'] = maxdop
+    if fillfactor is not None:
+        options['FILLFACTOR'] = fillfactor
+    if data_compression is not None:
+        options['DATA_COMPRESSION'] = data_compression
+    return options
+
+
+class SQLServerIndex(Index):
+    """
+    Rowstore index taking SQL Server index options.
+
+        SQLServerIndex(fields=['created_at'], name='event_created_idx', online=True, fillfactor=90)
+
+    ``online``, ``resumable`` and ``max_duration`` (minutes) are left out on
+    editions without online index operations. ``resumable`` needs SQL Server
+    2019 and can't be used in a transaction, so it's dropped in atomic
+    migrations.
+    """
+    option_names = (
+        'online', 'resumable', 'max_duration', 'sort_in_tempdb', 'maxdop', 'fillfactor', 'data_compression',
+    )
+
+    def __init__(self, *expressions, online=None, resumable=False, max_duration=None,
+                 sort_in_tempdb=None, maxdop=None, fillfactor=None, data_compression=None, **kwargs):
+        self.online = online
+        self.resumable = resumable
+        self.max_duration = max_duration
+        self.sort_in_tempdb = sort_in_tempdb
+        self.maxdop = maxdop
+        self.fillfactor = fillfactor
+        self.data_compression = data_compression
+        self.get_with_options()
+        super().__init__(*expressions, **kwargs)
+
+    def get_with_options(self):
+        return get_index_options(**{name: getattr(self, name) for name in self.option_names})
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        statement = super().create_sql(model, schema_editor, using=using, **kwargs)
+        options = schema_editor._index_options_sql(self.get_with_options())
+        if options:
+            statement.parts['extra'] = ' WITH (%s)%s' % (options, statement.parts['extra'])
+        return statement
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        for name in self.option_names:
+            value = getattr(self, name)
+            if value != (False if name == 'resumable' else None):
+                kwargs[name] = value
+        return path, args, kwargs
+
+
+class HashIndex(Index):
+    """
+    Hash index of a memory-optimized table, for point lookups on the full
+    key. bucket_count should be one to two times the number of distinct
+    keys; SQL Server rounds it up to a power of two.
+
+        HashIndex(fields=['session_key'], name='session_key_hash', bucket_count=2 ** 20)
+    """
+    suffix = 'hash'
+
+    def __init__(self, *, fields, bucket_count, name=None):
+        if not isinstance(bucket_count, int) or bucket_count <= 0:
+            raise ValueError('HashIndex.bucket_count must be a positive integer.')
+        if any(field_name.startswith('-') for field_name in fields):
+            raise ValueError('HashIndex.fields do not support ordering.')
+        super().__init__(fields=fields, name=name)
+        self.bucket_count = bucket_count
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        return schema_editor._create_hash_index_sql(model, self)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs['bucket_count'] = self.bucket_count
+        return path, args, kwargs
+
+
+class JSONPathIndex(Index):
+    """
+    Index a scalar inside a JSONField.
+
+    The schema editor adds a persisted computed column holding
+    ``JSON_VALUE(field, path)`` cast to ``output_type`` and a nonclustered
+    index on it. Filters comparing the same path (e.g. ``data__customer__id``)
+    with values of ``output_type`` using exact, in, lt, lte, gt or gte are
+    compiled against the computed column so the optimizer can seek: integers
+    for integer types, and strings shorter than the column for string types.
+    Other lookups, and the path in values(), annotations and ordering, still
+    read the JSON.
+
+        JSONPathIndex('data', 'customer__id', 'bigint', name='data_customer_id_idx')
+
+    ``path`` is given like a lookup, with keys separated by ``__``. Values that
+    can't be converted to ``output_type`` are stored as NULL.
+    """
+    suffix = 'json'
+
+    def __init__(self, field, path, output_type='nvarchar(255)', *, name=None,
+                 db_tablespace=None, condition=None, include=None):
+        super().__init__(
+            fields=[field], name=name, db_tablespace=db_tablespace,
+            condition=condition, include=include,
+        )
+        self.path = tuple(path.split('__')) if isinstance(path, str) else tuple(path)
+        if not self.path or not all(self.path):
+            raise ValueError('JSONPathIndex.path must name at least one key.')
+        self.output_type = output_type
+
+    @property
+    def column(self):
+        """Name of the computed column backing the index."""
+        return '__'.join((self.fields[0], *self.path))
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        return schema_editor._create_json_path_index_sql(model, self)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        return schema_editor._delete_json_path_index_sql(model, self)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        kwargs.pop('fields')
+        return path, (self.fields[0], '__'.join(self.path), self.output_type), kwargs
+
+
+class ColumnstoreIndex(Index):
+    """
+    Columnstore index, for tables mostly read through scans and aggregations.
+
+    A nonclustered columnstore index covers ``fields`` and accepts a
+    ``condition`` like a filtered index. A clustered columnstore index stores
+    the whole table; ``fields``, if given, become its ORDER columns (SQL
+    Server 2022). A table created with a clustered columnstore index gets a
+    nonclustered primary key.
+
+        ColumnstoreIndex(fields=['day', 'product', 'amount'], name='sales_cs')
+        ColumnstoreIndex(name='sales_cci', clustered=True)
+    """
+    suffix = 'cs'
+
+    def __init__(self, *, fields=(), name=None, clustered=False, condition=None,
+                 db_tablespace=None):
+        if clustered and condition:
+            raise ValueError('A clustered ColumnstoreIndex cannot have a condition.')
+        if not fields and not clustered:
+            raise ValueError('A nonclustered ColumnstoreIndex requires fields.')
+        if not fields and not name:
+            raise ValueError('A ColumnstoreIndex without fields requires a name.')
+        if any(field_name.startswith('-') for field_name in fields):
+            raise ValueError('ColumnstoreIndex.fields do not support ordering.')
+        # Index requires fields or expressions, while a clustered columnstore
+        # index covers every column without listing any. The primary key
+        # stands in for them until Index has set up everything else.
+        super().__init__(fields=fields or ['pk'], name=name, db_tablespace=db_tablespace, condition=condition)
+        if not fields:
+            self.fields, self.fields_orders = [], []
+        self.clustered = clustered
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        return schema_editor._create_columnstore_index_sql(model, self)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        if self.clustered:
+            kwargs['clustered'] = True
+        return path, args, kwargs
+
+
+class FullTextIndex(Index):
+    """
+    Full-text index on one or more character columns.
+
+    SQL Server allows a single full-text index per table, keyed on the
+    primary key. The catalog is created if it doesn't exist. Full-text DDL
+    can't run inside a transaction, so migrations adding or removing a
+    FullTextIndex must set ``atomic = False``.
+
+        FullTextIndex(fields=['title', 'body'], name='article_ft', language=1033)
+    """
+    suffix = 'ft'
+    default_catalog = 'django_fulltext'
+
+    def __init__(self, *, fields, name=None, catalog=None, language=None,
+                 change_tracking='AUTO', db_tablespace=None, condition=None, include=None):
+        if db_tablespace or condition or include:
+            raise ValueError('FullTextIndex does not support db_tablespace, condition or include.')
+        super().__init__(fields=fields, name=name)
+        if any(field_name.startswith('-') for field_name in self.fields):
+            raise ValueError('FullTextIndex.fields do not support ordering.')
+        if change_tracking not in ('AUTO', 'MANUAL', 'OFF'):
+            raise ValueError("FullTextIndex.change_tracking must be 'AUTO', 'MANUAL' or 'OFF'.")
+        self.catalog = catalog
+        self.language = language
+        self.change_tracking = change_tracking
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        return schema_editor._create_fulltext_index_sql(model, self)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        return schema_editor._delete_fulltext_index_sql(model, self)
+
+    def deconstruct(self):
+        path, args, kwargs = super().deconstruct()
+        if self.catalog is not None:
+            kwargs['catalog'] = self.catalog
+        if self.language is not None:
+            kwargs['language'] = self.language
+        if self.change_tracking != 'AUTO':
+            kwargs['change_tracking'] = self.change_tracking
+        return path, args, kwargs
+
+
+def get_json_path_index(field, key_transforms):
+    """
+    Return the JSONPathIndex of field's model covering exactly key_transforms
+    on field, or None.
+    """
+    model = getattr(field, 'model', None)
+    if model is None:
+        return None
+    key_transforms = tuple(str(key) for key in key_transforms)
+    for index in model._meta.indexes:
+        if (isinstance(index, JSONPathIndex) and index.fields[0] == field.name and
+                index.path == key_transforms):
+            return index
+    return None
@@ -4,7 +4,11 @@
 from django.db import DatabaseError
 import pyodbc as Database
 
+import copy
+import threading
 from collections import namedtuple
+from contextlib import contextmanager
+from functools import partial
 
 from django import VERSION
 from django.db.backends.base.introspection import BaseDatabaseIntrospection
@@ -13,18 +17,88 @@ from django.db.backends.base.introspection import TableInfo as BaseTableInfo
 from django.db.models.indexes import Index
 from django.conf import settings
 
+from .indexes import ColumnstoreIndex
+
 SQL_AUTOFIELD = -777555
 SQL_BIGAUTOFIELD = -777444
 SQL_SMALLAUTOFIELD = -777333
 SQL_TIMESTAMP_WITH_TIMEZONE = -155
+SQL_SS_UDT = -151
 
 FieldInfo = namedtuple("FieldInfo", BaseFieldInfo._fields + ("comment",))
 TableInfo = namedtuple("TableInfo", BaseTableInfo._fields + ("comment",))
 
+
+class SchemaCatalog(namedtuple("SchemaCatalog", "table_list descriptions sequences key_columns constraints")):
+    """In-memory index of a schema's catalog, see DatabaseIntrospection.catalog()."""
+
+    @property
+    def tables(self):
+        return self.descriptions.keys()
+
+
+# ODBC type codes of the SQL Server types, as reported by SQLColumns
+_CHARACTER_TYPES = {
+    'char': Database.SQL_CHAR,
+    'varchar': Database.SQL_VARCHAR,
+    'binary': Database.SQL_BINARY,
+    'varbinary': Database.SQL_VARBINARY,
+}
+_FIXED_SIZE_TYPES = {
+    'text': (Database.SQL_LONGVARCHAR, 2**31 - 1),
+    'ntext': (Database.SQL_WLONGVARCHAR, 2**30 - 1),
+    'image': (Database.SQL_LONGVARBINARY, 2**31 - 1),
+    'uniqueidentifier': (Database.SQL_GUID, 36),
+    'xml': (Database.SQL_SS_XML, 0),
+    'sql_variant': (Database.SQL_SS_VARIANT, 8000),
+    'timestamp': (Database.SQL_BINARY, 8),
+}
+# Types whose ODBC column size is sys.columns.precision, and whether they have a scale
+_NUMERIC_TYPES = {
+    'bigint': (Database.SQL_BIGINT, True),
+    'int': (Database.SQL_INTEGER, True),
+    'smallint': (Database.SQL_SMALLINT, True),
+    'tinyint': (Database.SQL_TINYINT, True),
+    'bit': (Database.SQL_BIT, False),
+    'decimal': (Database.SQL_DECIMAL, True),
+    'numeric': (Database.SQL_NUMERIC, True),
+    'money': (Database.SQL_DECIMAL, True),
+    'smallmoney': (Database.SQL_DECIMAL, True),
+    'float': (Database.SQL_FLOAT, False),
+    'real': (Database.SQL_REAL, False),
+    'date': (Database.SQL_TYPE_DATE, False),
+    'time': (Database.SQL_SS_TIME2, True),
+    'datetime': (Database.SQL_TYPE_TIMESTAMP, True),
+    'datetime2': (Database.SQL_TYPE_TIMESTAMP, True),
+    'smalldatetime': (Database.SQL_TYPE_TIMESTAMP, True),
+    'datetimeoffset': (SQL_TIMESTAMP_WITH_TIMEZONE, True),
+}
+
+
+_inspected_schema = threading.local()
+
+
 def get_schema_name():
+    schema = getattr(_inspected_schema, 'name', None)
+    if schema is not None:
+        return schema
     return getattr(settings, 'SCHEMA_TO_INSPECT', 'SCHEMA_NAME()')
 
 
+@contextmanager
+def inspected_schema(name):
+    """
+    Introspect the named schema, instead of SCHEMA_TO_INSPECT or the default
+    schema, in the current thread until the block exits.
+    """
+    previous = getattr(_inspected_schema, 'name', None)
+    _inspected_schema.name = "N'%s'" % name.replace("'", "''")
+    try:
+        yield
+    finally:
+        _inspected_schema.name = previous
+
+
 class DatabaseIntrospection(BaseDatabaseIntrospection):
     # Map type codes to Django Field types.
     data_types_reverse = {
@@ -60,6 +134,12 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
 
     ignored_tables = []
 
+    # Set while a catalog() block is active
+    _catalog = None
+
+    # Well below the 2100 parameters a query can take
+    _description_batch_size = 1000
+
     def get_field_type(self, data_type, description):
         field_type = super().get_field_type(data_type, description)
         # the max nvarchar length is described as 0 or 2**30-1
@@ -77,6 +157,8 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
         """
         Returns a list of table and view names in the current database.
         """
+        if self._catalog is not None:
+            return list(self._catalog.table_list)
         if VERSION >= (4, 2) and self.connection.features.supports_comments:
             sql = """SELECT
                         TABLE_NAME,
@@ -101,19 +183,6 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
                     for row in cursor.fetchall()
                     if row[0] not in self.ignored_tables]
 
-    def _is_auto_field(self, cursor, table_name, column_name):
-        """
-        Checks whether column is Identity
-        """
-        # COLUMNPROPERTY: http://msdn2.microsoft.com/en-us/library/ms174968.aspx
-
-        # from django.db import connection
-        # cursor.execute("SELECT COLUMNPROPERTY(OBJECT_ID(%s), %s, 'IsIdentity')",
-        #                 (connection.ops.quote_name(table_name), column_name))
-        cursor.execute("SELECT COLUMNPROPERTY(OBJECT_ID(%s), %s, 'IsIdentity')",
-                       (self.connection.ops.quote_name(table_name), column_name))
-        return cursor.fetchall()[0][0]
-
     def get_table_description(self, cursor, table_name, identity_check=True):
         """Returns a description of the table, with DB-API cursor.description interface.
 
@@ -127,114 +196,210 @@ class DatabaseIntrospection(BaseDatabaseIntrospection):
         When a bigint field is found with an IDENTITY property, it is given a custom field number
         of SQL_BIGAUTOFIELD, which maps to the 'BigAutoField' value in the DATA_TYPES_REVERSE dict.
         """
-
-        # map pyodbc's cursor.columns to db-api cursor description
-        columns = [[c[3], c[4], c[6], c[6], c[6], c[8], c[10], c[12]] for c in cursor.columns(table=table_name)]
-
-        if not columns:
+        if identity_check and self._catalog is not None and table_name in self._catalog.tables:
+            return list(self._catalog.descriptions[table_name])
+        descriptions = self.get_table_descriptions(cursor, [table_name], identity_check)
+        if table_name not in descriptions:
             raise DatabaseError(f"Table {table_name} does not exist.")
+        return descriptions[table_name]
 
-        items = []
-        for column in columns:
-            if VERSION >= (3, 2):
-                if self.connection.sql_server_version >= 2019:
-                    sql = """SELECT collation_name
-                            FROM sys.columns c
-                            inner join sys.tables t on c.object_id = t.object_id
-                            WHERE t.name = '%s' and c.name = '%s'
-                            """ % (table_name, column[0])
-                    cursor.execute(sql)
-                    collation_name = cursor.fetchone()
-                    column.append(collation_name[0] if collation_name else '')
-                else:
-                    column.append('')
-            if VERSION >= (4, 2) and self.connection.features.supports_comments:
-                sql = """select CAST(ep.value AS VARCHAR) AS COMMENT
-                        FROM sys.columns c
-                        INNER JOIN sys.tables t ON c.object_id = t.object_id
-                        INNER JOIN sys.extended_properties ep ON c.object_id=ep.major_id AND ep.minor_id = c.column_id
-                        WHERE t.name = '%s' AND c.name = '%s' AND ep.name = 'MS_Description'
-                        """ % (table_name, column[0])
-                cursor.execute(sql)
-                comment = cursor.fetchone()
-                column.append(comment[0] if comment else '')
-            if identity_check and self._is_auto_field(cursor, table_name, column[0]):
-                if column[1] == Database.SQL_BIGINT:
-                    column[1] = SQL_BIGAUTOFIELD
-                elif column[1] == Database.SQL_SMALLINT:
-                    column[1] = SQL_SMALLAUTOFIELD
+    def get_table_descriptions(self, cursor, table_names, identity_check=True):
+        """
+        Return a {table_name: description} dict for the given tables and
+        views, described as get_table_description() does, from one catalog
+        query per batch of tables. Missing tables are left out. If table_names
+        is None, describe every table and view of the inspected schema.
+        """
+        if table_names is not None and not table_names:
+            return {}
+        with_comments = VERSION >= (4, 2) and self.connection.features.supports_comments
+        sql = f"""
+            SELECT
+                o.name,
+                c.name,
+                COALESCE(TYPE_NAME(c.system_type_id), TYPE_NAME(c.user_type_id)),
+                c.max_length,
+                c.precision,
+                c.scale,
+                c.is_nullable,
+                c.is_identity,
+                dc.definition,
+                c.collation_name,
+                {'CAST(ep.value AS NVARCHAR(4000))' if with_comments else 'NULL'}
+            FROM sys.columns AS c
+            INNER JOIN sys.objects AS o ON
+                c.object_id = o.object_id
+            LEFT JOIN sys.default_constraints AS dc ON
+                c.default_object_id = dc.object_id
+            LEFT JOIN sys.extended_properties AS ep ON
+                ep.class = 1 AND
+                ep.major_id = c.object_id AND
+                ep.minor_id = c.column_id AND
+                ep.name = 'MS_Description'
+            WHERE
+                o.schema_id = SCHEMA_ID({get_schema_name()}) AND
+                o.type IN ('U', 'V')
+                %s
+            ORDER BY o.name, c.column_id
+        """
+        rows = []
+        if table_names is None:
+            cursor.execute(sql % '')
+            rows.extend(cursor.fetchall())
+        else:
+            table_names = list(table_names)
+            for start in range(0, len(table_names), self._description_batch_size):
+                batch = table_names[start:start + self._description_batch_size]
+                cursor.execute(sql % ('AND o.name IN (%s)' % ', '.join(['%s'] * len(batch))), batch)
+                rows.extend(cursor.fetchall())
+        descriptions = {}
+        for (table_name, name, type_name, max_length, precision, scale, null_ok, is_identity, default,
+             collation, comment) in rows:
+            type_code, size, scale = self._describe_column_type(type_name, max_length, precision, scale)
+            if identity_check and is_identity:
+                if type_code == Database.SQL_BIGINT:
+                    type_code = SQL_BIGAUTOFIELD
+                elif type_code == Database.SQL_SMALLINT:
+                    type_code = SQL_SMALLAUTOFIELD
                 else:
-                    column[1] = SQL_AUTOFIELD
-            if column[1] == Database.SQL_WVARCHAR and column[3] < 4000:
-                column[1] = Database.SQL_WCHAR
+                    type_code = SQL_AUTOFIELD
+            if type_code == Database.SQL_WVARCHAR and size < 4000:
+                type_code = Database.SQL_WCHAR
             # Remove surrounding parentheses for default values
-            if column[7]:
-                default_value = column[7]
+            if default:
                 start = 0
                 end = -1
                 for _ in range(2):
-                    if default_value[start] == '(' and default_value[end] == ')':
+                    if default[start] == '(' and default[end] == ')':
                         start += 1
                         end -= 1
-                column[7] = default_value[start:end + 1]
-            if VERSION >= (4, 2) and self.connection.features.supports_comments:
-                items.append(FieldInfo(*column))
+                default = default[start:end + 1]
+            column = [name, type_code, size, size, size, scale, int(null_ok), default]
+            if VERSION >= (3, 2):
+                column.append((collation or '') if self.connection.sql_server_version >= 2019 else '')
+            if with_comments:
+                column.append(comment or '')
+                info = FieldInfo(*column)
             else:
-                items.append(BaseFieldInfo(*column))
-        return items
+                info = BaseFieldInfo(*column)
+            descriptions.setdefault(table_name, []).append(info)
+        return descriptions
+
+    def catalog_queries(self):
+        """
+        Return a {SchemaCatalog field: function(cursor)} dict of the readers of
+        each part of the inspected schema's catalog. They are independent of
+        each other and may run on different connections.
+        """
+        return {
+            'table_list': self.get_table_list,
+            'descriptions': partial(self.get_table_descriptions, table_names=None),
+            'sequences': self._get_identity_columns,
+            'key_columns': self._get_key_columns,
+            'constraints': self._get_constraints,
+        }
+
+    def load_catalog(self, cursor):
+        """Read the catalog of the inspected schema into a SchemaCatalog."""
+        return SchemaCatalog(**{field: query(cursor) for field, query in self.catalog_queries().items()})
+
+    @contextmanager
+    def catalog(self, cursor, snapshot=None):
+        """
+        Load the columns, comments, identity columns, foreign keys, constraints
+        and indexes of every table and view of the inspected schema with a
+        handful of set-based catalog queries. Until the block exits,
+        get_table_description(), get_sequences(), get_relations(),
+        get_key_columns(), get_constraints() and get_table_list() answer from
+        that snapshot for the tables it covers, rather than querying the
+        catalog table by table. A SchemaCatalog read beforehand by
+        load_catalog() can be passed as snapshot.
+
+            with connection.cursor() as cursor, connection.introspection.catalog(cursor):
+                for table in connection.introspection.table_names(cursor):
+                    connection.introspection.get_constraints(cursor, table)
+
+        The snapshot isn't refreshed by DDL run inside the block.
+        """
+        previous = self._catalog
+        if snapshot is None:
+            snapshot = previous if previous is not None else self.load_catalog(cursor)
+        self._catalog = snapshot
+        try:
+            yield snapshot
+        finally:
+            self._catalog = previous
+
+    def _describe_column_type(self, type_name, max_length, precision, scale):
+        """
+        Return the ODBC type code, column size and decimal digits SQLColumns
+        reports for a column of sys.columns.
+        """
+        if type_name in ('nchar', 'nvarchar'):
+            size = max_length // 2 if max_length != -1 else 0
+            return (Database.SQL_WCHAR if type_name == 'nchar' else Database.SQL_WVARCHAR), size, None
+        if type_name in _CHARACTER_TYPES:
+            size = max_length if max_length != -1 else 0
+            return _CHARACTER_TYPES[type_name], size, None
+        if type_name in _FIXED_SIZE_TYPES:
+            type_code, size = _FIXED_SIZE_TYPES[type_name]
+            return type_code, size, None
+        if type_name in _NUMERIC_TYPES:
+            type_code, has_scale = _NUMERIC_TYPES[type_name]
+            return type_code, precision, scale if has_scale else None
+        # CLR types (hierarchyid, geometry, ...) and anything newer
+        return SQL_SS_UDT, max_length if max_length != -1 else 0, None
 
     def get_sequences(self, cursor, table_name, table_fields=()):
+        if self._catalog is not None and table_name in self._catalog.tables:
+            return self._catalog.sequences.get(table_name, [])
+        return self._get_identity_columns(cursor, table_name).get(table_name, [])
+
+    def _get_identity_columns(self, cursor, table_name=None):
         cursor.execute(f"""
-            SELECT c.name FROM sys.columns c
+            SELECT t.name, c.name FROM sys.columns c
             INNER JOIN sys.tables t ON c.object_id = t.object_id
-            WHERE t.schema_id = SCHEMA_ID({get_schema_name()}) AND t.name = %s AND c.is_identity = 1""",
-                       [table_name])
+            WHERE t.schema_id = SCHEMA_ID({get_schema_name()}) AND c.is_identity = 1
+            {'AND t.name = %s' if table_name is not None else ''}""",
+                       [table_name] if table_name is not None else None)
         # SQL Server allows only one identity column per table
         # https://docs.microsoft.com/en-us/sql/t-sql/statements/create-table-transact-sql-identity-property
-        row = cursor.fetchone()
-        return [{'table': table_name, 'column': row[0]}] if row else []
+        return {table: [{'table': table, 'column': column}] for table, column in cursor.fetchall()}
 
     def get_relations(self, cursor, table_name):
         """
         Returns a dictionary of {field_name: (field_name_other_table, other_table)}
         representing all relationships to the given table.
         """
-        # CONSTRAINT_COLUMN_USAGE: http://msdn2.microsoft.com/en-us/library/ms174431.aspx
-        # CONSTRAINT_TABLE_USAGE:  http://msdn2.microsoft.com/en-us/library/ms179883.aspx
-        # REFERENTIAL_CONSTRAINTS: http://msdn2.microsoft.com/en-us/library/ms179987.aspx
-        # TABLE_CONSTRAINTS:       http://msdn2.microsoft.com/en-us/library/ms181757.aspx
-        sql = f"""
-SELECT e.COLUMN_NAME AS column_name,
-  c.TABLE_NAME AS referenced_table_name,
-  d.COLUMN_NAME AS referenced_column_name
-FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS AS a
-INNER JOIN INFORMATION_SCHEMA.REFERENTIAL_CONSTRAINTS AS b
-  ON a.CONSTRAINT_NAME = b.CONSTRAINT_NAME AND a.TABLE_SCHEMA = b.CONSTRAINT_SCHEMA
-INNER JOIN INFORMATION_SCHEMA.CONSTRAINT_TABLE_USAGE AS c
-  ON b.UNIQUE_CONSTRAINT_NAME = c.CONSTRAINT_NAME AND b.CONSTRAINT_SCHEMA = c.CONSTRAINT_SCHEMA
-INNER JOIN INFORMATION_SCHEMA.CONSTRAINT_COLUMN_USAGE AS d
-  ON c.CONSTRAINT_NAME = d.CONSTRAINT_NAME AND c.CONSTRAINT_SCHEMA = d.CONSTRAINT_SCHEMA
-INNER JOIN INFORMATION_SCHEMA.CONSTRAINT_COLUMN_USAGE AS e
-  ON a.CONSTRAINT_NAME = e.CONSTRAINT_NAME AND a.TABLE_SCHEMA = e.TABLE_SCHEMA
-WHERE a.TABLE_SCHEMA = {get_schema_name()} AND a.TABLE_NAME = %s AND a.CONSTRAINT_TYPE = 'FOREIGN KEY'"""
-        cursor.execute(sql, (table_name,))
-        return dict([[item[0], (item[2], item[1])] for item in cursor.fetchall()])
+        return {
+            column: (referenced_column, referenced_table)
+            for column, referenced_table, referenced_column in self.get_key_columns(cursor, table_name)
+        }
 
     def get_key_columns(self, cursor, table_name):
         """
         Returns a list of (column_name, referenced_table_name, referenced_column_name) for all
         key columns in given table.
         """
-        key_columns = []
+        if self._catalog is not None and table_name in self._catalog.tables:
+            return list(self._catalog.key_columns.get(table_name, []))
+        return self._get_key_columns(cursor, table_name).get(table_name, [])
+
+    def _get_key_columns(self, cursor, table_name=None):
         cursor.execute(f"""
-            SELECT c.name AS column_name, rt.name AS referenced_table_name, rc.name AS referenced_column_name
+            SELECT t.name, c.name AS column_name, rt.name AS referenced_table_name, rc.name AS referenced_column_name
             FROM sys.foreign_key_columns fk
             INNER JOIN sys.tables t ON t.object_id = fk.parent_object_id
             INNER JOIN sys.columns c ON c.object_id = t.object_id AND c.column_id = fk.parent_column_id
             INNER JOIN sys.tables rt ON rt.object_id = fk.referenced_object_id
             INNER JOIN sys.columns rc ON rc.object_id = rt.object_id AND rc.column_id = fk.referenced_column_id
-            WHERE t.schema_id = SCHEMA_ID({get_schema_name()}) AND t.name = %s""", [table_name])
-        key_columns.extend([tuple(row) for row in cursor.fetchall()])
+            WHERE t.schema_id = SCHEMA_ID({get_schema_name()})
+            {'AND t.name = %s' if table_name is not None else ''}
+            ORDER BY t.name, fk.constraint_object_id, fk.constraint_column_id""",
+                       [table_name] if table_name is not None else None)
+        key_columns = {}
+        for table, *row in cursor.fetchall():
+            key_columns.setdefault(table, []).append(tuple(row))
         return key_columns
 
     def get_constraints(self, cursor, table_name):
@@ -253,11 +418,23 @@ WHERE a.TABLE_SCHEMA = {get_schema_name()} AND a.TABLE_NAME = %s AND a.CONSTRAIN
          * orders: The order (ASC/DESC) defined for the columns of indexes
          * type: The type of the index (btree, hash, etc.)
         """
-        constraints = {}
+        if self._catalog is not None and table_name in self._catalog.tables:
+            return copy.deepcopy(self._catalog.constraints.get(table_name, {}))
+        return self._get_constraints(cursor, table_name).get(table_name, {})
+
+    def _get_constraints(self, cursor, table_name=None):
+        """
+        Return a {table_name: constraints} dict, as get_constraints() describes
+        them, for one table or every table of the inspected schema.
+        """
+        table_filter = 'AND kc.table_name = %s' if table_name is not None else ''
+        params = [table_name] if table_name is not None else None
+        tables = {}
         # Loop over the key table, collecting things as constraints
         # This will get PKs, FKs, and uniques, but not CHECK
         cursor.execute(f"""
             SELECT
+                kc.table_name,
                 kc.constraint_name,
                 kc.column_name,
                 tc.constraint_type,
@@ -296,13 +473,15 @@ WHERE a.TABLE_SCHEMA = {get_schema_name()} AND a.TABLE_NAME = %s AND a.CONSTRAIN
                 kc.table_name = fk.table_name AND
                 kc.column_name = fk.column_name
             WHERE
-                kc.table_schema = {get_schema_name()} AND
-                kc.table_name = %s
+                kc.table_schema = {get_schema_name()}
+                {table_filter}
             ORDER BY
+                kc.table_name ASC,
                 kc.constraint_name ASC,
                 kc.ordinal_position ASC
-        """, [table_name])
-        for constraint, column, kind, ref_table, ref_column in cursor.fetchall():
+        """, params)
+        for table, constraint, column, kind, ref_table, ref_column in cursor.fetchall():
+            constraints = tables.setdefault(table, {})
             # If we're the first column, make the record
             if constraint not in constraints:
                 constraints[constraint] = {
@@ -323,7 +502,7 @@ WHERE a.TABLE_SCHEMA = {get_schema_name()} AND a.TABLE_NAME = %s AND a.CONSTRAIN
             constraints[constraint]['columns'].append(column)
         # Now get CHECK constraint columns
         cursor.execute(f"""
-            SELECT kc.constraint_name, kc.column_name
+            SELECT kc.table_name, kc.constraint_name, kc.column_name
             FROM INFORMATION_SCHEMA.CONSTRAINT_COLUMN_USAGE AS kc
             JOIN INFORMATION_SCHEMA.TABLE_CONSTRAINTS AS c ON
                 kc.table_schema = c.table_schema AND
@@ -331,10 +510,11 @@ WHERE a.TABLE_SCHEMA = {get_schema_name()} AND a.TABLE_NAME = %s AND a.CONSTRAIN
                 kc.constraint_name = c.constraint_name
             WHERE
                 c.constraint_type = 'CHECK' AND
-                kc.table_schema = {get_schema_name()} AND
-                kc.table_name = %s
-        """, [table_name])
-        for constraint, column in cursor.fetchall():
+                kc.table_schema = {get_schema_name()}
+                {table_filter}
+        """, params)
+        for table, constraint, column in cursor.fetchall():
+            constraints = tables.setdefault(table, {})
             # If we're the first column, make the record
             if constraint not in constraints:
                 constraints[constraint] = {
@@ -350,16 +530,19 @@ WHERE a.TABLE_SCHEMA = {get_schema_name()} AND a.TABLE_NAME = %s AND a.CONSTRAIN
             # Record the details
             constraints[constraint]['columns'].append(column)
         # Now get DEFAULT constraint columns
-        cursor.execute("""
+        cursor.execute(f"""
             SELECT
+                OBJECT_NAME([parent_object_id]),
                 [name],
                 COL_NAME([parent_object_id], [parent_column_id])
             FROM
                 [sys].[default_constraints]
             WHERE
-                OBJECT_NAME([parent_object_id]) = %s
-        """, [table_name])
-        for constraint, column in cursor.fetchall():
+                [schema_id] = SCHEMA_ID({get_schema_name()})
+                {'AND OBJECT_NAME([parent_object_id]) = %s' if table_name is not None else ''}
+        """, params)
+        for table, constraint, column in cursor.fetchall():
+            constraints = tables.setdefault(table, {})
             # If we're the first column, make the record
             if constraint not in constraints:
                 constraints[constraint] = {
@@ -377,6 +560,7 @@ WHERE a.TABLE_SCHEMA = {get_schema_name()} AND a.TABLE_NAME = %s AND a.CONSTRAIN
         # Now get indexes
         cursor.execute(f"""
             SELECT
+                t.name AS table_name,
                 i.name AS index_name,
                 i.is_unique,
                 i.is_unique_constraint,
@@ -384,30 +568,40 @@ WHERE a.TABLE_SCHEMA = {get_schema_name()} AND a.TABLE_NAME = %s AND a.CONSTRAIN
                 i.type,
                 i.type_desc,
                 ic.is_descending_key,
-                c.name AS column_name
+                c.name AS column_name,
+                (
+                    SELECT TOP 1 p.data_compression_desc
+                    FROM sys.partitions AS p
+                    WHERE p.object_id = i.object_id AND p.index_id = i.index_id
+                    ORDER BY p.partition_number
+                ) AS data_compression
             FROM
                 sys.tables AS t
             INNER JOIN sys.schemas AS s ON
                 t.schema_id = s.schema_id
             INNER JOIN sys.indexes AS i ON
                 t.object_id = i.object_id
-            INNER JOIN sys.index_columns AS ic ON
+            LEFT OUTER JOIN sys.index_columns AS ic ON
                 i.object_id = ic.object_id AND
                 i.index_id = ic.index_id
-            INNER JOIN sys.columns AS c ON
+            LEFT OUTER JOIN sys.columns AS c ON
                 ic.object_id = c.object_id AND
                 ic.column_id = c.column_id
             WHERE
                 t.schema_id = SCHEMA_ID({get_schema_name()}) AND
-                t.name = %s
+                i.type <> 0
+                {'AND t.name = %s' if table_name is not None else ''}
             ORDER BY
+                t.name ASC,
                 i.index_id ASC,
                 ic.index_column_id ASC
-        """, [table_name])
+        """, params)
         indexes = {}
-        for index, unique, unique_constraint, primary, type_, desc, order, column in cursor.fetchall():
-            if index not in indexes:
-                indexes[index] = {
+        for (table, index, unique, unique_constraint, primary, type_, desc, order, column,
+             data_compression) in cursor.fetchall():
+            table_indexes = indexes.setdefault(table, {})
+            if index not in table_indexes:
+                table_indexes[index] = {
                     "columns": [],
                     "primary_key": primary,
                     "unique": unique,
@@ -417,16 +611,49 @@ WHERE a.TABLE_SCHEMA = {get_schema_name()} AND a.TABLE_NAME = %s AND a.CONSTRAIN
                     "default": False,
                     "index": True,
                     "orders": [],
-                    "type": Index.suffix if type_ in (1, 2) else desc.lower(),
+                    "type": self._index_type(type_, desc),
+                    "data_compression": data_compression,
                 }
-            indexes[index]["columns"].append(column)
-            indexes[index]["orders"].append("DESC" if order == 1 else "ASC")
-        for index, constraint in indexes.items():
-            if index not in constraints:
-                constraints[index] = constraint
-        return constraints
+            # A clustered columnstore index may not list its columns.
+            if column is not None:
+                table_indexes[index]["columns"].append(column)
+                table_indexes[index]["orders"].append("DESC" if order == 1 else "ASC")
+        for table, table_indexes in indexes.items():
+            constraints = tables.setdefault(table, {})
+            for index, constraint in table_indexes.items():
+                if index not in constraints:
+                    constraints[index] = constraint
+        return tables
+
+    def _index_type(self, type_, desc):
+        if type_ in (1, 2):
+            return Index.suffix
+        if type_ in (5, 6):
+            return ColumnstoreIndex.suffix
+        return desc.lower()
+
+    def get_table_data_compression(self, cursor, table_name):
+        """
+        Return the data compression (NONE, ROW, PAGE, ...) of a table's heap or
+        clustered index, as of its first partition.
+        """
+        cursor.execute(f"""
+            SELECT TOP 1 p.data_compression_desc
+            FROM sys.partitions AS p
+            INNER JOIN sys.tables AS t ON
+                p.object_id = t.object_id
+            WHERE
+                t.schema_id = SCHEMA_ID({get_schema_name()}) AND
+                t.name = %s AND
+                p.index_id IN (0, 1)
+            ORDER BY p.partition_number
+        """, [table_name])
+        row = cursor.fetchone()
+        return row[0] if row else None
 
     def get_primary_key_column(self, cursor, table_name):
+        if self._catalog is not None and table_name in self._catalog.tables:
+            return super().get_primary_key_column(cursor, table_name)
         cursor.execute("SELECT 1 FROM INFORMATION_SCHEMA.TABLES WHERE TABLE_NAME = N'%s'" % table_name)
         row = cursor.fetchone()
         if row is None:
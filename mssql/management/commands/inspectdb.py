@@ -1,19 +1,117 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the BSD license.
 
+import queue
+import threading
+import time
+
 from django.core.management.commands.inspectdb import Command as inspectdb_Command
-from django.conf import settings
+from django.db import connections
+
+from mssql.introspection import SchemaCatalog, inspected_schema
+
 
 class Command(inspectdb_Command):
     def add_arguments(self, parser):
         super().add_arguments(parser)
         parser.add_argument(
             '--schema',
-            default='dbo',
-            help='Choose the database schema to inspect, default is [dbo]',
+            action='append',
+            help='Choose a database schema to inspect, default is dbo. Repeat it to inspect several; '
+                 'models are written schema by schema, in the order given.',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Number of connections the catalog is read over in parallel, default is 4.',
         )
 
-    def handle(self, *args, **options):
-        if options["schema"]:
-            settings.SCHEMA_TO_INSPECT = "'" + options["schema"] + "'"
-        return super().handle(*args, **options)
+    def handle_inspection(self, options):
+        # Read the catalog of every schema up front, over a pool of
+        # connections, then generate the models from it on this one.
+        start = time.perf_counter()
+        connection = connections[options['database']]
+        schemas = list(dict.fromkeys(options['schema'] or ['dbo']))
+        catalogs = self.load_catalogs(options['database'], schemas, options['workers'])
+        with connection.cursor() as cursor:
+            for index, schema in enumerate(schemas):
+                lines = super().handle_inspection(options)
+                with inspected_schema(schema), connection.introspection.catalog(cursor, catalogs[schema]):
+                    if index:
+                        # The module header was written with the first schema
+                        for line in lines:
+                            if line.startswith('from ') and line.endswith(' import models'):
+                                break
+                    if len(schemas) > 1:
+                        yield ''
+                        yield ''
+                        yield '# Schema %s' % schema
+                    yield from lines
+        self.stderr.write(
+            'Inspected %d schema(s) in %.2fs.' % (len(schemas), time.perf_counter() - start)
+        )
+
+    def load_catalogs(self, alias, schemas, workers):
+        """
+        Read the catalog of each schema, one part of a schema per task, over
+        a pool of up to `workers` connections. Return {schema: SchemaCatalog}.
+        """
+        start = time.perf_counter()
+        tasks = queue.SimpleQueue()
+        for schema in schemas:
+            for field in SchemaCatalog._fields:
+                tasks.put((schema, field))
+        results = queue.SimpleQueue()
+
+        def work():
+            # Each thread gets its own connection from the connection handler
+            connection = connections[alias]
+            try:
+                while True:
+                    try:
+                        schema, field = tasks.get_nowait()
+                    except queue.Empty:
+                        return
+                    try:
+                        with inspected_schema(schema), connection.cursor() as cursor:
+                            part = connection.introspection.catalog_queries()[field](cursor)
+                    except Exception as e:
+                        results.put((schema, field, None, e))
+                    else:
+                        results.put((schema, field, part, None))
+            finally:
+                connection.close()
+
+        threads = [
+            threading.Thread(target=work, daemon=True)
+            for _ in range(max(1, min(workers, len(schemas) * len(SchemaCatalog._fields))))
+        ]
+        for thread in threads:
+            thread.start()
+        parts = {schema: {} for schema in schemas}
+        catalogs = {}
+        try:
+            while len(catalogs) < len(schemas):
+                schema, field, part, error = results.get()
+                if error is not None:
+                    raise error
+                parts[schema][field] = part
+                if len(parts[schema]) == len(SchemaCatalog._fields):
+                    catalogs[schema] = SchemaCatalog(**parts.pop(schema))
+                    self.stderr.write(
+                        'Read the catalog of schema %s (%d tables and views, %d/%d schemas) in %.2fs.' % (
+                            schema, len(catalogs[schema].tables), len(catalogs), len(schemas),
+                            time.perf_counter() - start,
+                        )
+                    )
+        finally:
+            # Let the workers finish early and release their connections
+            while True:
+                try:
+                    tasks.get_nowait()
+                except queue.Empty:
+                    break
+            for thread in threads:
+                thread.join()
+        return catalogs
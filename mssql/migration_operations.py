@@ -0,0 +1,146 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the BSD license.
+
+from django.db.migrations.operations.base import Operation
+from django.db.migrations.operations.fields import AlterField
+from django.db.models import Index
+
+from .indexes import DATA_COMPRESSIONS, SQLServerIndex, get_index_options
+
+
+class AlterDataCompression(Operation):
+    """
+    Change the data compression of a model's table, or of one of its indexes
+    with index_name. The table or index is rebuilt, online where the edition
+    allows it, unless it's already compressed that way. The other keyword
+    arguments are the index build options of SQLServerIndex.
+    """
+    reduces_to_sql = False
+    option_names = ('online', 'resumable', 'max_duration', 'sort_in_tempdb', 'maxdop')
+
+    def __init__(self, model_name, data_compression, index_name=None, *, online=True, resumable=False,
+                 max_duration=None, sort_in_tempdb=None, maxdop=None):
+        if data_compression not in DATA_COMPRESSIONS:
+            raise ValueError('data_compression must be one of %s.' % ', '.join(DATA_COMPRESSIONS))
+        self.model_name = model_name
+        self.data_compression = data_compression
+        self.index_name = index_name
+        self.options = {
+            'online': online,
+            'resumable': resumable,
+            'max_duration': max_duration,
+            'sort_in_tempdb': sort_in_tempdb,
+            'maxdop': maxdop,
+        }
+        get_index_options(**self.options)
+
+    @property
+    def model_name_lower(self):
+        return self.model_name.lower()
+
+    def deconstruct(self):
+        kwargs = {
+            'model_name': self.model_name,
+            'data_compression': self.data_compression,
+        }
+        if self.index_name is not None:
+            kwargs['index_name'] = self.index_name
+        if not self.options['online']:
+            kwargs['online'] = self.options['online']
+        for name in self.option_names[1:]:
+            if self.options[name] is not None and self.options[name] is not False:
+                kwargs[name] = self.options[name]
+        return self.__class__.__qualname__, [], kwargs
+
+    def _get_data_compression(self, state, app_label):
+        options = state.models[app_label, self.model_name_lower].options
+        if self.index_name is None:
+            return options.get('data_compression') or 'NONE'
+        for index in options.get('indexes', []):
+            if index.name == self.index_name:
+                return getattr(index, 'data_compression', None) or 'NONE'
+        raise ValueError('%s has no index named %r.' % (self.model_name, self.index_name))
+
+    def state_forwards(self, app_label, state):
+        model_state = state.models[app_label, self.model_name_lower]
+        if self.index_name is None:
+            model_state.options['data_compression'] = self.data_compression
+        else:
+            indexes = []
+            for index in model_state.options.get('indexes', []):
+                if index.name == self.index_name:
+                    if type(index) is not Index and not isinstance(index, SQLServerIndex):
+                        raise ValueError('The data compression of %s cannot be changed.' % type(index).__name__)
+                    _, args, kwargs = index.deconstruct()
+                    kwargs['data_compression'] = self.data_compression
+                    index = SQLServerIndex(*args, **kwargs)
+                indexes.append(index)
+            model_state.options['indexes'] = indexes
+        state.reload_model(app_label, self.model_name_lower, delay=True)
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.alter_data_compression(model, self.data_compression, self.index_name, **self.options)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            schema_editor.alter_data_compression(
+                model, self._get_data_compression(to_state, app_label), self.index_name, **self.options
+            )
+
+    def describe(self):
+        if self.index_name is None:
+            return 'Alter data compression of %s to %s' % (self.model_name, self.data_compression)
+        return 'Alter data compression of index %s on %s to %s' % (
+            self.index_name, self.model_name, self.data_compression,
+        )
+
+    @property
+    def migration_name_fragment(self):
+        if self.index_name is None:
+            return 'alter_%s_data_compression' % self.model_name_lower
+        return 'alter_%s_data_compression' % self.index_name.lower()
+
+
+class AlterFieldOnline(AlterField):
+    """
+    AlterField changing the type of a column without rewriting the table
+    under a schema lock, such as int to bigint on a large table. The column
+    is copied into a shadow column in chunks of batch_size rows, then
+    swapped with it in a short transaction. Only the type and nullability of
+    the column may change, see DatabaseSchemaEditor.alter_field_online().
+
+    Set atomic = False on the migration. If it's interrupted, migrating
+    again carries on where it stopped.
+    """
+    reduces_to_sql = False
+
+    def __init__(self, model_name, name, field, preserve_default=True, batch_size=4000):
+        self.batch_size = batch_size
+        super().__init__(model_name, name, field, preserve_default)
+
+    def deconstruct(self):
+        name, args, kwargs = super().deconstruct()
+        if self.batch_size != 4000:
+            kwargs['batch_size'] = self.batch_size
+        return name, args, kwargs
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        to_model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, to_model):
+            from_model = from_state.apps.get_model(app_label, self.model_name)
+            schema_editor.alter_field_online(
+                from_model,
+                from_model._meta.get_field(self.name),
+                to_model._meta.get_field(self.name),
+                batch_size=self.batch_size,
+            )
+
+    def reduce(self, operation, app_label):
+        # Don't let the optimizer fold it into a plain AlterField
+        return Operation.reduce(self, operation, app_label)
+
+    def describe(self):
+        return 'Alter field %s on %s online' % (self.name, self.model_name)
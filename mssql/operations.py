@@ -15,6 +15,8 @@ from django.utils.encoding import force_str
 from django import VERSION as django_version
 import pytz
 
+from .timezones import IANA_TO_WINDOWS
+
 DJANGO41 = django_version >= (4, 1)
 
 
@@ -30,16 +32,41 @@ class DatabaseOperations(BaseDatabaseOperations):
 
     def _convert_field_to_tz(self, field_name, tzname):
         if tzname and settings.USE_TZ and self.connection.timezone_name != tzname:
-            offset = self._get_utcoffset(tzname)
-            field_name = 'DATEADD(second, %d, %s)' % (offset, field_name)
+            field_name = self._at_time_zone_sql(field_name, tzname)
         return field_name
 
     def _convert_sql_to_tz(self, sql, params, tzname):
         if tzname and settings.USE_TZ and self.connection.timezone_name != tzname:
-            offset = self._get_utcoffset(tzname)
-            sql = 'DATEADD(second, %d, %s)' % (offset, sql)
+            sql = self._at_time_zone_sql(sql, tzname)
         return sql, params
 
+    def _at_time_zone_sql(self, sql, tzname):
+        """
+        Converts a naive datetime expression stored in the connection's time
+        zone to local time in tzname. AT TIME ZONE applies the DST rules in
+        effect for each value; servers without sys.time_zone_info, or zones
+        without a Windows equivalent, fall back to a fixed offset.
+        """
+        source = self._get_windows_time_zone(self.connection.timezone_name)
+        target = self._get_windows_time_zone(tzname)
+        if source and target:
+            return "CONVERT(datetime2, %s AT TIME ZONE '%s' AT TIME ZONE '%s')" % (sql, source, target)
+        offset = self._get_utcoffset(tzname)
+        return 'DATEADD(second, %d, %s)' % (offset, sql)
+
+    def _get_windows_time_zone(self, tzname):
+        """
+        Returns the name SQL Server knows the given IANA time zone by, or None
+        if the server has no such zone.
+        """
+        time_zone_names = self.connection.features.time_zone_names
+        if tzname in time_zone_names:
+            return tzname
+        windows_name = IANA_TO_WINDOWS.get(tzname)
+        if windows_name in time_zone_names:
+            return windows_name
+        return None
+
     def _get_utcoffset(self, tzname):
         """
         Returns UTC offset for given time zone in seconds
@@ -440,31 +467,19 @@ class DatabaseOperations(BaseDatabaseOperations):
         """
         return "ROLLBACK TRANSACTION %s" % sid
 
-    def _build_sequences(self, sequences, cursor):
-        seqs = []
-        for seq in sequences:
-            cursor.execute("SELECT COUNT(*) FROM %s" % self.quote_name(seq["table"]))
-            rowcnt = cursor.fetchone()[0]
-            elem = {}
-            if rowcnt:
-                elem['start_id'] = 0
-            else:
-                elem['start_id'] = 1
-            elem.update(seq)
-            seqs.append(elem)
-        return seqs
-
-    def _sql_flush_new(self, style, tables, *, reset_sequences=False, allow_cascade=False):
+    def _sql_flush_new(self, style, tables, by_name, *, reset_sequences=False, allow_cascade=False):
         if reset_sequences:
+            # The identity columns come with the flush catalog, so there's
+            # no need for a sequence_list() query per model
             return [
-                sequence
-                for sequence in self.connection.introspection.sequence_list()
-                if sequence['table'].lower() in [table.lower() for table in tables]
+                {'table': by_name[table.lower()]['name'], 'column': None}
+                for table in tables
+                if table.lower() in by_name and by_name[table.lower()]['reseed_value'] is not None
             ]
 
         return []
 
-    def _sql_flush_old(self, style, tables, sequences, allow_cascade=False):
+    def _sql_flush_old(self, style, tables, by_name, sequences, allow_cascade=False):
         return sequences
 
     def sql_flush(self, style, tables, *args, **kwargs):
@@ -486,46 +501,196 @@ class DatabaseOperations(BaseDatabaseOperations):
         if not tables:
             return []
 
+        with self.connection.cursor() as cursor:
+            catalog, foreign_keys = self._flush_catalog(cursor)
+            by_name = {table['name'].lower(): table for table in catalog.values() if table['in_default_schema']}
+            self._flush_confirm_empty(cursor, [by_name[name.lower()] for name in tables if name.lower() in by_name])
+        referenced = {referenced_id for _, _, referenced_id in foreign_keys}
+
         if django_version >= (3, 1):
-            sequences = self._sql_flush_new(style, tables, *args, **kwargs)
+            sequences = self._sql_flush_new(style, tables, by_name, *args, **kwargs)
         else:
-            sequences = self._sql_flush_old(style, tables, *args, **kwargs)
-
-        from django.db import connections
-        cursor = connections[self.connection.alias].cursor()
-
-        seqs = self._build_sequences(sequences, cursor)
-
-        COLUMNS = "TABLE_NAME, CONSTRAINT_NAME"
-        WHERE = "CONSTRAINT_TYPE not in ('PRIMARY KEY','UNIQUE')"
-        cursor.execute(
-            "SELECT {} FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS WHERE {}".format(COLUMNS, WHERE))
-        fks = cursor.fetchall()
-        sql_list = ['ALTER TABLE %s NOCHECK CONSTRAINT %s;' %
-                    (self.quote_name(fk[0]), self.quote_name(fk[1])) for fk in fks]
-        sql_list.extend(['%s %s %s;' % (style.SQL_KEYWORD('DELETE'), style.SQL_KEYWORD('FROM'),
-                                        style.SQL_FIELD(self.quote_name(table))) for table in tables])
+            sequences = self._sql_flush_old(style, tables, by_name, *args, **kwargs)
 
-        if self.connection.to_azure_sql_db and self.connection.sql_server_version < 2014:
+        reset = {seq['table'].lower() for seq in sequences}
+        can_reseed = not (self.connection.to_azure_sql_db and self.connection.sql_server_version < 2014)
+        if reset and not can_reseed:
             warnings.warn("Resetting identity columns is not supported "
                           "on this versios of Azure SQL Database.",
                           RuntimeWarning)
-        else:
-            # Then reset the counters on each table.
-            sql_list.extend(['%s %s (%s, %s, %s) %s %s;' % (
-                style.SQL_KEYWORD('DBCC'),
-                style.SQL_KEYWORD('CHECKIDENT'),
-                style.SQL_FIELD(self.quote_name(seq["table"])),
-                style.SQL_KEYWORD('RESEED'),
-                style.SQL_FIELD('%d' % seq['start_id']),
-                style.SQL_KEYWORD('WITH'),
-                style.SQL_KEYWORD('NO_INFOMSGS'),
-            ) for seq in seqs])
 
+        # Only touch tables that hold rows or whose identity has moved on
+        # since it was last reset, TRUNCATE those no foreign key points to
+        # and DELETE from the others, referencing tables first.
+        truncate, delete, reseed = {}, {}, []
+        for name in tables:
+            table = by_name.get(name.lower())
+            if table is None:
+                # Not a table of the catalog, delete from it as before
+                delete[name] = None
+                continue
+            in_reset = name.lower() in reset
+            has_rows = table['rows'] is None or table['rows'] > 0
+            needs_reseed = (
+                in_reset and can_reseed and table['last_value'] is not None and
+                table['last_value'] != table['reseed_value'] and not table['is_memory_optimized']
+            )
+            if not has_rows and not needs_reseed:
+                continue
+            if table['truncatable'] and table['object_id'] not in referenced and (
+                table['reseed_value'] is None or in_reset
+            ):
+                # TRUNCATE also restarts the identity at its seed
+                truncate[table['name']] = table['object_id']
+                continue
+            if has_rows:
+                delete[table['name']] = table['object_id']
+            if needs_reseed:
+                reseed.append(table)
+
+        order, unchecked = self._flush_delete_order(delete, set(truncate.values()), catalog, foreign_keys)
+        sql_list = ['ALTER TABLE %s NOCHECK CONSTRAINT %s;' %
+                    (table, self.quote_name(constraint)) for table, constraint in unchecked]
+        sql_list.extend(['%s %s %s;' % (style.SQL_KEYWORD('TRUNCATE'), style.SQL_KEYWORD('TABLE'),
+                                        style.SQL_FIELD(self.quote_name(table))) for table in truncate])
+        sql_list.extend(['%s %s %s;' % (style.SQL_KEYWORD('DELETE'), style.SQL_KEYWORD('FROM'),
+                                        style.SQL_FIELD(self.quote_name(table))) for table in order])
+        # Then reset the counters on each table.
+        sql_list.extend(['%s %s (%s, %s, %s) %s %s;' % (
+            style.SQL_KEYWORD('DBCC'),
+            style.SQL_KEYWORD('CHECKIDENT'),
+            style.SQL_FIELD(self.quote_name(table['name'])),
+            style.SQL_KEYWORD('RESEED'),
+            style.SQL_FIELD('%d' % table['reseed_value']),
+            style.SQL_KEYWORD('WITH'),
+            style.SQL_KEYWORD('NO_INFOMSGS'),
+        ) for table in reseed])
         sql_list.extend(['ALTER TABLE %s CHECK CONSTRAINT %s;' %
-                         (self.quote_name(fk[0]), self.quote_name(fk[1])) for fk in fks])
+                         (table, self.quote_name(constraint)) for table, constraint in unchecked])
         return sql_list
 
+    def _flush_catalog(self, cursor):
+        """
+        Read, in one query, the row count, identity state and whether
+        TRUNCATE TABLE applies to each user table, keyed by object_id, and
+        the (constraint_name, parent_id, referenced_id) foreign keys between
+        them.
+        """
+        version = self.connection.sql_server_version
+        azure = self.connection.to_azure_sql_db
+        # TRUNCATE isn't allowed on memory-optimized, system-versioned,
+        # replicated tables or on those indexed views are built on.
+        is_memory_optimized = 't.is_memory_optimized' if azure or version >= 2014 else '0'
+        temporal = 't.temporal_type <> 0' if azure or version >= 2016 else '1 = 0'
+        cursor.execute(f"""
+            SELECT
+                t.object_id,
+                SCHEMA_NAME(t.schema_id),
+                t.name,
+                CASE WHEN t.schema_id = SCHEMA_ID() THEN 1 ELSE 0 END,
+                (
+                    SELECT SUM(p.rows)
+                    FROM sys.partitions AS p
+                    WHERE p.object_id = t.object_id AND p.index_id IN (0, 1)
+                ),
+                {is_memory_optimized},
+                CASE WHEN {temporal} OR t.is_replicated = 1 OR t.is_merge_published = 1 OR EXISTS (
+                    SELECT 1
+                    FROM sys.sql_expression_dependencies AS d
+                    INNER JOIN sys.indexes AS i ON
+                        i.object_id = d.referencing_id
+                    WHERE d.referenced_id = t.object_id
+                ) THEN 0 ELSE 1 END,
+                CONVERT(bigint, ic.last_value),
+                CONVERT(bigint, ic.seed_value) - CONVERT(bigint, ic.increment_value)
+            FROM sys.tables AS t
+            LEFT JOIN sys.identity_columns AS ic ON
+                ic.object_id = t.object_id
+        """)
+        catalog = {}
+        for (object_id, schema, name, in_default_schema, rows, is_memory_optimized, truncatable, last_value,
+             reseed_value) in cursor.fetchall():
+            catalog[object_id] = {
+                'object_id': object_id,
+                'schema': schema,
+                'name': name,
+                'in_default_schema': in_default_schema,
+                # The row counts of memory-optimized tables aren't tracked
+                'rows': None if is_memory_optimized else rows,
+                'is_memory_optimized': is_memory_optimized,
+                'truncatable': truncatable and not is_memory_optimized,
+                'last_value': last_value,
+                'reseed_value': reseed_value,
+            }
+        cursor.execute("SELECT name, parent_object_id, referenced_object_id FROM sys.foreign_keys")
+        return catalog, [tuple(row) for row in cursor.fetchall()]
+
+    def _flush_confirm_empty(self, cursor, tables):
+        """
+        Check with EXISTS, in one query, that the catalog tables whose
+        sys.partitions row count is 0 hold no rows: the count is only
+        approximate. Those that do get an unknown (None) row count.
+        """
+        empty = [table for table in tables if table['rows'] == 0]
+        if not empty:
+            return
+        cursor.execute(' UNION ALL '.join(
+            'SELECT %d WHERE EXISTS (SELECT 1 FROM %s.%s)' % (
+                table['object_id'], self.quote_name(table['schema']), self.quote_name(table['name']),
+            )
+            for table in empty
+        ))
+        by_id = {table['object_id']: table for table in empty}
+        for object_id, in cursor.fetchall():
+            by_id[object_id]['rows'] = None
+
+    def _flush_delete_order(self, delete, truncated_ids, catalog, foreign_keys):
+        """
+        Return the tables of the {name: object_id} delete dict in an order
+        that deletes referencing rows before the rows they reference, and the
+        (quoted table, constraint) foreign keys that must be disabled during
+        the flush: those in reference cycles and those of tables that keep
+        their rows.
+        """
+        deleted_ids = {object_id for object_id in delete.values() if object_id is not None}
+        # referenced_id: {parent_ids that must be deleted first}
+        waiting = {object_id: set() for object_id in deleted_ids}
+        unchecked = []
+        for constraint, parent_id, referenced_id in foreign_keys:
+            if referenced_id not in deleted_ids:
+                continue
+            if parent_id in deleted_ids and parent_id != referenced_id:
+                waiting[referenced_id].add(parent_id)
+            elif parent_id == referenced_id or (
+                parent_id not in truncated_ids and catalog[parent_id]['rows'] != 0
+            ):
+                parent = catalog[parent_id]
+                unchecked.append((
+                    '%s.%s' % (self.quote_name(parent['schema']), self.quote_name(parent['name'])), constraint,
+                ))
+        order = [name for name, object_id in delete.items() if object_id is None]
+        ready = [object_id for object_id in deleted_ids if not waiting[object_id]]
+        ready.sort(key=lambda object_id: catalog[object_id]['name'])
+        while ready:
+            object_id = ready.pop(0)
+            order.append(catalog[object_id]['name'])
+            del waiting[object_id]
+            for referenced_id, parents in waiting.items():
+                if object_id in parents:
+                    parents.discard(object_id)
+                    if not parents:
+                        ready.append(referenced_id)
+        if waiting:
+            # Reference cycles: disable their constraints and delete in any order
+            for constraint, parent_id, referenced_id in foreign_keys:
+                if parent_id in waiting and referenced_id in waiting and parent_id != referenced_id:
+                    parent = catalog[parent_id]
+                    unchecked.append((
+                        '%s.%s' % (self.quote_name(parent['schema']), self.quote_name(parent['name'])), constraint,
+                    ))
+            order.extend(sorted(catalog[object_id]['name'] for object_id in waiting))
+        return order, unchecked
+
     def start_transaction_sql(self):
         """
         Returns the SQL statement required to start a transaction.
@@ -0,0 +1,29 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the BSD license.
+
+from django.db.migrations import state
+from django.db.models import options
+
+
+def register_meta_options(*names):
+    """
+    Allow names as model Meta options and keep them in migration model
+    states, so that CreateModel carries them.
+    """
+    new_names = tuple(name for name in names if name not in options.DEFAULT_NAMES)
+    options.DEFAULT_NAMES = options.DEFAULT_NAMES + new_names
+    # django.db.migrations.state imports the tuple by name
+    state.DEFAULT_NAMES = options.DEFAULT_NAMES
+
+
+register_meta_options(
+    'partition_scheme',
+    'partition_field',
+    'data_compression',
+    'memory_optimized',
+    'durability',
+)
+
+
+def is_memory_optimized(model):
+    return model is not None and bool(getattr(model._meta, 'memory_optimized', False))
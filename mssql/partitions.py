@@ -0,0 +1,92 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the BSD license.
+
+from django.db import NotSupportedError, connections, router
+from django.db.models import QuerySet
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible(path='mssql.partitions.PartitionFunction')
+class PartitionFunction:
+    """
+    Partition function mapping values of ``input_type`` to partitions split at
+    ``boundaries``. With ``range='RIGHT'`` each boundary starts a partition.
+    """
+    def __init__(self, name, input_type, boundaries, range='RIGHT'):
+        if range not in ('LEFT', 'RIGHT'):
+            raise ValueError("PartitionFunction.range must be 'LEFT' or 'RIGHT'.")
+        self.name = name
+        self.input_type = input_type
+        self.boundaries = list(boundaries)
+        self.range = range
+
+    def __eq__(self, other):
+        return isinstance(other, PartitionFunction) and self.deconstruct() == other.deconstruct()
+
+
+@deconstructible(path='mssql.partitions.PartitionScheme')
+class PartitionScheme:
+    """
+    Partition scheme mapping the partitions of ``function`` to
+    ``filegroups``, or all of them to PRIMARY.
+
+    Declared on a model with the partitioned column:
+
+        class Meta:
+            partition_scheme = PartitionScheme(
+                'ps_monthly',
+                PartitionFunction('pf_monthly', 'date', [date(2024, 1, 1), date(2024, 2, 1)]),
+            )
+            partition_field = 'created_on'
+    """
+    def __init__(self, name, function, filegroups=None):
+        self.name = name
+        self.function = function
+        self.filegroups = list(filegroups) if filegroups else None
+
+    def __eq__(self, other):
+        return isinstance(other, PartitionScheme) and self.deconstruct() == other.deconstruct()
+
+
+def get_partitioning(model):
+    """
+    Return the (PartitionScheme, field) a model is partitioned on, or None.
+    """
+    scheme = getattr(model._meta, 'partition_scheme', None)
+    if scheme is None:
+        return None
+    field_name = getattr(model._meta, 'partition_field', None)
+    if field_name is None:
+        raise ValueError('%s declares partition_scheme without partition_field.' % model._meta.label)
+    return scheme, model._meta.get_field(field_name)
+
+
+class PartitionedQuerySet(QuerySet):
+    def truncate_partitions(self, *values):
+        """
+        Remove every row of the partitions holding the given values of the
+        partition field. The partitions are truncated, which only deallocates
+        their pages, instead of deleting rows one by one. Filters on the
+        queryset are ignored.
+        """
+        partitioning = get_partitioning(self.model)
+        if partitioning is None:
+            raise ValueError('%s is not partitioned.' % self.model._meta.label)
+        if not values:
+            return
+        scheme, field = partitioning
+        db = self._db or router.db_for_write(self.model)
+        connection = connections[db]
+        if not connection.to_azure_sql_db and connection.sql_server_version < 2016:
+            raise NotSupportedError('Truncating partitions requires SQL Server 2016 or later.')
+        quote_name = connection.ops.quote_name
+        values = [field.get_db_prep_value(value, connection) for value in values]
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT DISTINCT n FROM (VALUES %s) AS v (n)' % ', '.join(
+                ['($PARTITION.%s(%%s))' % quote_name(scheme.function.name)] * len(values)
+            ), values)
+            partitions = sorted(row[0] for row in cursor.fetchall())
+            cursor.execute('TRUNCATE TABLE %s WITH (PARTITIONS (%s))' % (
+                quote_name(self.model._meta.db_table),
+                ', '.join(str(partition) for partition in partitions),
+            ))
@@ -0,0 +1,298 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the BSD license.
+
+"""
+Translation of simple regular expressions to LIKE patterns.
+
+The regex and iregex lookups are otherwise evaluated row by row by the
+REGEXP_LIKE CLR function, which can't use an index. Patterns made of
+anchors, literals, character classes, bounded repetition and alternation
+have an exact LIKE equivalent and are translated at compile time;
+translate() returns None for anything else and the lookup falls back to
+the CLR function.
+"""
+
+import itertools
+
+# Upper bound on the number of LIKE patterns a single regex expands to
+MAX_ALTERNATIVES = 16
+MAX_REPEAT = 32
+
+# Collation the translated patterns are matched under, so character
+# ranges and case follow code points like the CLR regex engine does.
+BINARY_COLLATION = 'Latin1_General_100_BIN2'
+
+_START = object()
+_END = object()  # $ and \Z, which also match before a final newline
+_STRICT_END = object()  # \z
+_ANCHORS = (_START, _END, _STRICT_END)
+
+_CHAR_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', 'f': '\f', 'v': '\v'}
+_CLASS_UNSAFE = set('[]^-\\')
+
+
+class Unsupported(Exception):
+    pass
+
+
+class _Class(str):
+    """A LIKE fragment matching exactly one character."""
+
+
+class _Repeat(int):
+    """Zero or more repetitions of the preceding number of tokens."""
+
+
+_DOT = _Class('[^\n]')
+
+
+def _escape_like(char):
+    # Same escaping as DatabaseOperations.prep_for_like_query()
+    if char == '\\':
+        return '\\\\'
+    if char in '[%_':
+        return '[%s]' % char
+    return char
+
+
+def _has_letters(low, high):
+    return low <= ord('z') and high >= ord('A') and not (ord('Z') < low and high < ord('a'))
+
+
+class _Parser:
+    def __init__(self, pattern, case_insensitive):
+        self.pattern = pattern
+        self.case_insensitive = case_insensitive
+        self.pos = 0
+
+    def peek(self):
+        return self.pattern[self.pos] if self.pos < len(self.pattern) else None
+
+    def next(self):
+        char = self.peek()
+        if char is None:
+            raise Unsupported('unexpected end of pattern')
+        self.pos += 1
+        return char
+
+    def parse(self):
+        alternatives = self.alternation()
+        if self.peek() is not None:
+            raise Unsupported('unbalanced parenthesis')
+        return alternatives
+
+    def alternation(self):
+        alternatives = self.sequence()
+        while self.peek() == '|':
+            self.pos += 1
+            alternatives = alternatives + self.sequence()
+        return self._check_size(list(dict.fromkeys(alternatives)))
+
+    def sequence(self):
+        alternatives = [()]
+        while self.peek() not in (None, '|', ')'):
+            atom = self.quantified(self.atom())
+            alternatives = self._check_size([a + b for a, b in itertools.product(alternatives, atom)])
+        return alternatives
+
+    def atom(self):
+        char = self.next()
+        if char == '^':
+            return [(_START,)]
+        if char == '$':
+            return [(_END,)]
+        if char == '.':
+            return [(_DOT,)]
+        if char == '[':
+            return [(self.char_class(),)]
+        if char == '(':
+            if self.peek() == '?':
+                self.pos += 1
+                if self.next() != ':':
+                    raise Unsupported('group flags and lookarounds')
+            alternatives = self.alternation()
+            if self.next() != ')':
+                raise Unsupported('unbalanced parenthesis')
+            return alternatives
+        if char == '\\':
+            escaped = self.next()
+            if escaped == 'A':
+                return [(_START,)]
+            if escaped == 'Z':
+                return [(_END,)]
+            if escaped == 'z':
+                return [(_STRICT_END,)]
+            return [(self.escaped_char(escaped),)]
+        if char in '*+?{)':
+            raise Unsupported('misplaced quantifier')
+        return [(char,)]
+
+    def escaped_char(self, escaped):
+        if escaped in _CHAR_ESCAPES:
+            return _CHAR_ESCAPES[escaped]
+        if escaped.isalnum() or escaped == '_':
+            # \d, \w, \s, \b and friends are Unicode aware; backreferences
+            raise Unsupported('escape \\%s' % escaped)
+        return escaped
+
+    def char_class(self):
+        negate = self.peek() == '^'
+        if negate:
+            self.pos += 1
+        members = []
+        while True:
+            char = self.next()
+            if char == ']' and members:
+                break
+            low = self.class_char(char)
+            if self.peek() == '-' and self.pattern[self.pos + 1:self.pos + 2] not in ('', ']'):
+                self.pos += 1
+                high = self.class_char(self.next())
+                if low > high:
+                    raise Unsupported('bad character range')
+                members.append((low, high))
+            else:
+                members.append((low, low))
+        fragment = ''.join(self.class_member(low, high) for low, high in members)
+        return _Class('[%s%s]' % ('^' if negate else '', fragment))
+
+    def class_char(self, char):
+        if char == '\\':
+            char = self.escaped_char(self.next())
+        if char in _CLASS_UNSAFE or not (32 <= ord(char) < 0xD800 or char in _CHAR_ESCAPES.values()):
+            raise Unsupported('character class member %r' % char)
+        return char
+
+    def class_member(self, low, high):
+        if self.case_insensitive:
+            low_code, high_code = ord(low), ord(high)
+            if high_code > 127:
+                raise Unsupported('non-ASCII character class with iregex')
+            if low.islower() and high.islower() or low.isupper() and high.isupper():
+                low, high = low.upper(), high.upper()
+            elif _has_letters(low_code, high_code):
+                raise Unsupported('character range spanning cases with iregex')
+        return low if low == high else '%s-%s' % (low, high)
+
+    def quantified(self, atom):
+        char = self.peek()
+        if char == '?':
+            low, high = 0, 1
+        elif char in ('*', '+'):
+            low, high = (0 if char == '*' else 1), None
+        elif char == '{':
+            low, high = self.braces()
+        else:
+            return atom
+        self.pos += 1
+        if self.peek() == '?':
+            # Laziness doesn't change whether a pattern matches
+            self.pos += 1
+        if high is None:
+            return [
+                alternative * low + (_Repeat(len(alternative) if low else 0),) for alternative in atom
+            ]
+        if any(token in _ANCHORS for alternative in atom for token in alternative):
+            raise Unsupported('repeated anchor')
+        if high > MAX_REPEAT:
+            raise Unsupported('repetition count')
+        if low > high:
+            # An error for the regex engine
+            raise Unsupported('repetition range')
+        alternatives = []
+        for count in range(low, high + 1):
+            alternatives.extend(
+                sum(parts, ()) for parts in itertools.product(atom, repeat=count)
+            )
+            self._check_size(alternatives)
+        return list(dict.fromkeys(alternatives))
+
+    def braces(self):
+        end = self.pattern.find('}', self.pos)
+        if end == -1:
+            raise Unsupported('literal brace')
+        low, sep, high = self.pattern[self.pos + 1:end].partition(',')
+        if not low.isdigit() or sep and high and not high.isdigit():
+            raise Unsupported('literal brace')
+        # Leave pos on the closing brace, quantified() steps over it.
+        self.pos = end
+        if not sep:
+            return int(low), int(low)
+        return int(low), int(high) if high else None
+
+    def _check_size(self, alternatives):
+        if len(alternatives) > MAX_ALTERNATIVES:
+            raise Unsupported('too many alternatives')
+        return alternatives
+
+
+def _like_patterns(tokens, case_insensitive):
+    """
+    Yield (pattern, prefix) LIKE patterns equivalent to one alternative.
+    prefix is the literal text the pattern starts with, usable for an index
+    seek, or None.
+    """
+    tokens = list(tokens)
+    start = bool(tokens) and tokens[0] is _START
+    if start:
+        tokens.pop(0)
+    end = tokens[-1] if tokens and tokens[-1] in (_END, _STRICT_END) else None
+    if end:
+        tokens.pop()
+    # LIKE can't express x* or .* (which stops at a newline), but next to an
+    # unanchored edge of the pattern they may as well match nothing, and x+
+    # may as well match x once.
+    if not start:
+        while True:
+            index = next((i for i, token in enumerate(tokens) if isinstance(token, _Repeat)), None)
+            if index is None or index != tokens[index]:
+                break
+            del tokens[index]
+    if not end:
+        while tokens and isinstance(tokens[-1], _Repeat):
+            tokens.pop()
+    body = []
+    prefix = ''
+    in_prefix = start
+    for token in tokens:
+        if isinstance(token, _Repeat) or token in _ANCHORS:
+            raise Unsupported('anchor or unbounded repetition inside the pattern')
+        if isinstance(token, _Class):
+            body.append(token)
+            in_prefix = False
+            continue
+        if case_insensitive:
+            if ord(token) > 127:
+                raise Unsupported('non-ASCII literal with iregex')
+            token = token.upper()
+        body.append(_escape_like(token))
+        if in_prefix:
+            prefix += body[-1]
+    body = ''.join(body)
+    prefix = prefix + '%' if prefix and not case_insensitive else None
+    head = '' if start else '%'
+    if end is None:
+        yield head + body + '%', prefix
+    else:
+        yield head + body, prefix
+        if end is _END:
+            yield head + body + '\n', prefix
+
+
+def translate(pattern, case_insensitive=False):
+    """
+    Return a list of (pattern, prefix) pairs such that a string matches the
+    regular expression if and only if it is LIKE any of the patterns under a
+    binary collation (with the string upper cased when case_insensitive).
+    prefix, when not None, is a LIKE pattern for the literal start of the
+    match, which any collation satisfies for matching strings.
+
+    Return None if the regular expression has no LIKE equivalent.
+    """
+    try:
+        alternatives = _Parser(pattern, case_insensitive).parse()
+        patterns = [like for tokens in alternatives for like in _like_patterns(tokens, case_insensitive)]
+    except Unsupported:
+        return None
+    # No pattern at all would render as an empty OR
+    return list(dict.fromkeys(patterns)) if 0 < len(patterns) <= MAX_ALTERNATIVES else None
@@ -3,8 +3,12 @@
 
 import binascii
 import datetime
+import re
+import weakref
 
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from contextlib import contextmanager
+from functools import wraps
 
 from django.db.backends.base.schema import (
     BaseDatabaseSchemaEditor,
@@ -19,31 +23,257 @@ from django.db.backends.ddl_references import (
     Table,
 )
 from django import VERSION as django_version
-from django.db.models import NOT_PROVIDED, Index, UniqueConstraint
+from django.db import DatabaseError, IntegrityError, NotSupportedError, transaction
+from django.db.migrations.operations import RunPython, RunSQL
+from django.db.models import NOT_PROVIDED, Index, UniqueConstraint, Value
 from django.db.models.fields import AutoField, BigAutoField
 from django.db.models.sql.where import AND
 from django.db.transaction import TransactionManagementError
 from django.utils.encoding import force_str
 
+from .indexes import ColumnstoreIndex, FullTextIndex, get_index_options
+from .options import is_memory_optimized
+from .partitions import get_partitioning
+
+if django_version >= (3, 1):
+    from django.db.models.fields.json import compile_json_path
 if django_version >= (4, 0):
     from django.db.models.sql import Query
     from django.db.backends.ddl_references import Expressions
 
 
+class StatementParts(dict):
+    """A statement's parts, telling the statement when one is replaced."""
+
+    def __init__(self, statement, parts):
+        super().__init__(parts)
+        self.statement = statement
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.statement._renamed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self.statement._renamed()
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.statement._renamed()
+
+
 class Statement(DjStatement):
+    def __init__(self, template, **parts):
+        self._sql = self._key = None
+        # DeferredSQL instances holding the statement
+        self._owners = weakref.WeakSet()
+        super().__init__(template, **parts)
+
+    def __getstate__(self):
+        # Copies belong to no DeferredSQL
+        state = self.__dict__.copy()
+        del state['_owners']
+        state['_parts'] = dict(self._parts)
+        return state
+
+    def __setstate__(self, state):
+        parts = state.pop('_parts')
+        self.__dict__.update(state, _owners=weakref.WeakSet())
+        self.parts = parts
+
+    @property
+    def parts(self):
+        return self._parts
+
+    @parts.setter
+    def parts(self, parts):
+        self._parts = StatementParts(self, parts)
+        self._renamed()
+
+    def __str__(self):
+        # Rendering names a statement's indexes and constraints, keep it
+        # until the statement is renamed.
+        if self._sql is None:
+            self._sql = super().__str__()
+        return self._sql
+
+    def _get_key(self):
+        if self._key is None:
+            self._key = (self.template, str(self.parts['name']))
+        return self._key
+
     def __hash__(self):
-        return hash((self.template, str(self.parts['name'])))
+        return hash(self._get_key())
 
     def __eq__(self, other):
-        return self.template == other.template and str(self.parts['name']) == str(other.parts['name'])
+        if not isinstance(other, Statement):
+            return NotImplemented
+        return self._get_key() == other._get_key()
+
+    def _renamed(self):
+        self._sql = self._key = None
+        for owner in list(self._owners):
+            owner._rekey(self)
+
+    def rename_table_references(self, old_table, new_table):
+        super().rename_table_references(old_table, new_table)
+        self._renamed()
 
     def rename_column_references(self, table, old_column, new_column):
         for part in self.parts.values():
             if hasattr(part, 'rename_column_references'):
                 part.rename_column_references(table, old_column, new_column)
-            condition = self.parts['condition']
-            if condition:
-                self.parts['condition'] = condition.replace(f'[{old_column}]', f'[{new_column}]')
+        condition = self.parts.get('condition')
+        if condition:
+            # Replacing the part renames the statement
+            self.parts['condition'] = condition.replace(f'[{old_column}]', f'[{new_column}]')
+        else:
+            self._renamed()
+
+
+AlterFieldPlan = namedtuple('AlterFieldPlan', ['statements', 'dropped'])
+
+
+class DeferredSQL:
+    """
+    The schema editor's deferred statements, in the order they were added
+    and without duplicates. Unlike the list Django keeps them in, finding and
+    removing a statement doesn't compare it with every other one.
+    """
+
+    def __init__(self, statements=()):
+        # id() of each statement mapped to the statement, its key in
+        # _statements and its rendered SQL, in the order they were added
+        self._entries = {}
+        self._statements = {}
+        # Rendered SQL of the statements, with its number of occurrences
+        self._rendered = {}
+        # Statements which can't report renames, rendered on each lookup
+        self._unrendered = {}
+        self.extend(statements)
+
+    @staticmethod
+    def _key(statement):
+        return statement._get_key() if isinstance(statement, Statement) else statement
+
+    def _add(self, statement, key):
+        if isinstance(statement, (Statement, str)):
+            sql = str(statement)
+            self._rendered[sql] = self._rendered.get(sql, 0) + 1
+        else:
+            sql = None
+            self._unrendered[id(statement)] = statement
+        self._statements[key] = statement
+        self._entries[id(statement)] = (statement, key, sql)
+
+    def _discard(self, statement):
+        statement, key, sql = self._entries[id(statement)]
+        del self._statements[key]
+        if sql is None:
+            del self._unrendered[id(statement)]
+        else:
+            self._rendered[sql] -= 1
+            if not self._rendered[sql]:
+                del self._rendered[sql]
+        return key
+
+    def _rekey(self, statement):
+        # Called by a renamed statement, which hashes and renders differently
+        self._discard(statement)
+        key = statement._get_key()
+        if key in self._statements:
+            # It duplicates another statement now
+            del self._entries[id(statement)]
+            statement._owners.discard(self)
+        else:
+            # Keeps the statement's position in _entries
+            self._add(statement, key)
+
+    def append(self, statement):
+        key = self._key(statement)
+        if key not in self._statements:
+            self._add(statement, key)
+            if isinstance(statement, Statement):
+                statement._owners.add(self)
+
+    def extend(self, statements):
+        for statement in statements:
+            self.append(statement)
+
+    def remove(self, statement):
+        try:
+            statement = self._statements[self._key(statement)]
+        except KeyError:
+            raise ValueError('%r is not a deferred statement.' % statement)
+        self._discard(statement)
+        del self._entries[id(statement)]
+        if isinstance(statement, Statement):
+            statement._owners.discard(self)
+
+    def clear(self):
+        for statement, _, _ in self._entries.values():
+            if isinstance(statement, Statement):
+                statement._owners.discard(self)
+        self._entries.clear()
+        self._statements.clear()
+        self._rendered.clear()
+        self._unrendered.clear()
+
+    def contains_sql(self, sql):
+        """Return whether a statement renders as the given SQL."""
+        return sql in self._rendered or any(str(statement) == sql for statement in self._unrendered.values())
+
+    def __contains__(self, statement):
+        return self._key(statement) in self._statements
+
+    def __iter__(self):
+        return iter([statement for statement, _, _ in self._entries.values()])
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __repr__(self):
+        return '<%s %r>' % (self.__class__.__name__, list(self))
+
+
+# Session context key holding the position reached in a DDL batch
+_ddl_batch_key = 'mssql_django.ddl_batch_statement'
+
+# DDL dropping a single constraint or index, which the constraint snapshots
+# of DatabaseSchemaEditor follow without re-reading the catalog.
+_drop_constraint_re = re.compile(
+    r'^\s*(?:ALTER TABLE \[(?P<table>[^\]]+)\] DROP CONSTRAINT \[(?P<name>[^\]]+)\]|'
+    r'DROP INDEX \[(?P<index>[^\]]+)\] ON \[(?P<index_table>[^\]]+)\])\s*;?\s*$'
+)
+
+# Bracketed identifiers and string literals, which name tables in EXEC(),
+# OBJECT_ID() and sp_rename.
+_identifier_re = re.compile(r"\[((?:[^\]]|\]\])+)\]|'((?:[^']|'')*)'")
+
+
+def _sql_identifiers(sql):
+    """Return the lowercased names that the SQL quotes."""
+    names = set()
+    for identifier, literal in _identifier_re.findall(sql):
+        if literal:
+            literal = literal.replace("''", "'")
+            names.update(part.strip('[]').lower() for part in literal.split('.'))
+            names.update(_sql_identifiers(literal))
+        else:
+            names.add(identifier.replace(']]', ']').lower())
+    return names
+
+
+# Types SQL Server can lengthen without dropping the column's indexes and
+# constraints first.
+_variable_length_type_re = re.compile(r'^(?P<type>n?varchar|varbinary)\((?P<length>\d+)\)$', re.IGNORECASE)
+
+# Column types whose defaults are written to every row even on editions that
+# otherwise add columns with a default as a metadata-only change.
+_row_default_types_re = re.compile(
+    r'^(?:(?:n?varchar|varbinary)\(max\)|n?text|image|xml|geography|geometry|hierarchyid)\b',
+    re.IGNORECASE,
+)
 
 
 class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
@@ -92,8 +322,64 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
 """
     sql_rename_column = "EXEC sp_rename '%(table)s.%(old_column)s', %(new_column)s, 'COLUMN'"
     sql_rename_table = "EXEC sp_rename %(old_table)s, %(new_table)s"
+    # SQL Server expects WHERE before WITH and ON, which go in %(extra)s
+    sql_create_index = "CREATE INDEX %(name)s ON %(table)s (%(columns)s)%(include)s%(condition)s%(extra)s"
     sql_create_unique_null = "CREATE UNIQUE INDEX %(name)s ON %(table)s(%(columns)s) " \
                              "WHERE %(columns)s IS NOT NULL"
+    sql_create_json_path_index = "ALTER TABLE %(table)s ADD %(columns)s AS " \
+                                 "TRY_CAST(JSON_VALUE(%(json_column)s, '%(path)s') AS %(type)s) PERSISTED; " \
+                                 "CREATE INDEX %(name)s ON %(table)s (%(columns)s)%(include)s%(condition)s%(extra)s"
+    sql_delete_json_path_index = "DROP INDEX %(name)s ON %(table)s; ALTER TABLE %(table)s DROP COLUMN %(columns)s"
+    sql_create_columnstore_index = "CREATE NONCLUSTERED COLUMNSTORE INDEX %(name)s ON %(table)s " \
+                                   "(%(columns)s)%(condition)s%(extra)s"
+    sql_create_clustered_columnstore_index = "CREATE CLUSTERED COLUMNSTORE INDEX %(name)s ON %(table)s%(extra)s"
+    sql_create_ordered_columnstore_index = "CREATE CLUSTERED COLUMNSTORE INDEX %(name)s ON %(table)s " \
+                                           "ORDER (%(columns)s)%(extra)s"
+    sql_create_partition_function = "IF NOT EXISTS (SELECT 1 FROM sys.partition_functions " \
+                                    "WHERE name = %(name_value)s) " \
+                                    "EXEC(N'CREATE PARTITION FUNCTION %(name)s (%(input_type)s) " \
+                                    "AS RANGE %(range)s FOR VALUES (%(boundaries)s)')"
+    sql_create_partition_scheme = "IF NOT EXISTS (SELECT 1 FROM sys.partition_schemes WHERE name = %(name_value)s) " \
+                                  "EXEC(N'CREATE PARTITION SCHEME %(name)s AS PARTITION %(function)s " \
+                                  "%(filegroups)s')"
+    sql_partitioned_pk_constraint = "CONSTRAINT %(name)s PRIMARY KEY%(type)s (%(columns)s)"
+    sql_table_data_compression = "DATA_COMPRESSION = %(compression)s"
+    sql_table_memory_optimized = "MEMORY_OPTIMIZED = ON, DURABILITY = %(durability)s"
+    sql_memory_optimized_index = "INDEX %(name)s NONCLUSTERED (%(columns)s)"
+    sql_memory_optimized_hash_index = "INDEX %(name)s NONCLUSTERED HASH (%(columns)s) " \
+                                      "WITH (BUCKET_COUNT = %(bucket_count)s)"
+    sql_add_memory_optimized_index = "ALTER TABLE %(table)s ADD %(index)s"
+    sql_delete_memory_optimized_index = "ALTER TABLE %(table)s DROP INDEX %(name)s"
+    sql_rebuild_table = "ALTER TABLE %(table)s REBUILD PARTITION = ALL WITH (%(options)s)"
+    sql_rebuild_index = "ALTER INDEX %(name)s ON %(table)s REBUILD PARTITION = ALL WITH (%(options)s)"
+    sql_rename_index = "EXEC sp_rename '%(table)s.%(old_name)s', %(new_name)s, 'INDEX'"
+    sql_create_fulltext_index = "IF NOT EXISTS (SELECT 1 FROM sys.fulltext_catalogs WHERE name = %(catalog_name)s) " \
+                                "EXEC(N'CREATE FULLTEXT CATALOG %(catalog)s'); " \
+                                "DECLARE @key_index sysname = (SELECT name FROM sys.indexes " \
+                                "WHERE object_id = OBJECT_ID(%(table_name)s) AND is_primary_key = 1); " \
+                                "EXEC(N'CREATE FULLTEXT INDEX ON %(table)s (%(columns)s) KEY INDEX ' + " \
+                                "QUOTENAME(@key_index) + N' ON %(catalog)s " \
+                                "WITH CHANGE_TRACKING = %(change_tracking)s')"
+    sql_delete_fulltext_index = "DROP FULLTEXT INDEX ON %(table)s"
+    sql_add_online_shadow_column = "IF COL_LENGTH(%(table_name)s, %(shadow_name)s) IS NULL " \
+                                   "ALTER TABLE %(table)s ADD %(shadow)s %(type)s %(null)s"
+    sql_create_online_sync_trigger = "IF OBJECT_ID(%(trigger_name)s, 'TR') IS NULL " \
+                                     "EXEC(N'CREATE TRIGGER %(trigger)s ON %(table)s AFTER INSERT, UPDATE AS " \
+                                     "SET NOCOUNT ON; IF UPDATE(%(column)s) UPDATE t SET %(shadow)s = i.%(column)s " \
+                                     "FROM %(table)s t INNER JOIN inserted i ON t.%(pk)s = i.%(pk)s')"
+    sql_select_online_nulls = "SELECT TOP 1 1 FROM %(table)s WHERE %(shadow)s IS NULL"
+    sql_select_online_progress = "SELECT CAST(value AS nvarchar(4000)) FROM sys.extended_properties " \
+                                 "WHERE major_id = OBJECT_ID(%(trigger_name)s) AND name = N'%(property)s'"
+    sql_set_online_progress = "DECLARE @schema sysname = OBJECT_SCHEMA_NAME(OBJECT_ID(%(table_name)s)); " \
+                              "IF EXISTS (SELECT 1 FROM sys.extended_properties " \
+                              "WHERE major_id = OBJECT_ID(%(trigger_name)s) AND name = N'%(property)s') " \
+                              "EXEC sp_updateextendedproperty N'%(property)s', %%s, N'SCHEMA', @schema, " \
+                              "N'TABLE', %(table_name)s, N'TRIGGER', %(trigger_name)s " \
+                              "ELSE EXEC sp_addextendedproperty N'%(property)s', %%s, N'SCHEMA', @schema, " \
+                              "N'TABLE', %(table_name)s, N'TRIGGER', %(trigger_name)s"
+    sql_create_online_index = "IF INDEXPROPERTY(OBJECT_ID(%(table_name)s), %(name_value)s, 'IndexID') IS NULL " \
+                              "CREATE %(unique)sNONCLUSTERED INDEX %(name)s ON %(table)s (%(columns)s)" \
+                              "%(include)s%(condition)s%(options)s"
     sql_alter_table_comment= """
         IF NOT EXISTS (SELECT NULL FROM sys.extended_properties ep
             WHERE ep.major_id = OBJECT_ID('%(table)s')
@@ -130,6 +416,23 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
     """
     _deferred_unique_indexes = defaultdict(list)
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # get_constraints() of the tables this editor has looked at, kept in
+        # step with the DDL it runs.
+        self._constraint_snapshots = {}
+        # Statements waiting to be sent in a batch(), or None
+        self._ddl_batch = None
+        self.deferred_sql = DeferredSQL()
+        # How add_field() filled in each column it added on existing rows,
+        # {(table, column): 'metadata-only' | 'backfill' | 'size-of-data'}
+        self.add_field_paths = {}
+
+    def __enter__(self):
+        editor = super().__enter__()
+        self.deferred_sql = DeferredSQL()
+        return editor
+
     def _alter_column_default_sql(self, model, old_field, new_field, drop=False):
         """
         Hook to specialize column default alteration.
@@ -342,8 +645,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                 self.connection.introspection.identifier_converter(name)
                 for name in column_names
             ]
-        with self.connection.cursor() as cursor:
-            constraints = self.connection.introspection.get_constraints(cursor, db_table)
+        constraints = self._get_table_constraints(db_table)
         result = []
         for name, infodict in constraints.items():
             if column_names is None or column_names == infodict['columns'] or (
@@ -367,6 +669,57 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                     result.append(name)
         return result
 
+    def _constraint_names(self, model, column_names=None, unique=None, primary_key=None, index=None,
+                          foreign_key=None, check=None, type_=None, exclude=None):
+        return self._db_table_constraint_names(
+            model._meta.db_table, column_names, unique=unique, primary_key=primary_key, index=index,
+            foreign_key=foreign_key, check=check, type_=type_, exclude=exclude,
+        )
+
+    def _get_table_constraints(self, db_table):
+        """
+        Return introspection.get_constraints() of the table, read once for the
+        life of the editor.
+        """
+        if db_table not in self._constraint_snapshots:
+            if self._ddl_batch:
+                self._execute_ddl_batch()
+            with self.connection.cursor() as cursor:
+                self._constraint_snapshots[db_table] = self.connection.introspection.get_constraints(
+                    cursor, db_table,
+                )
+        return self._constraint_snapshots[db_table]
+
+    def _update_constraint_snapshots(self, sql, statement=None):
+        """
+        Bring the constraint snapshots up to date with a statement that has
+        run. Dropping a constraint or index removes it from the snapshot and
+        any other statement referencing a table discards the table's
+        snapshot. Tables are referenced by the Statement's parts or quoted in
+        the SQL, compared case-insensitively like SQL Server does. A
+        statement referencing none of them, other than a catalog read,
+        discards them all.
+        """
+        if not self._constraint_snapshots or sql.lstrip()[:6].upper() == 'SELECT':
+            return
+        tables = {db_table.lower(): db_table for db_table in self._constraint_snapshots}
+        match = _drop_constraint_re.match(sql)
+        if match:
+            table = tables.get((match['table'] or match['index_table']).lower())
+            if table is not None:
+                name = (match['name'] or match['index']).lower()
+                constraints = self._constraint_snapshots[table]
+                for constraint in [constraint for constraint in constraints if constraint.lower() == name]:
+                    del constraints[constraint]
+                return
+        mentioned = {tables[name] for name in _sql_identifiers(sql) if name in tables}
+        if isinstance(statement, DjStatement):
+            mentioned.update(
+                db_table for db_table in self._constraint_snapshots if statement.references_table(db_table)
+            )
+        for db_table in mentioned or list(self._constraint_snapshots):
+            del self._constraint_snapshots[db_table]
+
     def _db_table_delete_constraint_sql(self, template, db_table, name):
         return Statement(
             template,
@@ -410,6 +763,8 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             raise NotImplementedError("the backend doesn't support altering from %s to %s." %
                 (old_field.get_internal_type(), new_field.get_internal_type()))
 
+        # Whether ALTER COLUMN can leave the column's indexes and constraints alone
+        keep_dependents = self._alter_column_keeps_dependents(old_field, new_field, old_db_params, new_db_params)
         # Drop any FK constraints, we'll remake them later
         fks_dropped = set()
         if (
@@ -424,6 +779,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                     ignore={"db_comment"})
                 )
             )
+            and not self._foreign_key_survives_alter(old_field, new_field, old_type, new_type)
         ):
             # Drop index, SQL Server requires explicit deletion
             if not hasattr(new_field, 'db_constraint') or not new_field.db_constraint:
@@ -503,7 +859,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         if (old_db_params['check'] != new_db_params['check'] and old_db_params['check']) or (
             # SQL Server requires explicit deletion befor altering column type with the same constraint
             old_db_params['check'] == new_db_params['check'] and old_db_params['check'] and
-            old_db_params['type'] != new_db_params['type']
+            old_db_params['type'] != new_db_params['type'] and not keep_dependents
         ):
             constraint_names = self._constraint_names(model, [old_field.column], check=True)
             if strict and len(constraint_names) != 1:
@@ -567,10 +923,11 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                 fragment, other_actions =  self._alter_column_type_sql(model, old_field, new_field, new_type)
             actions.append(fragment)
             post_actions.extend(other_actions)
-            # Drop unique constraint, SQL Server requires explicit deletion
-            self._delete_unique_constraints(model, old_field, new_field, strict)
-            # Drop indexes, SQL Server requires explicit deletion
-            self._delete_indexes(model, old_field, new_field)
+            if not keep_dependents:
+                # Drop unique constraint, SQL Server requires explicit deletion
+                self._delete_unique_constraints(model, old_field, new_field, strict)
+                # Drop indexes, SQL Server requires explicit deletion
+                self._delete_indexes(model, old_field, new_field)
         # db_default change?
         if django_version >= (5,0):
             if new_field.db_default is not NOT_PROVIDED:
@@ -612,6 +969,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             fragment = self._alter_column_null_sql(model, old_field, new_field)
             if fragment:
                 null_actions.append(fragment)
+            if fragment and not keep_dependents:
                 # Drop unique constraint, SQL Server requires explicit deletion
                 self._delete_unique_constraints(model, old_field, new_field, strict)
                 # Drop indexes, SQL Server requires explicit deletion
@@ -628,7 +986,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                      (indexes_dropped and sorted(indexes_dropped) == sorted(auto_index_names)))
                 ):
                     create_index_sql_statement = self._create_index_sql(model, [new_field])
-                    if create_index_sql_statement.__str__() not in [sql.__str__() for sql in self.deferred_sql]:
+                    if not self.deferred_sql.contains_sql(str(create_index_sql_statement)):
                         post_actions.append((create_index_sql_statement, ()))
         # Only if we have a default and there is a change from NULL to NOT NULL
         four_way_default_alteration = (
@@ -715,7 +1073,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         # Restore indexes & unique constraints deleted above, SQL Server requires explicit restoration
         if (old_type != new_type or (old_field.null != new_field.null)) and (
             old_field.column == new_field.column  # column rename is handled separately above
-        ):
+        ) and not keep_dependents:
             # Restore unique constraints
             # Note: if nullable they are implemented via an explicit filtered UNIQUE INDEX (not CONSTRAINT)
             # in order to get ANSI-compliant NULL behaviour (i.e. NULL != NULL, multiple are allowed)
@@ -799,9 +1157,10 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             if index_columns:
                 for columns in index_columns:
                     create_index_sql_statement = self._create_index_sql(model, columns)
-                    if (create_index_sql_statement.__str__()
-                            not in [sql.__str__() for sql in self.deferred_sql] + [statement[0].__str__() for statement in post_actions]
-                            ):
+                    index_sql = str(create_index_sql_statement)
+                    if not self.deferred_sql.contains_sql(index_sql) and index_sql not in [
+                        str(statement[0]) for statement in post_actions
+                    ]:
                         self.execute(create_index_sql_statement)
 
         # Type alteration on primary key? Then we need to alter the column
@@ -884,7 +1243,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         if (old_db_params['check'] != new_db_params['check'] and new_db_params['check']) or (
             # SQL Server requires explicit creation after altering column type with the same constraint
             old_db_params['check'] == new_db_params['check'] and new_db_params['check'] and
-            old_db_params['type'] != new_db_params['type']
+            old_db_params['type'] != new_db_params['type'] and not keep_dependents
         ):
             self.execute(
                 self.sql_create_check % {
@@ -910,6 +1269,62 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         if self.connection.features.connection_persists_old_columns:
             self.connection.close()
 
+    def _alter_column_keeps_dependents(self, old_field, new_field, old_db_params, new_db_params):
+        """
+        Return whether SQL Server can alter the column without first dropping
+        the indexes, unique and check constraints on it: a varchar, nvarchar
+        or varbinary column keeping its type and collation, not shrinking
+        and not part of a primary key. Nullability may change, except on a
+        unique column: a nullable one is unique through a filtered index
+        instead of a UNIQUE constraint.
+        """
+        old_match = _variable_length_type_re.match(old_db_params['type'] or '')
+        new_match = _variable_length_type_re.match(new_db_params['type'] or '')
+        return bool(
+            old_match and new_match and
+            old_match['type'].lower() == new_match['type'].lower() and
+            int(new_match['length']) >= int(old_match['length']) and
+            old_db_params.get('collation') == new_db_params.get('collation') and
+            not old_field.primary_key and not new_field.primary_key and
+            not ((old_field.unique or new_field.unique) and old_field.null != new_field.null)
+        )
+
+    def _foreign_key_survives_alter(self, old_field, new_field, old_type, new_type):
+        """
+        Return whether the foreign key of old_field's column can stay as it
+        is: the column keeps its type and still references the same column.
+        Renames and nullability changes don't affect the constraint.
+        """
+        if not (new_field.remote_field and new_field.db_constraint) or old_type != new_type:
+            return False
+        old_target, new_target = old_field.target_field, new_field.target_field
+        return (
+            old_target.model._meta.db_table == new_target.model._meta.db_table and
+            old_target.column == new_target.column
+        )
+
+    def alter_field_plan(self, model, old_field, new_field, strict=False):
+        """
+        Dry run of alter_field(). Return an AlterFieldPlan of the statements
+        it would run, deferred ones included, and of the (table, name) of the
+        indexes and constraints it would drop, which it mostly creates again.
+        The database isn't changed.
+        """
+        state = (self.collect_sql, self.collected_sql, self.deferred_sql, self._constraint_snapshots)
+        self.collect_sql, self.collected_sql, self.deferred_sql = True, [], DeferredSQL()
+        self._constraint_snapshots = {table: dict(constraints) for table, constraints in state[3].items()}
+        try:
+            self.alter_field(model, old_field, new_field, strict)
+            statements = self.collected_sql + [str(sql) + ';' for sql in self.deferred_sql]
+        finally:
+            self.collect_sql, self.collected_sql, self.deferred_sql, self._constraint_snapshots = state
+        dropped = []
+        for statement in statements:
+            match = _drop_constraint_re.match(statement)
+            if match:
+                dropped.append((match['table'] or match['index_table'], match['name'] or match['index']))
+        return AlterFieldPlan(statements, dropped)
+
     def _delete_indexes(self, model, old_field, new_field):
         index_columns = []
         index_names = []
@@ -1025,11 +1440,19 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         # It might not actually have a column behind it
         if definition is None:
             return
+        path = self._add_field_path(model, field, 'DEFAULT' in definition)
+        if path == 'backfill':
+            # Add the column nullable and without a default, then fill it in
+            definition, params = self.column_sql(model, field)
+            if not field.null:
+                definition = definition.replace(' NOT NULL', ' NULL', 1)
         if col_type_suffix := field.db_type_suffix(connection=self.connection):
             definition += f" {col_type_suffix}"
         # Remove column type from definition if field is generated
         if (django_version >= (5,0) and field.generated):
             definition = definition[definition.find('AS'):]
+        if field.unique and not field.primary_key:
+            self._check_partition_column(model, [field.column])
         # Nullable columns with default values require 'WITH VALUES' to set existing rows
         if 'DEFAULT' in definition and field.null:
             definition = definition.replace('NULL', 'WITH VALUES')
@@ -1046,7 +1469,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
 
         # Check constraints can go on the column SQL here
         db_params = field.db_parameters(connection=self.connection)
-        if db_params['check']:
+        if db_params['check'] and path != 'backfill':
             definition += " CHECK (%s)" % db_params['check']
         # Build the SQL and run it
         sql = self.sql_create_column % {
@@ -1055,9 +1478,12 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             "definition": definition,
         }
         self.execute(sql, params)
+        if path == 'backfill':
+            self._backfill_column(model, field)
+            self._enforce_column(model, field, db_params)
         # Drop the default if we need to
         # (Django usually does not use in-database defaults)
-        if (
+        elif (
             ((django_version >= (5,0) and field.db_default is NOT_PROVIDED) or django_version < (5,0))
             and not self.skip_default(field)
             and self.effective_default(field) is not None
@@ -1068,6 +1494,8 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                 "changes": changes_sql,
             }
             self.execute(sql, params)
+        self.add_field_paths[(model._meta.db_table, field.column)] = path
+        logger.info('Added column %s.%s (%s).', model._meta.db_table, field.column, path)
         # Add field comment, if required.
         if django_version >= (4, 2):
             if (
@@ -1090,6 +1518,98 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         if self.connection.features.connection_persists_old_columns:
             self.connection.close()
 
+    def _add_field_path(self, model, field, has_default):
+        """
+        Choose how add_field() fills in a new column on existing rows:
+
+        - 'metadata-only': the rows aren't touched, because the column has no
+          default or the edition keeps a constant default in the table's
+          metadata (Enterprise and Azure SQL, but not for LOB, XML and
+          spatial types).
+        - 'backfill': add the column nullable and without a default, set it
+          on existing rows in chunks of the backfill_batch_size database
+          option, then make it NOT NULL.
+        - 'size-of-data': ALTER TABLE ... ADD writes the default to every
+          row, for tables that fit in a chunk, columns a backfill can't add,
+          such as unique ones or those with a database default, and inside
+          an atomic block, where the chunks couldn't commit on their own.
+        """
+        if not has_default:
+            return 'metadata-only'
+        db_default = getattr(field, 'db_default', NOT_PROVIDED)
+        db_type = field.db_parameters(connection=self.connection)['type'] or ''
+        if (
+            self.connection.features.supports_metadata_only_add_column and
+            not _row_default_types_re.match(db_type) and
+            (db_default is NOT_PROVIDED or isinstance(db_default, Value))
+        ):
+            return 'metadata-only'
+        batch_size = self.connection.settings_dict['OPTIONS'].get('backfill_batch_size', 4000)
+        if (
+            not batch_size or self.collect_sql or self.connection.in_atomic_block or
+            db_default is not NOT_PROVIDED or field.primary_key or field.unique or is_memory_optimized(model)
+        ):
+            return 'size-of-data'
+        rows = self.execute(
+            "SELECT SUM(rows) FROM sys.partitions WHERE object_id = OBJECT_ID(%s) AND index_id IN (0, 1)",
+            [self.quote_name(model._meta.db_table)],
+            has_result=True,
+        )
+        return 'backfill' if (rows[0][0] or 0) > batch_size else 'size-of-data'
+
+    def _backfill_column(self, model, field):
+        """
+        Set a column added by add_field() to the field's default on existing
+        rows, walking the primary key in chunks of the backfill_batch_size
+        database option. Each chunk commits on its own.
+        """
+        batch_size = self.connection.settings_dict['OPTIONS'].get('backfill_batch_size', 4000)
+        names = {
+            'table': self.quote_name(model._meta.db_table),
+            'column': self.quote_name(field.column),
+            'pk': self.quote_name(model._meta.pk.column),
+            'size': batch_size,
+        }
+        value = self.effective_default(field)
+        last = None
+        while True:
+            after = [] if last is None else [last]
+            upper = self.execute(
+                "SELECT MAX(%(pk)s) FROM (SELECT TOP (%(size)d) %(pk)s FROM %(table)s%(after)s "
+                "ORDER BY %(pk)s) AS chunk" % dict(names, after=' WHERE %(pk)s > %%s' % names if after else ''),
+                after,
+                has_result=True,
+            )[0][0]
+            if upper is None:
+                return
+            self.execute(
+                "UPDATE %(table)s SET %(column)s = %%s WHERE %(pk)s <= %%s%(after)s" % dict(
+                    names, after=' AND %(pk)s > %%s' % names if after else '',
+                ),
+                [value, upper] + after,
+            )
+            last = upper
+
+    def _enforce_column(self, model, field, db_params):
+        """
+        Add the NOT NULL and CHECK constraints a backfilled column was added
+        without.
+        """
+        table = self.quote_name(model._meta.db_table)
+        if not field.null:
+            column_type = db_params['type']
+            if db_params.get('collation'):
+                column_type += self._collate_sql(db_params['collation'])
+            self.execute(self.sql_alter_column % {
+                'table': table,
+                'changes': self.sql_alter_column_not_null % {
+                    'column': self.quote_name(field.column),
+                    'type': column_type,
+                },
+            })
+        if db_params['check']:
+            self.execute('ALTER TABLE %s ADD CHECK (%s)' % (table, db_params['check']))
+
     if django_version >= (4, 0):
         def _create_unique_sql(
                 self,
@@ -1118,6 +1638,8 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             compiler = Query(model, alias_cols=False).get_compiler(connection=self.connection)
             columns = [field.column for field in fields]
             table = model._meta.db_table
+            if columns:
+                self._check_partition_column(model, columns)
 
             if name is None:
                 name = IndexName(table, columns, '_uniq', create_unique_name)
@@ -1167,6 +1689,8 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             def create_unique_name(*args, **kwargs):
                 return self.quote_name(self._create_index_name(*args, **kwargs))
 
+            if columns:
+                self._check_partition_column(model, columns)
             table = Table(model._meta.db_table, self.quote_name)
             if name is None:
                 name = IndexName(model._meta.db_table, columns, '_uniq', create_unique_name)
@@ -1206,6 +1730,16 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         `sql` can be specified if the syntax differs from the standard (GIS
         indexes, ...).
         """
+        if sql is None and is_memory_optimized(model):
+            if condition or include:
+                raise NotSupportedError(
+                    'Indexes of memory-optimized tables cannot have a condition or included columns.'
+                )
+            index = self._create_index_sql(
+                model, fields, name=name, suffix=suffix, col_suffixes=col_suffixes,
+                sql=self.sql_memory_optimized_index, expressions=expressions,
+            )
+            return self._add_memory_optimized_index_sql(model, index)
         if django_version >= (3, 2):
             return super()._create_index_sql(
                 model, fields=fields, name=name, suffix=suffix, using=using,
@@ -1219,14 +1753,539 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             opclasses=opclasses, condition=condition,
         )
 
+    def _add_memory_optimized_index_sql(self, model, index):
+        """
+        Wrap the inline definition of an index of a memory-optimized table,
+        which CREATE INDEX can't create, into ALTER TABLE ... ADD INDEX.
+        create_model puts the inline definition in CREATE TABLE instead.
+        """
+        self._check_non_transactional_ddl('Memory-optimized tables')
+        return Statement(
+            self.sql_add_memory_optimized_index,
+            table=Table(model._meta.db_table, self.quote_name),
+            index=index,
+            name=index.parts['name'],
+            condition='',
+        )
+
+    def _create_hash_index_sql(self, model, index):
+        if not is_memory_optimized(model):
+            raise NotSupportedError('HashIndex is only supported on memory-optimized tables.')
+        columns = [model._meta.get_field(field_name).column for field_name in index.fields]
+        return self._add_memory_optimized_index_sql(model, Statement(
+            self.sql_memory_optimized_hash_index,
+            name=self.quote_name(index.name),
+            columns=Columns(model._meta.db_table, columns, self.quote_name),
+            bucket_count=index.bucket_count,
+            condition='',
+        ))
+
+    def _delete_index_sql(self, model, name, sql=None):
+        if sql is None and is_memory_optimized(model):
+            self._check_non_transactional_ddl('Memory-optimized tables')
+            sql = self.sql_delete_memory_optimized_index
+        return super()._delete_index_sql(model, name, sql=sql)
+
+    def _create_json_path_index_sql(self, model, index):
+        """
+        Return the statement adding the computed column of a JSONPathIndex
+        and the index on it.
+        """
+        table = Table(model._meta.db_table, self.quote_name)
+        json_field = model._meta.get_field(index.fields[0])
+        include = [model._meta.get_field(field_name).column for field_name in index.include]
+        condition = index._get_condition_sql(model, self)
+        db_tablespace = index.db_tablespace or json_field.db_tablespace or model._meta.db_tablespace
+        return Statement(
+            self.sql_create_json_path_index,
+            table=table,
+            name=self.quote_name(index.name),
+            columns=Columns(model._meta.db_table, [index.column], self.quote_name),
+            json_column=Columns(model._meta.db_table, [json_field.column], self.quote_name),
+            path=compile_json_path(index.path).replace("'", "''"),
+            type=index.output_type,
+            include=self._index_include_sql(model, include),
+            extra=' ' + self.connection.ops.tablespace_sql(db_tablespace) if db_tablespace else '',
+            condition=self._index_condition_sql(condition),
+        )
+
+    def _delete_json_path_index_sql(self, model, index):
+        return Statement(
+            self.sql_delete_json_path_index,
+            table=Table(model._meta.db_table, self.quote_name),
+            name=self.quote_name(index.name),
+            columns=Columns(model._meta.db_table, [index.column], self.quote_name),
+            condition='',
+        )
+
+    def _create_columnstore_index_sql(self, model, index):
+        """
+        Return the statement creating a clustered or nonclustered
+        ColumnstoreIndex.
+        """
+        fields = [model._meta.get_field(field_name) for field_name in index.fields]
+        if not index.clustered:
+            sql = self.sql_create_columnstore_index
+        elif fields:
+            sql = self.sql_create_ordered_columnstore_index
+        else:
+            sql = self.sql_create_clustered_columnstore_index
+        return self._create_index_sql(
+            model, fields, name=index.name, sql=sql, db_tablespace=index.db_tablespace,
+            condition=index._get_condition_sql(model, self),
+        )
+
+    def add_index(self, model, index):
+        if isinstance(index, ColumnstoreIndex) and index.clustered and not self.collect_sql:
+            # Tables created without a clustered columnstore index have a
+            # clustered primary key, which would have to be rebuilt, along
+            # with the foreign keys to it
+            with self.connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT name FROM sys.indexes WHERE object_id = OBJECT_ID(%s) AND type = 1",
+                    [self.quote_name(model._meta.db_table)],
+                )
+                row = cursor.fetchone()
+            if row:
+                raise NotSupportedError(
+                    'A clustered ColumnstoreIndex cannot be added to %s, which already has the clustered index %s. '
+                    'Declare the index when the model is created instead.' % (model._meta.db_table, row[0])
+                )
+        super().add_index(model, index)
+
+    def _rename_index_sql(self, model, old_name, new_name):
+        return Statement(
+            self.sql_rename_index,
+            table=Table(model._meta.db_table, self.quote_name),
+            old_name=self.quote_name(old_name),
+            new_name=self.quote_value(new_name),
+            name=self.quote_name(new_name),
+            condition='',
+        )
+
+    def rename_index(self, model, old_index, new_index):
+        # A full-text index has no name on SQL Server.
+        if isinstance(old_index, FullTextIndex) and isinstance(new_index, FullTextIndex):
+            return
+        super().rename_index(model, old_index, new_index)
+
+    def _partition_scheme_sql(self, model):
+        """
+        Return the ON clause placing a table or an aligned index on the
+        model's partition scheme, or '' if the model isn't partitioned.
+        """
+        partitioning = get_partitioning(model)
+        if partitioning is None:
+            return ''
+        scheme, field = partitioning
+        return 'ON %s(%s)' % (self.quote_name(scheme.name), self.quote_name(field.column))
+
+    def _check_partition_column(self, model, columns):
+        """
+        Unique indexes of a partitioned table are aligned with it, so SQL
+        Server requires them to include the partition column.
+        """
+        partitioning = get_partitioning(model)
+        if partitioning is not None and partitioning[1].column not in columns:
+            raise ValueError(
+                'Unique constraints and indexes of %s must include its partition column %s, got (%s).' % (
+                    model._meta.label, partitioning[1].column, ', '.join(columns),
+                )
+            )
+
+    def _create_fk_sql(self, model, field, suffix):
+        # The primary key of a partitioned table includes the partition
+        # column, so only that column is unique by itself
+        to_model = field.remote_field.model
+        partitioning = get_partitioning(to_model)
+        to_field = to_model._meta.get_field(field.remote_field.field_name)
+        if partitioning is not None and to_field != partitioning[1]:
+            raise NotSupportedError(
+                '%s.%s cannot have a foreign key constraint to %s, which is partitioned on %s; '
+                'set db_constraint=False on the field.' % (
+                    model._meta.label, field.name, to_model._meta.label, partitioning[1].name,
+                )
+            )
+        return super()._create_fk_sql(model, field, suffix)
+
+    def _get_index_tablespace_sql(self, model, fields, db_tablespace=None):
+        if (db_tablespace is None and not any(field.db_tablespace for field in fields) and
+                get_partitioning(model) is not None):
+            return ' ' + self._partition_scheme_sql(model)
+        return super()._get_index_tablespace_sql(model, fields, db_tablespace=db_tablespace)
+
+    def create_partition_scheme(self, scheme):
+        """
+        Create a partition scheme and its function, unless they already exist.
+        """
+        function = scheme.function
+        # The statements run through EXEC(N'...'), so literals are quoted twice.
+        boundaries = ', '.join(self.quote_value(value).replace("'", "''") for value in function.boundaries)
+        self.execute(self.sql_create_partition_function % {
+            'name': self.quote_name(function.name),
+            'name_value': self.quote_value(function.name),
+            'input_type': function.input_type,
+            'range': function.range,
+            'boundaries': boundaries,
+        }, params=None)
+        if scheme.filegroups:
+            filegroups = 'TO (%s)' % ', '.join(self.quote_name(filegroup) for filegroup in scheme.filegroups)
+        else:
+            filegroups = 'ALL TO ([PRIMARY])'
+        self.execute(self.sql_create_partition_scheme % {
+            'name': self.quote_name(scheme.name),
+            'name_value': self.quote_value(scheme.name),
+            'function': self.quote_name(function.name),
+            'filegroups': filegroups,
+        }, params=None)
+
+    def _index_options_sql(self, options):
+        """
+        Render index options for a WITH clause, leaving out those the server
+        can't use: online operations on editions without them, and resumable
+        ones before SQL Server 2019. Resumable operations can't run inside a
+        transaction.
+        """
+        options = dict(options)
+        features = self.connection.features
+        resumable = options.get('RESUMABLE') == 'ON'
+        if not features.supports_online_index_operations:
+            for option in ('ONLINE', 'RESUMABLE', 'MAX_DURATION'):
+                options.pop(option, None)
+        elif resumable and not features.supports_resumable_index_operations:
+            options.pop('RESUMABLE')
+            options.pop('MAX_DURATION', None)
+        elif resumable:
+            self._check_non_transactional_ddl('Resumable indexes')
+        if resumable and 'RESUMABLE' not in options:
+            logger.warning('Building index without RESUMABLE = ON, which is unavailable here.')
+        return ', '.join('%s = %s' % option for option in options.items())
+
+    def alter_data_compression(self, model, data_compression, index_name=None, **options):
+        """
+        Rebuild the table, or one of its indexes, with a new data compression,
+        online where the edition allows it. options are the index build
+        options of SQLServerIndex. Nothing is rebuilt if the data is already
+        compressed that way.
+        """
+        table = model._meta.db_table
+        if not self.collect_sql:
+            with self.connection.cursor() as cursor:
+                if index_name is None:
+                    current = self.connection.introspection.get_table_data_compression(cursor, table)
+                else:
+                    try:
+                        index = self._get_table_constraints(table)[index_name]
+                    except KeyError:
+                        raise ValueError('Index %s does not exist on table %s.' % (index_name, table))
+                    current = index.get('data_compression')
+            if current == data_compression:
+                return
+        options.setdefault('online', True)
+        options = self._index_options_sql(get_index_options(data_compression=data_compression, **options))
+        if index_name is None:
+            self.execute(self.sql_rebuild_table % {'table': self.quote_name(table), 'options': options})
+        else:
+            self.execute(self.sql_rebuild_index % {
+                'name': self.quote_name(index_name),
+                'table': self.quote_name(table),
+                'options': options,
+            })
+
+    def alter_field_online(self, model, old_field, new_field, batch_size=4000):
+        """
+        Change the type of a column without rewriting the table under a
+        schema lock: add a shadow column of the new type, kept in step with
+        the column by a trigger, fill it in chunks of batch_size rows in
+        primary key order and build copies of the column's indexes on it,
+        online where the edition allows it. A short transaction then drops
+        the column and its indexes and gives their names to the copies.
+
+        Each step commits on its own, so this can't run in a transaction.
+        When interrupted, running it again carries on where it stopped.
+        """
+        self._check_non_transactional_ddl('Online column changes')
+        if self.connection.features.can_return_rows_from_bulk_insert:
+            # INSERT ... OUTPUT without INTO fails on tables with triggers
+            raise NotSupportedError(
+                'Columns cannot be altered online with the return_rows_bulk_insert option, '
+                'since bulk inserts into the table would fail while the sync trigger exists.'
+            )
+        table = model._meta.db_table
+        shadow = self._online_name(old_field.column, '__online')
+        trigger = self._online_name('%s_%s' % (table, old_field.column), '__online')
+        indexes = self._column_indexes(table, old_field.column)
+        self._check_online_alter(model, old_field, new_field, indexes)
+        new_db_params = new_field.db_parameters(connection=self.connection)
+        column_type = new_db_params['type']
+        if new_db_params.get('collation'):
+            column_type += self._collate_sql(new_db_params['collation'])
+        names = {
+            'table': self.quote_name(table),
+            'table_name': self.quote_value(table),
+            'column': self.quote_name(old_field.column),
+            'shadow': self.quote_name(shadow),
+            'shadow_name': self.quote_value(shadow),
+            'trigger': self.quote_name(trigger),
+            'trigger_name': self.quote_value(trigger),
+            'pk': self.quote_name(model._meta.pk.column),
+            'property': 'mssql_django_online_backfill',
+            'type': column_type,
+            'null': 'NULL',
+        }
+        default_constraint = None
+        default = None if new_field.null else self.effective_default(new_field)
+        if (
+            default is not None and self.connection.features.supports_metadata_only_add_column and
+            not _row_default_types_re.match(new_db_params['type'] or '')
+        ):
+            # Existing rows take the constant default from the table's
+            # metadata, so the shadow column can be NOT NULL from the start
+            # and the swap doesn't scan the table to make it so
+            default_constraint = self._online_name('%s_%s' % (table, old_field.column), '__online_df')
+            names['null'] = 'NOT NULL CONSTRAINT %s DEFAULT %s' % (
+                self.quote_name(default_constraint), self.prepare_default(default),
+            )
+        self.execute(self.sql_add_online_shadow_column % names, params=None)
+        # Rows written from now on are copied by the trigger, the others by
+        # the backfill.
+        self.execute(self.sql_create_online_sync_trigger % names)
+        self._backfill_online(model, names, batch_size)
+        options = self._index_options_sql({'ONLINE': 'ON'})
+        for name, index in indexes.items():
+            self.execute(self.sql_create_online_index % {
+                'table': names['table'],
+                'table_name': names['table_name'],
+                'name': self.quote_name(self._online_name(name, '__online')),
+                'name_value': self.quote_value(self._online_name(name, '__online')),
+                'unique': 'UNIQUE ' if index['unique'] else '',
+                'columns': ', '.join(
+                    self.quote_name(shadow if column == old_field.column else column) + (' DESC' if descending else '')
+                    for column, descending in index['columns']
+                ),
+                'include': ' INCLUDE (%s)' % ', '.join(
+                    self.quote_name(shadow if column == old_field.column else column) for column in index['include']
+                ) if index['include'] else '',
+                'condition': ' WHERE %s' % index['filter'].replace(names['column'], names['shadow'])
+                if index['filter'] else '',
+                'options': ' WITH (%s)' % options if options else '',
+            })
+        if not new_field.null and default_constraint is None and not self.collect_sql:
+            # Fail before the schema lock rather than after scanning under it
+            if self.execute(self.sql_select_online_nulls % names, has_result=True):
+                raise IntegrityError('%s.%s has NULL values, so it cannot be made NOT NULL.' % (
+                    model._meta.label, new_field.name,
+                ))
+        with transaction.atomic(using=self.connection.alias):
+            if default_constraint is not None:
+                self.execute(self._db_table_delete_constraint_sql(self.sql_delete_default, table, default_constraint))
+            elif not new_field.null:
+                self.execute(self.sql_alter_column % {
+                    'table': names['table'],
+                    'changes': self.sql_alter_column_not_null % {'column': names['shadow'], 'type': column_type},
+                })
+            self.execute('DROP TRIGGER %s' % names['trigger'])
+            for name, index in indexes.items():
+                template = self.sql_delete_unique if index['unique_constraint'] else self.sql_delete_index
+                self.execute(self._db_table_delete_constraint_sql(template, table, name))
+            defaults = self.execute(
+                self._sql_select_default_constraint_name % {
+                    'table': names['table_name'],
+                    'column': self.quote_value(old_field.column),
+                },
+                has_result=True,
+            )
+            for row in defaults or []:
+                self.execute(self._db_table_delete_constraint_sql(self.sql_delete_default, table, row[0]))
+            self.execute(self.sql_delete_column % {'table': names['table'], 'column': names['column']})
+            self.execute(self.sql_rename_column % {
+                'table': names['table'],
+                'old_column': names['shadow'],
+                'new_column': self.quote_value(new_field.column),
+            })
+            for name in indexes:
+                self.execute(self.sql_rename_index % {
+                    'table': names['table'],
+                    'old_name': self.quote_name(self._online_name(name, '__online')),
+                    'new_name': self.quote_value(name),
+                })
+
+    def _online_name(self, name, suffix):
+        max_length = self.connection.ops.max_name_length() or 128
+        return name[:max_length - len(suffix)] + suffix
+
+    def _column_indexes(self, table, column):
+        """
+        Return {name: index} of the indexes and unique constraints using the
+        column, with their key columns as (column, descending) pairs, their
+        included columns and filter.
+        """
+        rows = self.execute(
+            "SELECT i.name, i.type_desc, i.is_primary_key, i.is_unique, i.is_unique_constraint, "
+            "i.filter_definition, COL_NAME(ic.object_id, ic.column_id), ic.is_descending_key, "
+            "ic.is_included_column "
+            "FROM sys.indexes i "
+            "INNER JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id "
+            "WHERE i.object_id = OBJECT_ID(%s) AND i.index_id IN ("
+            "SELECT index_id FROM sys.index_columns "
+            "WHERE object_id = OBJECT_ID(%s) AND column_id = COLUMNPROPERTY(OBJECT_ID(%s), %s, 'ColumnId')) "
+            "ORDER BY i.name, ic.is_included_column, ic.key_ordinal, ic.index_column_id",
+            [table, table, table, column],
+            has_result=True,
+        )
+        indexes = {}
+        for name, type_desc, primary_key, unique, unique_constraint, condition, column, descending, included in (
+            rows or []
+        ):
+            index = indexes.setdefault(name, {
+                'type': type_desc,
+                'primary_key': primary_key,
+                'unique': unique,
+                'unique_constraint': unique_constraint,
+                'filter': condition,
+                'columns': [],
+                'include': [],
+            })
+            if included:
+                index['include'].append(column)
+            else:
+                index['columns'].append((column, descending))
+        return indexes
+
+    def _check_online_alter(self, model, old_field, new_field, indexes):
+        reason = None
+        old_db_params = old_field.db_parameters(connection=self.connection)
+        new_db_params = new_field.db_parameters(connection=self.connection)
+        if old_field.column != new_field.column:
+            reason = 'be renamed'
+        elif old_field.primary_key or new_field.primary_key or list(_related_non_m2m_objects(old_field, new_field)):
+            reason = 'be a primary key or be referenced by foreign keys'
+        elif old_field.remote_field or new_field.remote_field:
+            reason = 'be a foreign key'
+        elif old_db_params['check'] or new_db_params['check']:
+            reason = 'have check constraints'
+        elif (
+            getattr(old_field, 'db_default', NOT_PROVIDED) is not NOT_PROVIDED or
+            getattr(new_field, 'db_default', NOT_PROVIDED) is not NOT_PROVIDED or
+            getattr(new_field, 'generated', False)
+        ):
+            reason = 'have a database default or be generated'
+        elif old_field.unique != new_field.unique or old_field.db_index != new_field.db_index:
+            reason = 'change its indexes'
+        elif any(index['type'] != 'NONCLUSTERED' or index['primary_key'] for index in indexes.values()):
+            reason = 'be in a clustered or columnstore index'
+        if reason:
+            raise NotSupportedError(
+                'The column of %s.%s cannot be altered online, it must not %s.' % (
+                    model._meta.label, new_field.name, reason,
+                )
+            )
+
+    def _backfill_online(self, model, names, batch_size):
+        """
+        Copy the column into its shadow in chunks of batch_size rows in
+        primary key order, each recorded in an extended property of the sync
+        trigger to carry on from after an interruption.
+        """
+        pk = model._meta.pk
+        if self.collect_sql:
+            self.execute('UPDATE %(table)s SET %(shadow)s = %(column)s' % names)
+            return
+        progress = self.execute(self.sql_select_online_progress % names, has_result=True)
+        last = pk.to_python(progress[0][0]) if progress else None
+        while True:
+            after = [] if last is None else [last]
+            upper = self.execute(
+                "SELECT MAX(%(pk)s) FROM (SELECT TOP (%(size)d) %(pk)s FROM %(table)s%(after)s "
+                "ORDER BY %(pk)s) AS chunk" % dict(
+                    names, size=batch_size, after=' WHERE %(pk)s > %%s' % names if after else '',
+                ),
+                after,
+                has_result=True,
+            )[0][0]
+            if upper is None:
+                return
+            self.execute(
+                "UPDATE %(table)s SET %(shadow)s = %(column)s WHERE %(pk)s <= %%s%(after)s" % dict(
+                    names, after=' AND %(pk)s > %%s' % names if after else '',
+                ),
+                [upper] + after,
+            )
+            self.execute(self.sql_set_online_progress % names, [str(upper), str(upper)])
+            last = upper
+
+    def _check_non_transactional_ddl(self, objects):
+        if not self.collect_sql and self.connection.in_atomic_block:
+            raise TransactionManagementError(
+                "%s can't be created, altered or dropped inside a "
+                "transaction. Set atomic = False on the migration." % objects
+            )
+
+    def _create_fulltext_index_sql(self, model, index):
+        """
+        Return the statement creating the full-text catalog of a
+        FullTextIndex, if missing, and the full-text index keyed on the
+        primary key.
+        """
+        self._check_non_transactional_ddl('Full-text indexes')
+        catalog = index.catalog or index.default_catalog
+        columns = [model._meta.get_field(field_name).column for field_name in index.fields]
+
+        # The statements run through EXEC(N'...'), so quotes in names and
+        # string literals are doubled once more.
+        def exec_quote_name(name):
+            return self.quote_name(name).replace("'", "''")
+
+        col_suffixes = ()
+        if index.language is not None:
+            language = index.language
+            if isinstance(language, str):
+                language = self.quote_value(language).replace("'", "''")
+            col_suffixes = ['LANGUAGE %s' % language] * len(columns)
+        return Statement(
+            self.sql_create_fulltext_index,
+            table=Table(model._meta.db_table, exec_quote_name),
+            table_name=self.quote_value(model._meta.db_table),
+            name=self.quote_name(index.name),
+            columns=Columns(model._meta.db_table, columns, exec_quote_name, col_suffixes=col_suffixes),
+            catalog=exec_quote_name(catalog),
+            catalog_name=self.quote_value(catalog),
+            change_tracking=index.change_tracking,
+            condition='',
+        )
+
+    def _delete_fulltext_index_sql(self, model, index):
+        self._check_non_transactional_ddl('Full-text indexes')
+        return Statement(
+            self.sql_delete_fulltext_index,
+            table=Table(model._meta.db_table, self.quote_name),
+            name=self.quote_name(index.name),
+            condition='',
+        )
+
     def create_model(self, model):
+        # CREATE TABLE, its comments and M2M tables don't read the catalog
+        with self.batch():
+            self._create_model(model)
+
+    def _create_model(self, model):
         """
         Takes a model and creates a table for it in the database.
         Will also create any accompanying indexes or unique constraints.
         """
+        partitioning = get_partitioning(model)
+        memory_optimized = is_memory_optimized(model)
+        if memory_optimized:
+            if not self.connection.features.supports_memory_optimized_tables:
+                raise NotSupportedError('Memory-optimized tables are not supported on this database.')
+            self._check_non_transactional_ddl('Memory-optimized tables')
+        clustered_columnstore = any(
+            isinstance(index, ColumnstoreIndex) and index.clustered for index in model._meta.indexes
+        )
         # Create column SQL, add FK deferreds if needed
         column_sqls = []
         params = []
+        primary_key_sql = None
         for field in model._meta.local_fields:
             # SQL
             definition, extra_params = self.column_sql(model, field)
@@ -1236,6 +2295,8 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             if (django_version >= (5,0) and field.generated):
                 definition = definition[definition.find('AS'):]
 
+            if field.unique and not field.primary_key:
+                self._check_partition_column(model, [field.column])
             if (self.connection.features.supports_nullable_unique_constraints and
                     not field.many_to_many and field.null and field.unique):
 
@@ -1246,6 +2307,23 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                 self.deferred_sql.append(statement)
                 self._add_deferred_unique_index_for_field(field, statement)
 
+            if field.primary_key and partitioning is not None and field != partitioning[1]:
+                # The partition column must be part of the primary key for the
+                # key to be aligned with the table
+                definition = definition.replace(' PRIMARY KEY', '')
+                primary_key_sql = self.sql_partitioned_pk_constraint % {
+                    'name': self.quote_name(
+                        self._create_index_name(model._meta.db_table, [field.column], suffix='_pk')
+                    ),
+                    'type': ' NONCLUSTERED' if clustered_columnstore else '',
+                    'columns': ', '.join(self.quote_name(column) for column in (field.column, partitioning[1].column)),
+                }
+            elif field.primary_key and (clustered_columnstore or memory_optimized):
+                # A clustered columnstore index takes the place of the
+                # clustered primary key, and memory-optimized tables have no
+                # clustered rowstore index
+                definition = definition.replace(' PRIMARY KEY', ' PRIMARY KEY NONCLUSTERED')
+
             # Check constraints can go on the column SQL here
             db_params = field.db_parameters(connection=self.connection)
             if db_params['check']:
@@ -1292,16 +2370,49 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             else:
                 self.deferred_sql.append(self._create_unique_sql(model, columns, condition=condition))
 
+        for constraint in model._meta.constraints:
+            if isinstance(constraint, UniqueConstraint) and constraint.fields:
+                self._check_partition_column(
+                    model, [model._meta.get_field(field_name).column for field_name in constraint.fields]
+                )
         constraints = [constraint.constraint_sql(model, self) for constraint in model._meta.constraints]
+        if primary_key_sql is not None:
+            constraints.insert(0, primary_key_sql)
+        index_statements = self._model_indexes_sql(model)
+        if memory_optimized:
+            # Indexes of memory-optimized tables are declared inline so the
+            # table isn't rebuilt for each of them
+            constraints.extend(
+                str(statement.parts['index']) for statement in index_statements
+                if statement.template == self.sql_add_memory_optimized_index
+            )
+            index_statements = [
+                statement for statement in index_statements
+                if statement.template != self.sql_add_memory_optimized_index
+            ]
         # Make the table
         sql = self.sql_create_table % {
             "table": self.quote_name(model._meta.db_table),
             'definition': ', '.join(constraint for constraint in (*column_sqls, *constraints) if constraint),
         }
-        if model._meta.db_tablespace:
+        if partitioning is not None:
+            self.create_partition_scheme(partitioning[0])
+            sql += ' ' + self._partition_scheme_sql(model)
+        elif model._meta.db_tablespace:
             tablespace_sql = self.connection.ops.tablespace_sql(model._meta.db_tablespace)
             if tablespace_sql:
                 sql += ' ' + tablespace_sql
+        table_options = []
+        data_compression = getattr(model._meta, 'data_compression', None)
+        if data_compression:
+            table_options.append(self.sql_table_data_compression % {'compression': data_compression})
+        if memory_optimized:
+            durability = getattr(model._meta, 'durability', None) or 'SCHEMA_AND_DATA'
+            if durability not in ('SCHEMA_AND_DATA', 'SCHEMA_ONLY'):
+                raise ValueError("durability must be 'SCHEMA_AND_DATA' or 'SCHEMA_ONLY'.")
+            table_options.append(self.sql_table_memory_optimized % {'durability': durability})
+        if table_options:
+            sql += ' WITH (%s)' % ', '.join(table_options)
         # Prevent using [] as params, in the case a literal '%' is used in the definition
         self.execute(sql, params or None)
 
@@ -1323,8 +2434,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                             )
                         )
         # Add any field index and index_together's (deferred as SQLite3 _remake_table needs it)
-        self.deferred_sql.extend(self._model_indexes_sql(model))
-        self.deferred_sql = list(set(self.deferred_sql))
+        self.deferred_sql.extend(index_statements)
 
         # Make M2M tables
         for field in model._meta.local_many_to_many:
@@ -1363,6 +2473,8 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         return self._delete_constraint_sql(sql, model, name)
 
     def delete_model(self, model):
+        if is_memory_optimized(model):
+            self._check_non_transactional_ddl('Memory-optimized tables')
         super().delete_model(model)
 
     def execute(self, sql, params=(), has_result=False):
@@ -1378,7 +2490,7 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                 "that can't perform a rollback is prohibited."
             )
         # Account for non-string statement objects.
-        sql = str(sql)
+        statement, sql = sql, str(sql)
         # Log the command we're running, then run it
         logger.debug("%s; (params %r)", sql, params, extra={'params': params, 'sql': sql})
         if self.collect_sql:
@@ -1387,7 +2499,18 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                 self.collected_sql.append((sql % tuple(map(self.quote_value, params))) + ending)
             else:
                 self.collected_sql.append(sql + ending)
+            self._update_constraint_snapshots(sql, statement)
+        elif self._ddl_batch is not None and not has_result:
+            # The constraint snapshots follow the statement once the batch has run
+            self._ddl_batch.append((
+                sql % tuple(map(self.quote_value, params)) if params is not None else sql,
+                statement,
+            ))
+            if len(self._ddl_batch) >= self.connection.settings_dict['OPTIONS'].get('ddl_batch_size', 0):
+                self._execute_ddl_batch()
         else:
+            if self._ddl_batch:
+                self._execute_ddl_batch()
             cursor = self.connection.cursor()
             cursor.execute(sql, params)
             if has_result:
@@ -1397,8 +2520,80 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
             # has already opened a cursor outside this method
             if self.connection.supports_mars:
                 cursor.close()
+            self._update_constraint_snapshots(sql, statement)
         return result
 
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            # Deferred indexes and constraints don't depend on each other
+            with self.batch():
+                for sql in self.deferred_sql:
+                    self.execute(sql)
+            self.deferred_sql.clear()
+        super().__exit__(exc_type, exc_value, traceback)
+
+    @contextmanager
+    def batch(self):
+        """
+        Send the statements executed in the block that don't return results
+        in batches of up to the ddl_batch_size database option, instead of one
+        round trip each. Batching is off unless that option is set.
+
+        The statements are sent when the block exits, the batch is full or a
+        statement returning results is executed, so the block mustn't read
+        what they change. Each runs through EXEC(), so it's compiled only once
+        the previous ones have run, and the batch stops at the first error,
+        which names the failing statement.
+        """
+        if (
+            self._ddl_batch is not None or self.collect_sql or
+            not self.connection.settings_dict['OPTIONS'].get('ddl_batch_size') or
+            not self.connection.features.supports_session_context
+        ):
+            yield
+            return
+        self._ddl_batch = []
+        try:
+            yield
+            self._execute_ddl_batch()
+        finally:
+            self._ddl_batch = None
+
+    def _execute_ddl_batch(self):
+        batch, self._ddl_batch = self._ddl_batch, []
+        if not batch:
+            return
+        statements = [sql for sql, _ in batch]
+        # The position is kept in the session context, which isn't rolled
+        # back with the failing statement's transaction.
+        sql = 'BEGIN TRY\n%s\nEND TRY\nBEGIN CATCH\nTHROW;\nEND CATCH' % '\n'.join(
+            "EXEC sp_set_session_context N'%s', %d;\nEXEC(N%s);" % (
+                _ddl_batch_key, index, self.quote_value(statement),
+            )
+            for index, statement in enumerate(statements)
+        )
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(sql)
+            # Errors of later statements are raised when reaching their results
+            while cursor.nextset():
+                pass
+        except DatabaseError as e:
+            # The statements before the failing one may have run
+            self._constraint_snapshots.clear()
+            try:
+                cursor.execute("SELECT CAST(SESSION_CONTEXT(N'%s') AS int)" % _ddl_batch_key)
+                index = cursor.fetchone()[0]
+            except DatabaseError:
+                raise e
+            raise type(e)(*e.args, 'Statement %d of %d in the DDL batch failed: %s' % (
+                index + 1, len(statements), statements[index],
+            )) from e
+        if self.connection.supports_mars:
+            cursor.close()
+        for sql, statement in batch:
+            self._update_constraint_snapshots(sql, statement)
+
     def prepare_default(self, value):
         return self.quote_value(value)
 
@@ -1433,8 +2628,8 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
         if field.db_parameters(connection=self.connection)['type'] is None:
             return
         # Drop any FK constraints, SQL Server requires explicit deletion
-        with self.connection.cursor() as cursor:
-            constraints = self.connection.introspection.get_constraints(cursor, model._meta.db_table)
+        # (iterating over a copy, the snapshot follows the drops)
+        constraints = dict(self._get_table_constraints(model._meta.db_table))
         for name, infodict in constraints.items():
             if field.column in infodict['columns'] and infodict['foreign_key']:
                 self.execute(self._delete_constraint_sql(self.sql_delete_fk, model, name))
@@ -1532,3 +2727,23 @@ class DatabaseSchemaEditor(BaseDatabaseSchemaEditor):
                 or self.connection.features.supports_nulls_distinct_unique_constraints
             )
         )
+
+
+def _forget_constraint_snapshots(method):
+    """
+    Wrap RunSQL and RunPython, whose SQL or code can change constraints
+    behind the schema editor's back, to discard its constraint snapshots.
+    """
+    @wraps(method)
+    def database_operation(self, app_label, schema_editor, from_state, to_state):
+        try:
+            return method(self, app_label, schema_editor, from_state, to_state)
+        finally:
+            if isinstance(schema_editor, DatabaseSchemaEditor):
+                schema_editor._constraint_snapshots.clear()
+    return database_operation
+
+
+for operation in (RunPython, RunSQL):
+    operation.database_forwards = _forget_constraint_snapshots(operation.database_forwards)
+    operation.database_backwards = _forget_constraint_snapshots(operation.database_backwards)
@@ -0,0 +1,94 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the BSD license.
+
+from django.db import NotSupportedError
+from django.db.models import CharField, Expression, F, IntegerField, TextField, Value
+from django.db.models.expressions import Col
+from django.db.models.lookups import Lookup
+
+
+class FullTextLookup(Lookup):
+    """
+    Base class of the full-text predicates. The column must be covered by a
+    FullTextIndex.
+    """
+    function = None
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError('Full-text lookups are only supported on SQL Server.')
+
+    def as_microsoft(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return '%s(%s, %s)' % (self.function, lhs, rhs), (*lhs_params, *rhs_params)
+
+
+class FullTextContains(FullTextLookup):
+    """
+    ``field__contains_ft='"word*" NEAR other'`` takes a CONTAINS search
+    condition.
+    """
+    lookup_name = 'contains_ft'
+    function = 'CONTAINS'
+
+
+class FreeText(FullTextLookup):
+    """
+    ``field__freetext='some words'`` matches on meaning rather than exact
+    wording.
+    """
+    lookup_name = 'freetext'
+    function = 'FREETEXT'
+
+
+class FullTextRank(Expression):
+    """
+    Rank of each row for a full-text query on a column, 0 when the row
+    doesn't match. Built on CONTAINSTABLE, or FREETEXTTABLE with
+    ``freetext=True``.
+
+        Article.objects.annotate(rank=FullTextRank('body', 'database')).order_by('-rank')
+    """
+    output_field = IntegerField()
+
+    def __init__(self, expression, query, freetext=False):
+        super().__init__()
+        self.expression = F(expression) if isinstance(expression, str) else expression
+        self.query = query if hasattr(query, 'resolve_expression') else Value(query)
+        self.freetext = freetext
+
+    def get_source_expressions(self):
+        return [self.expression, self.query]
+
+    def set_source_expressions(self, exprs):
+        self.expression, self.query = exprs
+
+    def as_sql(self, compiler, connection):
+        raise NotSupportedError('FullTextRank is only supported on SQL Server.')
+
+    def as_microsoft(self, compiler, connection):
+        column = self.expression
+        if not isinstance(column, Col):
+            raise ValueError('FullTextRank requires a reference to a model field.')
+        model = column.target.model
+        query_sql, query_params = compiler.compile(self.query)
+        key_sql, key_params = compiler.compile(Col(column.alias, model._meta.pk))
+        # CONTAINSTABLE takes the table and column names, not an alias, so the
+        # rank is correlated to the outer row through the full-text key.
+        sql = (
+            'COALESCE((SELECT [ft_rank].[RANK] FROM %s(%s, %s, %s) AS [ft_rank] '
+            'WHERE [ft_rank].[KEY] = %s), 0)' % (
+                'FREETEXTTABLE' if self.freetext else 'CONTAINSTABLE',
+                connection.ops.quote_name(model._meta.db_table),
+                connection.ops.quote_name(column.target.column),
+                query_sql,
+                key_sql,
+            )
+        )
+        return sql, (*query_params, *key_params)
+
+
+CharField.register_lookup(FullTextContains)
+CharField.register_lookup(FreeText)
+TextField.register_lookup(FullTextContains)
+TextField.register_lookup(FreeText)
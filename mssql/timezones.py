@@ -0,0 +1,255 @@
+# Copyright (c) Microsoft Corporation.
+# Licensed under the BSD license.
+
+"""
+Mapping of IANA time zone names to the Windows time zone names used by
+AT TIME ZONE and sys.time_zone_info, after CLDR's windowsZones.xml.
+"""
+
+_WINDOWS_TO_IANA = {
+    'Dateline Standard Time': ['Etc/GMT+12'],
+    'UTC-11': ['Etc/GMT+11', 'Pacific/Pago_Pago', 'Pacific/Niue', 'Pacific/Midway'],
+    'Aleutian Standard Time': ['America/Adak'],
+    'Hawaiian Standard Time': ['Pacific/Honolulu', 'Pacific/Rarotonga', 'Pacific/Tahiti', 'US/Hawaii'],
+    'Marquesas Standard Time': ['Pacific/Marquesas'],
+    'Alaskan Standard Time': [
+        'America/Anchorage', 'America/Juneau', 'America/Metlakatla', 'America/Nome', 'America/Sitka',
+        'America/Yakutat', 'US/Alaska',
+    ],
+    'UTC-09': ['Etc/GMT+9', 'Pacific/Gambier'],
+    'Pacific Standard Time (Mexico)': ['America/Tijuana'],
+    'UTC-08': ['Etc/GMT+8', 'Pacific/Pitcairn'],
+    'Pacific Standard Time': ['America/Los_Angeles', 'America/Vancouver', 'US/Pacific', 'PST8PDT'],
+    'US Mountain Standard Time': [
+        'America/Phoenix', 'America/Creston', 'America/Dawson_Creek', 'America/Fort_Nelson',
+        'America/Hermosillo', 'Etc/GMT+7', 'US/Arizona',
+    ],
+    'Mountain Standard Time (Mexico)': ['America/Mazatlan', 'America/Chihuahua'],
+    'Mountain Standard Time': [
+        'America/Denver', 'America/Edmonton', 'America/Boise', 'America/Cambridge_Bay', 'America/Inuvik',
+        'America/Ojinaga', 'America/Ciudad_Juarez', 'US/Mountain', 'MST7MDT',
+    ],
+    'Yukon Standard Time': ['America/Whitehorse', 'America/Dawson'],
+    'Central America Standard Time': [
+        'America/Guatemala', 'America/Belize', 'America/Costa_Rica', 'America/El_Salvador',
+        'America/Managua', 'America/Tegucigalpa', 'Etc/GMT+6', 'Pacific/Galapagos',
+    ],
+    'Central Standard Time': [
+        'America/Chicago', 'America/Winnipeg', 'America/Rainy_River', 'America/Rankin_Inlet',
+        'America/Resolute', 'America/Matamoros', 'America/Indiana/Knox', 'America/Indiana/Tell_City',
+        'America/Menominee', 'America/North_Dakota/Beulah', 'America/North_Dakota/Center',
+        'America/North_Dakota/New_Salem', 'US/Central', 'CST6CDT',
+    ],
+    'Easter Island Standard Time': ['Pacific/Easter'],
+    'Central Standard Time (Mexico)': [
+        'America/Mexico_City', 'America/Bahia_Banderas', 'America/Merida', 'America/Monterrey',
+    ],
+    'Canada Central Standard Time': ['America/Regina', 'America/Swift_Current'],
+    'SA Pacific Standard Time': [
+        'America/Bogota', 'America/Lima', 'America/Guayaquil', 'America/Panama', 'America/Jamaica',
+        'America/Cayman', 'America/Coral_Harbour', 'America/Atikokan', 'America/Eirunepe',
+        'America/Rio_Branco', 'Etc/GMT+5',
+    ],
+    'Eastern Standard Time (Mexico)': ['America/Cancun'],
+    'Eastern Standard Time': [
+        'America/New_York', 'America/Toronto', 'America/Detroit', 'America/Montreal', 'America/Nassau',
+        'America/Iqaluit', 'America/Nipigon', 'America/Pangnirtung', 'America/Thunder_Bay',
+        'America/Indiana/Petersburg', 'America/Indiana/Vincennes', 'America/Indiana/Winamac',
+        'America/Kentucky/Monticello', 'America/Louisville', 'America/Kentucky/Louisville',
+        'US/Eastern', 'EST5EDT',
+    ],
+    'Haiti Standard Time': ['America/Port-au-Prince'],
+    'Cuba Standard Time': ['America/Havana'],
+    'US Eastern Standard Time': [
+        'America/Indianapolis', 'America/Indiana/Indianapolis', 'America/Indiana/Marengo',
+        'America/Indiana/Vevay',
+    ],
+    'Turks And Caicos Standard Time': ['America/Grand_Turk'],
+    'Paraguay Standard Time': ['America/Asuncion'],
+    'Atlantic Standard Time': [
+        'America/Halifax', 'America/Glace_Bay', 'America/Goose_Bay', 'America/Moncton', 'America/Thule',
+        'Atlantic/Bermuda',
+    ],
+    'Venezuela Standard Time': ['America/Caracas'],
+    'Central Brazilian Standard Time': ['America/Cuiaba', 'America/Campo_Grande'],
+    'SA Western Standard Time': [
+        'America/La_Paz', 'America/Manaus', 'America/Boa_Vista', 'America/Porto_Velho',
+        'America/Santo_Domingo', 'America/Puerto_Rico', 'America/Barbados', 'America/Martinique',
+        'America/Port_of_Spain', 'America/Guyana', 'America/Blanc-Sablon', 'America/Curacao', 'Etc/GMT+4',
+    ],
+    'Pacific SA Standard Time': ['America/Santiago'],
+    'Newfoundland Standard Time': ['America/St_Johns'],
+    'Tocantins Standard Time': ['America/Araguaina'],
+    'E. South America Standard Time': ['America/Sao_Paulo'],
+    'SA Eastern Standard Time': [
+        'America/Cayenne', 'America/Paramaribo', 'America/Fortaleza', 'America/Belem', 'America/Maceio',
+        'America/Recife', 'America/Santarem', 'Antarctica/Rothera', 'Atlantic/Stanley', 'Etc/GMT+3',
+    ],
+    'Argentina Standard Time': [
+        'America/Buenos_Aires', 'America/Argentina/Buenos_Aires', 'America/Argentina/Cordoba',
+        'America/Cordoba', 'America/Argentina/Mendoza', 'America/Mendoza', 'America/Argentina/Salta',
+        'America/Argentina/Jujuy', 'America/Argentina/Tucuman', 'America/Argentina/Catamarca',
+        'America/Argentina/La_Rioja', 'America/Argentina/San_Juan', 'America/Argentina/San_Luis',
+        'America/Argentina/Rio_Gallegos', 'America/Argentina/Ushuaia',
+    ],
+    'Greenland Standard Time': ['America/Godthab', 'America/Nuuk'],
+    'Montevideo Standard Time': ['America/Montevideo'],
+    'Magallanes Standard Time': ['America/Punta_Arenas'],
+    'Saint Pierre Standard Time': ['America/Miquelon'],
+    'Bahia Standard Time': ['America/Bahia'],
+    'UTC-02': ['Etc/GMT+2', 'America/Noronha', 'Atlantic/South_Georgia'],
+    'Azores Standard Time': ['Atlantic/Azores', 'America/Scoresbysund'],
+    'Cape Verde Standard Time': ['Atlantic/Cape_Verde', 'Etc/GMT+1'],
+    'UTC': ['UTC', 'Etc/UTC', 'Etc/GMT', 'Etc/UCT', 'Etc/Zulu', 'GMT', 'Universal', 'Zulu'],
+    'GMT Standard Time': [
+        'Europe/London', 'Europe/Dublin', 'Europe/Lisbon', 'Europe/Guernsey', 'Europe/Isle_of_Man',
+        'Europe/Jersey', 'Atlantic/Canary', 'Atlantic/Faeroe', 'Atlantic/Faroe', 'Atlantic/Madeira',
+    ],
+    'Greenwich Standard Time': [
+        'Atlantic/Reykjavik', 'Africa/Abidjan', 'Africa/Accra', 'Africa/Bamako', 'Africa/Banjul',
+        'Africa/Bissau', 'Africa/Conakry', 'Africa/Dakar', 'Africa/Freetown', 'Africa/Lome',
+        'Africa/Monrovia', 'Africa/Nouakchott', 'Africa/Ouagadougou', 'Atlantic/St_Helena',
+        'America/Danmarkshavn',
+    ],
+    'Sao Tome Standard Time': ['Africa/Sao_Tome'],
+    'Morocco Standard Time': ['Africa/Casablanca', 'Africa/El_Aaiun'],
+    'W. Europe Standard Time': [
+        'Europe/Berlin', 'Europe/Amsterdam', 'Europe/Andorra', 'Europe/Busingen', 'Europe/Gibraltar',
+        'Europe/Luxembourg', 'Europe/Malta', 'Europe/Monaco', 'Europe/Oslo', 'Europe/Rome',
+        'Europe/San_Marino', 'Europe/Stockholm', 'Europe/Vaduz', 'Europe/Vatican', 'Europe/Vienna',
+        'Europe/Zurich', 'Arctic/Longyearbyen',
+    ],
+    'Central Europe Standard Time': [
+        'Europe/Budapest', 'Europe/Belgrade', 'Europe/Bratislava', 'Europe/Ljubljana', 'Europe/Podgorica',
+        'Europe/Prague', 'Europe/Tirane',
+    ],
+    'Romance Standard Time': ['Europe/Paris', 'Europe/Brussels', 'Europe/Copenhagen', 'Europe/Madrid', 'Africa/Ceuta'],
+    'Central European Standard Time': ['Europe/Warsaw', 'Europe/Sarajevo', 'Europe/Skopje', 'Europe/Zagreb'],
+    'W. Central Africa Standard Time': [
+        'Africa/Lagos', 'Africa/Algiers', 'Africa/Bangui', 'Africa/Brazzaville', 'Africa/Douala',
+        'Africa/Kinshasa', 'Africa/Libreville', 'Africa/Luanda', 'Africa/Malabo', 'Africa/Ndjamena',
+        'Africa/Niamey', 'Africa/Porto-Novo', 'Africa/Tunis', 'Etc/GMT-1',
+    ],
+    'Jordan Standard Time': ['Asia/Amman'],
+    'GTB Standard Time': ['Europe/Bucharest', 'Europe/Athens', 'Asia/Nicosia', 'Asia/Famagusta'],
+    'Middle East Standard Time': ['Asia/Beirut'],
+    'Egypt Standard Time': ['Africa/Cairo'],
+    'E. Europe Standard Time': ['Europe/Chisinau'],
+    'Syria Standard Time': ['Asia/Damascus'],
+    'West Bank Standard Time': ['Asia/Hebron', 'Asia/Gaza'],
+    'South Africa Standard Time': [
+        'Africa/Johannesburg', 'Africa/Blantyre', 'Africa/Bujumbura', 'Africa/Gaborone', 'Africa/Harare',
+        'Africa/Kigali', 'Africa/Lubumbashi', 'Africa/Lusaka', 'Africa/Maputo', 'Africa/Maseru',
+        'Africa/Mbabane', 'Etc/GMT-2',
+    ],
+    'FLE Standard Time': [
+        'Europe/Kiev', 'Europe/Kyiv', 'Europe/Helsinki', 'Europe/Mariehamn', 'Europe/Riga', 'Europe/Sofia',
+        'Europe/Tallinn', 'Europe/Vilnius', 'Europe/Uzhgorod', 'Europe/Zaporozhye',
+    ],
+    'Israel Standard Time': ['Asia/Jerusalem', 'Asia/Tel_Aviv'],
+    'South Sudan Standard Time': ['Africa/Juba'],
+    'Kaliningrad Standard Time': ['Europe/Kaliningrad'],
+    'Sudan Standard Time': ['Africa/Khartoum'],
+    'Libya Standard Time': ['Africa/Tripoli'],
+    'Namibia Standard Time': ['Africa/Windhoek'],
+    'Arabic Standard Time': ['Asia/Baghdad'],
+    'Turkey Standard Time': ['Europe/Istanbul', 'Asia/Istanbul'],
+    'Arab Standard Time': ['Asia/Riyadh', 'Asia/Aden', 'Asia/Bahrain', 'Asia/Kuwait', 'Asia/Qatar'],
+    'Belarus Standard Time': ['Europe/Minsk'],
+    'Russian Standard Time': ['Europe/Moscow', 'Europe/Kirov', 'Europe/Simferopol'],
+    'E. Africa Standard Time': [
+        'Africa/Nairobi', 'Africa/Addis_Ababa', 'Africa/Asmera', 'Africa/Dar_es_Salaam', 'Africa/Djibouti',
+        'Africa/Kampala', 'Africa/Mogadishu', 'Indian/Antananarivo', 'Indian/Comoro', 'Indian/Mayotte',
+        'Antarctica/Syowa', 'Etc/GMT-3',
+    ],
+    'Volgograd Standard Time': ['Europe/Volgograd'],
+    'Iran Standard Time': ['Asia/Tehran'],
+    'Arabian Standard Time': ['Asia/Dubai', 'Asia/Muscat', 'Etc/GMT-4'],
+    'Astrakhan Standard Time': ['Europe/Astrakhan', 'Europe/Ulyanovsk'],
+    'Azerbaijan Standard Time': ['Asia/Baku'],
+    'Russia Time Zone 3': ['Europe/Samara'],
+    'Mauritius Standard Time': ['Indian/Mauritius', 'Indian/Reunion', 'Indian/Mahe'],
+    'Saratov Standard Time': ['Europe/Saratov'],
+    'Georgian Standard Time': ['Asia/Tbilisi'],
+    'Caucasus Standard Time': ['Asia/Yerevan'],
+    'Afghanistan Standard Time': ['Asia/Kabul'],
+    'West Asia Standard Time': [
+        'Asia/Tashkent', 'Asia/Samarkand', 'Asia/Dushanbe', 'Asia/Ashgabat', 'Asia/Aqtau', 'Asia/Aqtobe',
+        'Asia/Atyrau', 'Asia/Oral', 'Indian/Kerguelen', 'Indian/Maldives', 'Antarctica/Mawson', 'Etc/GMT-5',
+    ],
+    'Ekaterinburg Standard Time': ['Asia/Yekaterinburg'],
+    'Pakistan Standard Time': ['Asia/Karachi'],
+    'Qyzylorda Standard Time': ['Asia/Qyzylorda'],
+    'India Standard Time': ['Asia/Calcutta', 'Asia/Kolkata'],
+    'Sri Lanka Standard Time': ['Asia/Colombo'],
+    'Nepal Standard Time': ['Asia/Katmandu', 'Asia/Kathmandu'],
+    'Central Asia Standard Time': [
+        'Asia/Bishkek', 'Asia/Almaty', 'Asia/Qostanay', 'Asia/Urumqi', 'Indian/Chagos', 'Antarctica/Vostok',
+        'Etc/GMT-6',
+    ],
+    'Bangladesh Standard Time': ['Asia/Dhaka', 'Asia/Thimphu'],
+    'Omsk Standard Time': ['Asia/Omsk'],
+    'Myanmar Standard Time': ['Asia/Rangoon', 'Asia/Yangon', 'Indian/Cocos'],
+    'SE Asia Standard Time': [
+        'Asia/Bangkok', 'Asia/Jakarta', 'Asia/Pontianak', 'Asia/Phnom_Penh', 'Asia/Saigon',
+        'Asia/Ho_Chi_Minh', 'Asia/Vientiane', 'Indian/Christmas', 'Antarctica/Davis', 'Etc/GMT-7',
+    ],
+    'Altai Standard Time': ['Asia/Barnaul'],
+    'W. Mongolia Standard Time': ['Asia/Hovd'],
+    'North Asia Standard Time': ['Asia/Krasnoyarsk', 'Asia/Novokuznetsk'],
+    'N. Central Asia Standard Time': ['Asia/Novosibirsk'],
+    'Tomsk Standard Time': ['Asia/Tomsk'],
+    'China Standard Time': ['Asia/Shanghai', 'Asia/Hong_Kong', 'Asia/Macau', 'Asia/Chongqing', 'Asia/Harbin', 'PRC'],
+    'North Asia East Standard Time': ['Asia/Irkutsk'],
+    'Singapore Standard Time': [
+        'Asia/Singapore', 'Asia/Kuala_Lumpur', 'Asia/Kuching', 'Asia/Brunei', 'Asia/Makassar', 'Asia/Manila',
+        'Etc/GMT-8',
+    ],
+    'W. Australia Standard Time': ['Australia/Perth'],
+    'Taipei Standard Time': ['Asia/Taipei'],
+    'Ulaanbaatar Standard Time': ['Asia/Ulaanbaatar', 'Asia/Choibalsan'],
+    'Aus Central W. Standard Time': ['Australia/Eucla'],
+    'Transbaikal Standard Time': ['Asia/Chita'],
+    'Tokyo Standard Time': ['Asia/Tokyo', 'Asia/Dili', 'Asia/Jayapura', 'Pacific/Palau', 'Etc/GMT-9', 'Japan'],
+    'North Korea Standard Time': ['Asia/Pyongyang'],
+    'Korea Standard Time': ['Asia/Seoul'],
+    'Yakutsk Standard Time': ['Asia/Yakutsk', 'Asia/Khandyga'],
+    'Cen. Australia Standard Time': ['Australia/Adelaide', 'Australia/Broken_Hill'],
+    'AUS Central Standard Time': ['Australia/Darwin'],
+    'E. Australia Standard Time': ['Australia/Brisbane', 'Australia/Lindeman'],
+    'AUS Eastern Standard Time': ['Australia/Sydney', 'Australia/Melbourne', 'Australia/Canberra'],
+    'West Pacific Standard Time': [
+        'Pacific/Port_Moresby', 'Pacific/Guam', 'Pacific/Saipan', 'Pacific/Truk', 'Pacific/Chuuk',
+        'Antarctica/DumontDUrville', 'Etc/GMT-10',
+    ],
+    'Tasmania Standard Time': ['Australia/Hobart', 'Antarctica/Macquarie'],
+    'Vladivostok Standard Time': ['Asia/Vladivostok', 'Asia/Ust-Nera'],
+    'Lord Howe Standard Time': ['Australia/Lord_Howe'],
+    'Bougainville Standard Time': ['Pacific/Bougainville'],
+    'Russia Time Zone 10': ['Asia/Srednekolymsk'],
+    'Magadan Standard Time': ['Asia/Magadan'],
+    'Norfolk Standard Time': ['Pacific/Norfolk'],
+    'Sakhalin Standard Time': ['Asia/Sakhalin'],
+    'Central Pacific Standard Time': [
+        'Pacific/Guadalcanal', 'Pacific/Efate', 'Pacific/Noumea', 'Pacific/Kosrae', 'Pacific/Ponape',
+        'Pacific/Pohnpei', 'Antarctica/Casey', 'Etc/GMT-11',
+    ],
+    'Russia Time Zone 11': ['Asia/Kamchatka', 'Asia/Anadyr'],
+    'New Zealand Standard Time': ['Pacific/Auckland', 'Antarctica/McMurdo', 'NZ'],
+    'UTC+12': [
+        'Etc/GMT-12', 'Pacific/Funafuti', 'Pacific/Kwajalein', 'Pacific/Majuro', 'Pacific/Nauru',
+        'Pacific/Tarawa', 'Pacific/Wake', 'Pacific/Wallis',
+    ],
+    'Fiji Standard Time': ['Pacific/Fiji'],
+    'Chatham Islands Standard Time': ['Pacific/Chatham'],
+    'UTC+13': ['Etc/GMT-13', 'Pacific/Enderbury', 'Pacific/Kanton', 'Pacific/Fakaofo'],
+    'Tonga Standard Time': ['Pacific/Tongatapu'],
+    'Samoa Standard Time': ['Pacific/Apia'],
+    'Line Islands Standard Time': ['Pacific/Kiritimati', 'Etc/GMT-14'],
+}
+
+IANA_TO_WINDOWS = {
+    iana_name: windows_name
+    for windows_name, iana_names in _WINDOWS_TO_IANA.items()
+    for iana_name in iana_names
+}
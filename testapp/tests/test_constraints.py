@@ -1,6 +1,7 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the BSD license.
 import logging
+from unittest import mock
 
 import django.db.utils
 from django.db import connections, migrations, models
@@ -227,3 +228,71 @@ class TestUniqueConstraints(TransactionTestCase):
                     NotImplementedError, "does not support OR conditions"
                 ):
                     return migration.apply(ProjectState(), editor)
+
+
+class TestConstraintSnapshots(TestCase):
+    def test_constraints_read_once(self):
+        connection = connections['default']
+        introspection = connection.introspection
+        index = models.Index(fields=['name'], name='snapshot_name_idx')
+        with mock.patch.object(
+            introspection, 'get_constraints', wraps=introspection.get_constraints,
+        ) as get_constraints, connection.schema_editor() as editor:
+            self.assertEqual(editor._constraint_names(Author, ['name'], index=True), [])
+            self.assertEqual(editor._constraint_names(Author, foreign_key=True), [])
+            self.assertEqual(get_constraints.call_count, 1)
+            # Creating an index discards the snapshot of the table
+            editor.add_index(Author, index)
+            self.assertEqual(editor._constraint_names(Author, ['name'], index=True), ['snapshot_name_idx'])
+            self.assertEqual(get_constraints.call_count, 2)
+            # Dropping it is followed without reading the catalog again
+            editor.remove_index(Author, index)
+            self.assertEqual(editor._constraint_names(Author, ['name'], index=True), [])
+            self.assertEqual(get_constraints.call_count, 2)
+
+    def test_snapshot_tables_case_insensitive(self):
+        connection = connections['default']
+        with connection.schema_editor() as editor:
+            editor._get_table_constraints(Author._meta.db_table)
+            editor._update_constraint_snapshots('ALTER TABLE [TESTAPP_AUTHOR] ADD [x] int')
+            self.assertEqual(editor._constraint_snapshots, {})
+
+    def test_snapshot_tables_matched_by_name(self):
+        connection = connections['default']
+        with connection.schema_editor() as editor:
+            editor._constraint_snapshots = {'testapp_author': {}, 'testapp_author_books': {}}
+            editor._update_constraint_snapshots('ALTER TABLE [testapp_author_books] ADD [x] int')
+            self.assertEqual(list(editor._constraint_snapshots), ['testapp_author'])
+
+    @skipUnlessDBFeature('supports_session_context')
+    @mock.patch.dict(connections['default'].settings_dict['OPTIONS'], {'ddl_batch_size': 50})
+    def test_snapshots_follow_batches_once_run(self):
+        connection = connections['default']
+        with connection.schema_editor() as editor:
+            constraints = editor._get_table_constraints(Author._meta.db_table)
+            with self.assertRaises(django.db.utils.DatabaseError), editor.batch():
+                editor.execute('ALTER TABLE [testapp_author] ADD CONSTRAINT [snapshot_check] CHECK ([id] > 0)')
+                self.assertIn(Author._meta.db_table, editor._constraint_snapshots)
+                editor.execute('ALTER TABLE [testapp_author] ADD CONSTRAINT [snapshot_check] CHECK ([id] > 0)')
+            # Statements of a failed batch may have run
+            self.assertEqual(editor._constraint_snapshots, {})
+            self.assertIn('snapshot_check', editor._get_table_constraints(Author._meta.db_table))
+            self.assertNotIn('snapshot_check', constraints)
+
+    def test_unclassified_statements_discard_snapshots(self):
+        connection = connections['default']
+        with connection.schema_editor() as editor:
+            editor._get_table_constraints(Author._meta.db_table)
+            # Catalog reads don't change constraints
+            editor._update_constraint_snapshots('SELECT 1')
+            self.assertIn(Author._meta.db_table, editor._constraint_snapshots)
+            editor._update_constraint_snapshots("EXEC(N'DROP INDEX [x] ON [y]')")
+            self.assertEqual(editor._constraint_snapshots, {})
+
+    def test_run_python_discards_snapshots(self):
+        connection = connections['default']
+        operation = migrations.RunPython(lambda apps, schema_editor: None)
+        with connection.schema_editor() as editor:
+            editor._get_table_constraints(Author._meta.db_table)
+            operation.database_forwards('testapp', editor, ProjectState(), ProjectState())
+            self.assertEqual(editor._constraint_snapshots, {})
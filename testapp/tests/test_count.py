@@ -0,0 +1,55 @@
+from unittest import mock
+
+from django.db import NotSupportedError, connection
+from django.test import TestCase, skipIfDBFeature, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+
+from mssql.count import ApproxCountDistinct, ApproximateCountQuerySet
+
+from ..models import Author, Post
+
+
+class TestApproximateCount(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Author.objects.bulk_create([Author(name='a'), Author(name='b'), Author(name='b')])
+
+    def test_below_threshold_is_exact(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(ApproximateCountQuerySet(Author).count(), 3)
+        # The statistics and the exact count are read in one query
+        self.assertEqual(len(captured), 1)
+        self.assertIn('COUNT_BIG(*)', captured[0]['sql'])
+
+    @mock.patch.object(ApproximateCountQuerySet, 'approximate_count_threshold', 0)
+    def test_above_threshold(self):
+        queryset = ApproximateCountQuerySet(Author)
+        with CaptureQueriesContext(connection) as captured:
+            count = queryset.count()
+        self.assertEqual(len(captured), 1)
+        self.assertIn('sys.dm_db_partition_stats', captured[0]['sql'])
+        self.assertEqual(count, queryset.approximate_count())
+
+    def test_exact_count_required(self):
+        queryset = ApproximateCountQuerySet(Author)
+        self.assertIsNotNone(queryset.approximate_count())
+        self.assertIsNotNone(queryset.order_by('name').approximate_count())
+        self.assertIsNone(queryset.filter(name='b').approximate_count())
+        self.assertIsNone(queryset.distinct().approximate_count())
+        self.assertIsNone(queryset[:2].approximate_count())
+        self.assertIsNone(ApproximateCountQuerySet(Post).filter(author__name='a').approximate_count())
+        with mock.patch.object(ApproximateCountQuerySet, 'approximate_count_threshold', 0):
+            self.assertEqual(queryset.filter(name='b').count(), 2)
+
+
+class TestApproxCountDistinct(TestCase):
+    @skipUnlessDBFeature('supports_approx_count_distinct')
+    def test_aggregate(self):
+        Author.objects.bulk_create([Author(name='a'), Author(name='b'), Author(name='b')])
+        self.assertEqual(Author.objects.aggregate(names=ApproxCountDistinct('name'))['names'], 2)
+        self.assertEqual(Author.objects.none().aggregate(names=ApproxCountDistinct('name'))['names'], 0)
+
+    @skipIfDBFeature('supports_approx_count_distinct')
+    def test_not_supported(self):
+        with self.assertRaises(NotSupportedError):
+            Author.objects.aggregate(names=ApproxCountDistinct('name'))
@@ -0,0 +1,66 @@
+from unittest import mock
+
+from django.db import DatabaseError, connection
+from django.test import SimpleTestCase, skipUnlessDBFeature
+
+from mssql.creation import _clone_errors, _clone_threads, _join_clone_threads
+
+
+@skipUnlessDBFeature('can_clone_databases')
+class TestCloneTestDatabase(SimpleTestCase):
+    databases = {'default'}
+
+    def setUp(self):
+        self.creation = connection.creation
+        self.name = self.creation.get_test_db_clone_settings('clone')['NAME']
+        self.addCleanup(self.creation._destroy_test_db, self.name, 0)
+
+    def test_clone(self):
+        self.creation.clone_test_db('clone', verbosity=0)
+        _join_clone_threads()
+        with self.creation.cursor() as cursor:
+            self.assertEqual(self.creation._get_database_state(cursor, self.name), 'ONLINE')
+            cursor.execute(
+                'SELECT COUNT(*) FROM %s.sys.tables WHERE name = %%s' % connection.ops.quote_name(self.name),
+                ['testapp_author'],
+            )
+            self.assertEqual(cursor.fetchone()[0], 1)
+
+    def test_keepdb_reuses_clone(self):
+        self.creation.clone_test_db('clone', verbosity=0)
+        _join_clone_threads()
+        self.creation.clone_test_db('clone', verbosity=0, keepdb=True)
+        self.assertNotIn(self.name, _clone_threads)
+
+    def test_clone_error_raised(self):
+        self.creation._copy_test_db(self.name, ["RAISERROR('clone failed', 16, 1)"])
+        self.assertIn(self.name, _clone_errors)
+        with self.assertRaisesMessage(Exception, 'clone failed'):
+            _join_clone_threads()
+        with self.assertRaisesMessage(Exception, 'clone failed'):
+            self.creation.setup_worker_connection('clone')
+        # Destroying the clone forgets its error
+        self.creation.clone_test_db('clone', verbosity=0)
+        _join_clone_threads()
+        self.assertNotIn(self.name, _clone_errors)
+
+
+class TestWaitForClone(SimpleTestCase):
+    def wait(self, *states):
+        creation = connection.creation
+        with mock.patch.object(creation, '_get_database_state', side_effect=states) as get_state, \
+                mock.patch('mssql.creation.time.sleep'):
+            creation._wait_for_database(None, 'clone')
+        return get_state.call_count
+
+    def test_online(self):
+        self.assertEqual(self.wait('RESTORING', 'COPYING', 'ONLINE'), 3)
+
+    def test_failed_copy(self):
+        with self.assertRaisesMessage(DatabaseError, 'The test database clone is SUSPECT'):
+            self.wait('RESTORING', 'SUSPECT')
+
+    @mock.patch.object(connection.creation, 'clone_start_timeout', -1)
+    def test_missing(self):
+        with self.assertRaisesMessage(DatabaseError, 'The test database clone is missing'):
+            self.wait(None)
@@ -0,0 +1,86 @@
+from django.db import connection, migrations, models
+from django.db.migrations.migration import Migration
+from django.db.migrations.state import ProjectState
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from mssql.indexes import SQLServerIndex
+from mssql.migration_operations import AlterDataCompression
+
+from . import get_constraints
+from ..models import Author
+
+
+class TestDataCompression(TestCase):
+    table = 'testapp_testcompressedmodel'
+
+    def _apply(self, state, *operations):
+        migration = Migration('name', 'testapp')
+        migration.operations = operations
+        with connection.schema_editor() as editor:
+            return migration.apply(state, editor)
+
+    def _table_data_compression(self):
+        with connection.cursor() as cursor:
+            return connection.introspection.get_table_data_compression(cursor, self.table)
+
+    def setUp(self):
+        self.state = self._apply(ProjectState(), migrations.CreateModel(
+            'TestCompressedModel',
+            [
+                ('id', models.AutoField(primary_key=True)),
+                ('name', models.CharField(max_length=100)),
+            ],
+            options={
+                'data_compression': 'PAGE',
+                'indexes': [SQLServerIndex(fields=['name'], name='compressed_name_idx', data_compression='PAGE')],
+            },
+        ))
+
+    def test_create_model(self):
+        self.assertEqual(self._table_data_compression(), 'PAGE')
+        self.assertEqual(get_constraints(self.table)['compressed_name_idx']['data_compression'], 'PAGE')
+
+    def test_alter_data_compression(self):
+        state = self._apply(
+            self.state,
+            AlterDataCompression('TestCompressedModel', 'ROW'),
+            AlterDataCompression('TestCompressedModel', 'NONE', index_name='compressed_name_idx'),
+        )
+        self.assertEqual(self._table_data_compression(), 'ROW')
+        self.assertEqual(get_constraints(self.table)['compressed_name_idx']['data_compression'], 'NONE')
+        index = state.models['testapp', 'testcompressedmodel'].options['indexes'][0]
+        self.assertEqual(index.data_compression, 'NONE')
+
+    def test_unchanged_is_not_rebuilt(self):
+        with CaptureQueriesContext(connection) as captured:
+            with connection.schema_editor() as editor:
+                editor.alter_data_compression(
+                    self.state.apps.get_model('testapp', 'TestCompressedModel'), 'PAGE',
+                )
+        self.assertFalse([query for query in captured if 'REBUILD' in query['sql']])
+
+    def test_missing_index(self):
+        with self.assertRaisesMessage(ValueError, 'Index missing_idx does not exist on table %s.' % self.table):
+            with connection.schema_editor() as editor:
+                editor.alter_data_compression(
+                    self.state.apps.get_model('testapp', 'TestCompressedModel'), 'ROW', index_name='missing_idx',
+                )
+
+    def test_index_sql(self):
+        index = SQLServerIndex(
+            fields=['name'], name='author_name_page', data_compression='PAGE',
+            condition=models.Q(name__startswith='a'), db_tablespace='PRIMARY',
+        )
+        with connection.schema_editor(collect_sql=True) as editor:
+            editor.add_index(Author, index)
+        self.assertRegex(
+            editor.collected_sql[0],
+            r'WHERE .* WITH \(DATA_COMPRESSION = PAGE\) ON \[PRIMARY\]',
+        )
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            SQLServerIndex(fields=['name'], name='idx', data_compression='COLUMNSTORE')
+        with self.assertRaises(ValueError):
+            AlterDataCompression('TestCompressedModel', 'SOME')
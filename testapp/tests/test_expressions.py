@@ -6,11 +6,16 @@ from unittest import skipUnless
 
 from django import VERSION
 from django.db.models import CharField, IntegerField, F
-from django.db.models.expressions import Case, Exists, OuterRef, Subquery, Value, When, ExpressionWrapper
+from django.db.models.expressions import Case, Exists, Func, OuterRef, Subquery, Value, When, ExpressionWrapper
+from django.db import connection
+from django.db.models.functions import MD5, SHA1, SHA256, SHA512, StrIndex, Substr
 from django.test import TestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
 
 from django.db.models.aggregates import Count, Sum
 
+from mssql.compiler import get_renderer, register_renderer, unregister_renderer
+
 from ..models import Author, Book, Comment, Post, Editor, ModelWithNullableFieldsOfDifferentTypes
 
 
@@ -132,3 +137,68 @@ class TestBulkUpdate(TestCase):
         self.assertCountEqual(ModelWithNullableFieldsOfDifferentTypes.objects.filter(int_value__isnull=True), objs)
         self.assertCountEqual(ModelWithNullableFieldsOfDifferentTypes.objects.filter(name__isnull=True), objs)
         self.assertCountEqual(ModelWithNullableFieldsOfDifferentTypes.objects.filter(date__isnull=True), objs)
+
+
+class Reverse(Func):
+    function = 'REVERSE_NOT_ON_SQL_SERVER'
+
+
+class TestRenderers(TestCase):
+    def setUp(self):
+        self.author = Author.objects.create(name="author")
+        self.addCleanup(unregister_renderer, Reverse)
+
+    @staticmethod
+    def render_reverse(node, compiler, connection):
+        return node.as_sql(compiler, connection, function='REVERSE')
+
+    def test_register_renderer(self):
+        register_renderer(Reverse, self.render_reverse)
+        author = Author.objects.annotate(reversed=Reverse('name')).get()
+        self.assertEqual(author.reversed, 'rohtua')
+
+    def test_renderer_resolved_through_mro(self):
+        class SubReverse(Reverse):
+            pass
+        self.assertIsNone(get_renderer(SubReverse))
+        register_renderer(Reverse, self.render_reverse)
+        self.assertIs(get_renderer(SubReverse), self.render_reverse)
+
+    def test_unregister_renderer(self):
+        class SubReverse(Reverse):
+            pass
+        register_renderer(Reverse, self.render_reverse)
+        register_renderer(SubReverse, self.render_reverse)
+        unregister_renderer(SubReverse)
+        self.assertIs(get_renderer(SubReverse), self.render_reverse)
+        unregister_renderer(Reverse)
+        self.assertIsNone(get_renderer(SubReverse))
+
+    def test_rendering_does_not_modify_node(self):
+        substr = Substr('name', 2)
+        strindex = StrIndex('name', Value('th'))
+        author = Author.objects.annotate(substr=substr, strindex=strindex).get()
+        self.assertEqual((author.substr, author.strindex), ('uthor', 2))
+        self.assertEqual(len(substr.get_source_expressions()), 2)
+        self.assertEqual(strindex.get_source_expressions()[1], Value('th'))
+
+
+class TestHashFunctions(TestCase):
+    def setUp(self):
+        if connection.sql_server_version < 2019:
+            self.skipTest("Hashing requires SQL Server 2019 or above")
+        self.author = Author.objects.create(name="author")
+
+    def test_hash_compiles_without_querying_data(self):
+        for function in (MD5, SHA1, SHA256, SHA512):
+            with self.subTest(function=function.__name__):
+                queryset = Author.objects.annotate(hashed=function('name'))
+                with CaptureQueriesContext(connection) as captured:
+                    sql = str(queryset.query)
+                self.assertEqual(len(captured), 0)
+                self.assertIn('VARCHAR(400)', sql)
+                self.assertEqual(sql, str(queryset.query))
+
+    def test_hash_value(self):
+        author = Author.objects.annotate(hashed=MD5('name')).get()
+        self.assertEqual(author.hashed, '02bd92faa38aaa6cc0ea75e59937a1ef')
@@ -0,0 +1,63 @@
+from django.core.management.color import no_style
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from ..models import Author, Number, Post, TimeZone
+
+
+class TestSqlFlush(TestCase):
+    tables = ['testapp_author', 'testapp_number', 'testapp_post', 'testapp_timezone']
+
+    def setUp(self):
+        # Prime the cached server properties
+        connection.sql_server_version
+        author = Author.objects.create(name='author')
+        Post.objects.create(title='post', author=author)
+        TimeZone.objects.create()
+
+    def sql_flush(self, reset_sequences=True):
+        return connection.ops.sql_flush(no_style(), self.tables, reset_sequences=reset_sequences)
+
+    def test_catalog_queries(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.sql_flush()
+        # The catalog, its foreign keys and whether testapp_number is empty,
+        # whatever the number of tables and identity columns
+        self.assertEqual(len(captured), 3)
+
+    def test_row_counts_confirmed(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.sql_flush(reset_sequences=False)
+        self.assertIn('[testapp_number])', captured[-1]['sql'])
+        self.assertNotIn('[testapp_author]', captured[-1]['sql'])
+
+    def test_truncate_unreferenced_tables(self):
+        sql_list = self.sql_flush()
+        self.assertIn('TRUNCATE TABLE [testapp_timezone];', sql_list)
+        # Author is referenced by Post
+        self.assertIn('DELETE FROM [testapp_author];', sql_list)
+        self.assertNotIn('NOCHECK', ''.join(sql_list))
+        # TRUNCATE restarts the identity without reseeding it
+        self.assertNotIn('DBCC CHECKIDENT ([testapp_timezone], RESEED, 0) WITH NO_INFOMSGS;', sql_list)
+
+    def test_delete_when_not_resetting_sequences(self):
+        sql_list = self.sql_flush(reset_sequences=False)
+        self.assertIn('DELETE FROM [testapp_timezone];', sql_list)
+        self.assertNotIn('TRUNCATE', ''.join(sql_list))
+        self.assertNotIn('CHECKIDENT', ''.join(sql_list))
+
+    def test_dependency_order(self):
+        sql_list = self.sql_flush(reset_sequences=False)
+        self.assertLess(sql_list.index('DELETE FROM [testapp_post];'), sql_list.index('DELETE FROM [testapp_author];'))
+
+    def test_untouched_tables_skipped(self):
+        self.assertFalse(Number.objects.exists())
+        self.assertNotIn('[testapp_number]', ''.join(self.sql_flush(reset_sequences=False)))
+
+    def test_flush(self):
+        connection.ops.execute_sql_flush(self.sql_flush())
+        self.assertFalse(Author.objects.exists())
+        self.assertFalse(Post.objects.exists())
+        self.assertEqual(TimeZone.objects.create().pk, 1)
+        self.assertEqual(Author.objects.create(name='author').pk, 1)
@@ -7,11 +7,18 @@ from django.db import models, migrations
 from django.db.migrations.migration import Migration
 from django.db.migrations.state import ProjectState
 from django.db.models import UniqueConstraint
-from django.db.utils import DEFAULT_DB_ALIAS, ConnectionHandler, ProgrammingError
+from django.db.transaction import TransactionManagementError
+from django.db.utils import DEFAULT_DB_ALIAS, ConnectionHandler, NotSupportedError, ProgrammingError
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.writer import MigrationWriter
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from mssql.indexes import ColumnstoreIndex, SQLServerIndex
 
 from . import get_constraints
 from ..models import (
+    Author,
     TestIndexesRetainedRenamed,
     Choice,
     Question,
@@ -210,3 +217,164 @@ class TestAddAndAlterUniqueIndex(TestCase):
                 migration.apply(new_state, editor)
         except django.db.utils.ProgrammingError as e:
             self.fail('Check if can alter field from unique, nullable to unique non-nullable for issue #23, AlterField failed with exception: %s' % e)
+
+
+class TestColumnstoreIndex(TestCase):
+
+    def _apply(self, state, *operations):
+        migration = Migration("name", "testapp")
+        migration.operations = operations
+        with connection.schema_editor(atomic=True) as editor:
+            return migration.apply(state, editor)
+
+    def _create_model(self, name, indexes=()):
+        return migrations.CreateModel(
+            name,
+            [
+                ("id", models.AutoField(primary_key=True)),
+                ("day", models.DateField()),
+                ("amount", models.IntegerField()),
+            ],
+            options={"indexes": list(indexes)},
+        )
+
+    def test_clustered(self):
+        table = "testapp_testclusteredcolumnstore"
+        index = ColumnstoreIndex(name="clustered_cs", clustered=True)
+        state = self._apply(ProjectState(), self._create_model("TestClusteredColumnstore", [index]))
+        try:
+            constraints = get_constraints(table)
+            self.assertEqual(constraints["clustered_cs"]["type"], ColumnstoreIndex.suffix)
+            primary_key = [c for c in constraints.values() if c["primary_key"]]
+            self.assertEqual(len(primary_key), 1)
+
+            if VERSION >= (4, 1):
+                state = self._apply(state, migrations.RenameIndex(
+                    "testclusteredcolumnstore", new_name="clustered_cs_renamed", old_name="clustered_cs",
+                ))
+                self.assertIn("clustered_cs_renamed", get_constraints(table))
+                index = ColumnstoreIndex(name="clustered_cs_renamed", clustered=True)
+            state = self._apply(state, migrations.RemoveIndex("testclusteredcolumnstore", index.name))
+            self.assertNotIn(index.name, get_constraints(table))
+        finally:
+            self._apply(state, migrations.DeleteModel("TestClusteredColumnstore"))
+
+    def test_nonclustered_filtered(self):
+        table = "testapp_testnonclusteredcolumnstore"
+        index = ColumnstoreIndex(
+            fields=["day", "amount"], name="nonclustered_cs", condition=models.Q(amount__gt=0),
+        )
+        state = self._apply(
+            ProjectState(),
+            self._create_model("TestNonclusteredColumnstore"),
+            migrations.AddIndex("testnonclusteredcolumnstore", index),
+        )
+        try:
+            constraints = get_constraints(table)
+            self.assertEqual(constraints["nonclustered_cs"]["type"], ColumnstoreIndex.suffix)
+            self.assertEqual(sorted(constraints["nonclustered_cs"]["columns"]), ["amount", "day"])
+
+            state = self._apply(state, migrations.RemoveIndex("testnonclusteredcolumnstore", "nonclustered_cs"))
+            self.assertNotIn("nonclustered_cs", get_constraints(table))
+        finally:
+            self._apply(state, migrations.DeleteModel("TestNonclusteredColumnstore"))
+
+    def test_autodetector_round_trip(self):
+        indexes = [
+            ColumnstoreIndex(name="clustered_cs", clustered=True),
+            ColumnstoreIndex(fields=["day"], name="nonclustered_cs", condition=models.Q(amount__gt=0)),
+        ]
+        # Rebuild the indexes from the code a migration file holds
+        rebuilt = []
+        for index in indexes:
+            string, imports = MigrationWriter.serialize(index)
+            namespace = {}
+            exec("\n".join(imports), namespace)
+            rebuilt.append(eval(string, namespace))
+        self.assertEqual([index.clustered for index in rebuilt], [True, False])
+        self.assertEqual(rebuilt[0].fields, [])
+        from_state, to_state = ProjectState(), ProjectState()
+        self._create_model("TestColumnstoreState", indexes).state_forwards("testapp", from_state)
+        self._create_model("TestColumnstoreState", rebuilt).state_forwards("testapp", to_state)
+        changes = MigrationAutodetector(from_state, to_state)._detect_changes()
+        self.assertEqual(changes, {})
+
+    def test_add_clustered_to_clustered_table(self):
+        table = "testapp_testaddclusteredcolumnstore"
+        state = self._apply(ProjectState(), self._create_model("TestAddClusteredColumnstore"))
+        try:
+            with self.assertRaisesMessage(NotSupportedError, 'already has the clustered index'):
+                self._apply(state, migrations.AddIndex(
+                    "testaddclusteredcolumnstore", ColumnstoreIndex(name="clustered_cs", clustered=True),
+                ))
+            self.assertNotIn("clustered_cs", get_constraints(table))
+        finally:
+            self._apply(state, migrations.DeleteModel("TestAddClusteredColumnstore"))
+
+    def test_add_clustered_sql(self):
+        # sqlmigrate doesn't need the table
+        with CaptureQueriesContext(django.db.connection) as captured:
+            with django.db.connection.schema_editor(collect_sql=True) as editor:
+                editor.add_index(Author, ColumnstoreIndex(name="clustered_cs", clustered=True))
+        self.assertEqual(len(captured), 0)
+        self.assertIn("CREATE CLUSTERED COLUMNSTORE INDEX [clustered_cs]", editor.collected_sql[0])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            ColumnstoreIndex(name="cs")
+        with self.assertRaises(ValueError):
+            ColumnstoreIndex(name="cs", clustered=True, condition=models.Q(amount__gt=0))
+        with self.assertRaises(ValueError):
+            ColumnstoreIndex(fields=["-day"], name="cs")
+
+
+class TestIndexOptions(TestCase):
+
+    def _create_sql(self, index):
+        with django.db.connection.schema_editor(collect_sql=True) as editor:
+            editor.add_index(Author, index)
+        return editor.collected_sql[0]
+
+    def test_options(self):
+        sql = self._create_sql(SQLServerIndex(
+            fields=['name'], name='author_name_opts', online=True, sort_in_tempdb=True, maxdop=2, fillfactor=80,
+        ))
+        self.assertIn('SORT_IN_TEMPDB = ON, MAXDOP = 2, FILLFACTOR = 80', sql)
+        if django.db.connection.features.supports_online_index_operations:
+            self.assertIn('WITH (ONLINE = ON, ', sql)
+        else:
+            self.assertNotIn('ONLINE', sql)
+
+    def test_resumable(self):
+        sql = self._create_sql(
+            SQLServerIndex(fields=['name'], name='author_name_opts', resumable=True, max_duration=5),
+        )
+        if django.db.connection.features.supports_resumable_index_operations:
+            self.assertIn('WITH (ONLINE = ON, RESUMABLE = ON, MAX_DURATION = 5 MINUTES)', sql)
+        else:
+            self.assertNotIn('RESUMABLE', sql)
+
+    def test_resumable_in_transaction(self):
+        index = SQLServerIndex(fields=['name'], name='author_name_opts', resumable=True)
+        if django.db.connection.features.supports_resumable_index_operations:
+            with self.assertRaises(TransactionManagementError), django.db.connection.schema_editor() as editor:
+                editor.add_index(Author, index)
+        else:
+            with django.db.connection.schema_editor() as editor:
+                editor.add_index(Author, index)
+            self.assertIn('author_name_opts', get_constraints(Author._meta.db_table))
+
+    def test_deconstruct(self):
+        index = SQLServerIndex(fields=['name'], name='author_name_opts', online=False, fillfactor=80)
+        path, args, kwargs = index.deconstruct()
+        self.assertEqual(path, 'mssql.indexes.SQLServerIndex')
+        self.assertEqual(kwargs, {'fields': ['name'], 'name': 'author_name_opts', 'online': False, 'fillfactor': 80})
+        self.assertEqual(index, index.clone())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            SQLServerIndex(fields=['name'], name='idx', resumable=True, online=False)
+        with self.assertRaises(ValueError):
+            SQLServerIndex(fields=['name'], name='idx', max_duration=5)
+        with self.assertRaises(ValueError):
+            SQLServerIndex(fields=['name'], name='idx', fillfactor=0)
@@ -0,0 +1,37 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class TestInspectDB(TestCase):
+    def inspectdb(self, *tables, **options):
+        out, err = StringIO(), StringIO()
+        call_command('inspectdb', *tables, stdout=out, stderr=err, **options)
+        return out.getvalue(), err.getvalue()
+
+    def test_deterministic_output(self):
+        output, _ = self.inspectdb('testapp_author', 'testapp_post', workers=1)
+        self.assertIn('class TestappAuthor(models.Model):', output)
+        self.assertIn("author = models.ForeignKey(TestappAuthor, models.DO_NOTHING)", output)
+        for workers in (2, 8):
+            with self.subTest(workers=workers):
+                self.assertEqual(self.inspectdb('testapp_author', 'testapp_post', workers=workers)[0], output)
+
+    def test_progress(self):
+        _, progress = self.inspectdb('testapp_author')
+        self.assertIn('Read the catalog of schema dbo', progress)
+        self.assertIn('Inspected 1 schema(s)', progress)
+
+    def test_several_schemas(self):
+        output, progress = self.inspectdb(schema=['dbo', 'sys'])
+        self.assertEqual(output.count('from django.db import models'), 1)
+        self.assertLess(output.index('# Schema dbo'), output.index('# Schema sys'))
+        self.assertIn('class TestappAuthor(models.Model):', output)
+        self.assertIn('Inspected 2 schema(s)', progress)
+
+    def test_schema_option_keeps_table_names(self):
+        output, progress = self.inspectdb('--schema', 'dbo', 'testapp_author', '--schema', 'sys')
+        self.assertIn('class TestappAuthor(models.Model):', output)
+        self.assertNotIn('class TestappPost(models.Model):', output)
+        self.assertIn('Inspected 2 schema(s)', progress)
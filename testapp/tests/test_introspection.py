@@ -0,0 +1,98 @@
+from django.db import DatabaseError, connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+
+class TestTableDescription(TestCase):
+    def setUp(self):
+        # Prime the cached server properties
+        connection.features.supports_comments
+        connection.sql_server_version
+
+    def describe(self, table_name):
+        with connection.cursor() as cursor:
+            description = connection.introspection.get_table_description(cursor, table_name)
+        return {column.name: column for column in description}
+
+    def test_single_query(self):
+        with CaptureQueriesContext(connection) as captured:
+            self.describe('testapp_post')
+        self.assertEqual(len(captured), 1)
+
+    def test_description(self):
+        introspection = connection.introspection
+        columns = self.describe('testapp_post')
+        self.assertEqual(set(columns), {'id', 'title', 'author_id', 'alt_editor_id'})
+        self.assertEqual(introspection.get_field_type(columns['id'].type_code, columns['id']), 'BigAutoField')
+        self.assertEqual(introspection.get_field_type(columns['title'].type_code, columns['title']), 'CharField')
+        self.assertEqual(columns['title'].internal_size, 255)
+        self.assertFalse(columns['title'].null_ok)
+        self.assertTrue(columns['alt_editor_id'].null_ok)
+        self.assertEqual(
+            introspection.get_field_type(columns['author_id'].type_code, columns['author_id']), 'IntegerField',
+        )
+
+    def test_field_types(self):
+        introspection = connection.introspection
+        columns = self.describe('testapp_modelwithnullablefieldsofdifferenttypes')
+        self.assertEqual(
+            {name: introspection.get_field_type(column.type_code, column) for name, column in columns.items()},
+            {'id': 'AutoField', 'int_value': 'IntegerField', 'name': 'CharField', 'date': 'DateTimeField'},
+        )
+
+    def test_batch(self):
+        with connection.cursor() as cursor, CaptureQueriesContext(connection) as captured:
+            descriptions = connection.introspection.get_table_descriptions(
+                cursor, ['testapp_author', 'testapp_post', 'testapp_missing'],
+            )
+        self.assertEqual(len(captured), 1)
+        self.assertEqual(sorted(descriptions), ['testapp_author', 'testapp_post'])
+        self.assertEqual([column.name for column in descriptions['testapp_author']], ['id', 'name'])
+
+    def test_missing_table(self):
+        with self.assertRaises(DatabaseError):
+            self.describe('testapp_missing')
+
+
+class TestCatalog(TestCase):
+    tables = ['testapp_author', 'testapp_post', 'testapp_editor', 'testapp_modelwithnullablefieldsofdifferenttypes']
+
+    def setUp(self):
+        # Prime the cached server properties
+        connection.features.supports_comments
+        connection.sql_server_version
+
+    def inspect(self, cursor):
+        introspection = connection.introspection
+        return {
+            table: (
+                introspection.get_table_description(cursor, table),
+                introspection.get_sequences(cursor, table),
+                introspection.get_relations(cursor, table),
+                introspection.get_key_columns(cursor, table),
+                introspection.get_constraints(cursor, table),
+            )
+            for table in self.tables
+        }
+
+    def test_matches_per_table_introspection(self):
+        with connection.cursor() as cursor:
+            expected = self.inspect(cursor)
+            with connection.introspection.catalog(cursor):
+                with CaptureQueriesContext(connection) as captured:
+                    self.assertEqual(self.inspect(cursor), expected)
+        self.assertEqual(len(captured), 0)
+        self.assertEqual(expected['testapp_post'][2]['author_id'], ('id', 'testapp_author'))
+
+    def test_constant_number_of_queries(self):
+        with connection.cursor() as cursor, CaptureQueriesContext(connection) as captured:
+            with connection.introspection.catalog(cursor) as catalog:
+                pass
+        self.assertLessEqual(len(captured), 7)
+        self.assertTrue(set(self.tables) <= catalog.tables)
+        self.assertIsNone(connection.introspection._catalog)
+
+    def test_unknown_table_queries_database(self):
+        with connection.cursor() as cursor, connection.introspection.catalog(cursor):
+            with self.assertRaises(DatabaseError):
+                connection.introspection.get_table_description(cursor, 'testapp_missing')
@@ -4,7 +4,12 @@
 from unittest import skipUnless
 
 from django import VERSION
-from django.test import TestCase
+from django.db import connection
+from django.test import TestCase, skipUnlessDBFeature
+
+from mssql.indexes import JSONPathIndex
+
+from . import get_constraints
 
 if VERSION >= (3, 1):
     from ..models import JSONModel
@@ -69,3 +74,126 @@ class TestJSONField(TestCase):
             JSONModel.objects.using('sqlite').filter(value__a='b'),
             [json_obj],
         )
+
+
+@skipUnless(VERSION >= (3, 1), "JSONField not support in Django versions < 3.1")
+@skipUnlessDBFeature('supports_json_field')
+class TestHasKeyLookups(TestCase):
+    """
+    has_key, has_keys and has_any_keys over a synthetic JSON table, checked
+    against the same predicate evaluated in Python.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.documents = [
+            {
+                'id': i,
+                **({'customer': {'id': i % 7, 'tier': 'gold'}} if i % 2 else {}),
+                **({'tags': ['a', 'b'][:i % 3]} if i % 3 else {}),
+                **({'total': i * 1.5} if i % 5 else {}),
+                **({'note': 'x' * 50} if i % 11 == 0 else {}),
+            }
+            for i in range(300)
+        ]
+        JSONModel.objects.bulk_create(JSONModel(value=document) for document in cls.documents)
+
+    def assertMatches(self, queryset, predicate):
+        self.assertEqual(
+            sorted(obj.value['id'] for obj in queryset),
+            [document['id'] for document in self.documents if predicate(document)],
+        )
+
+    def test_has_key(self):
+        self.assertMatches(JSONModel.objects.filter(value__has_key='customer'), lambda d: 'customer' in d)
+        self.assertMatches(JSONModel.objects.filter(value__has_key='total'), lambda d: 'total' in d)
+
+    def test_has_keys(self):
+        self.assertMatches(
+            JSONModel.objects.filter(value__has_keys=['customer', 'tags']),
+            lambda d: 'customer' in d and 'tags' in d,
+        )
+
+    def test_has_any_keys(self):
+        self.assertMatches(
+            JSONModel.objects.filter(value__has_any_keys=['note', 'total']),
+            lambda d: 'note' in d or 'total' in d,
+        )
+
+    def test_nested_has_key(self):
+        self.assertMatches(
+            JSONModel.objects.filter(value__customer__has_key='tier'),
+            lambda d: 'tier' in d.get('customer', {}),
+        )
+
+    def test_has_key_is_evaluated_per_row(self):
+        sql = str(JSONModel.objects.filter(value__has_key='customer').query)
+        self.assertNotIn('CROSS APPLY', sql)
+        self.assertEqual(sql.count('FROM [testapp_jsonmodel]'), 1)
+
+    def test_long_and_null_values(self):
+        JSONModel.objects.create(value={'id': 1000, 'long': 'x' * 5000, 'nothing': None})
+        self.assertEqual(JSONModel.objects.filter(value__has_key='long').count(), 1)
+        self.assertEqual(JSONModel.objects.filter(value__has_key='nothing').count(), 1)
+
+    def test_array_index(self):
+        JSONModel.objects.create(value={'id': 1000, 'list': ['a', None], 'dict': {'0': 'a', '1': None}})
+        self.assertEqual(JSONModel.objects.filter(value__list__has_key=1).count(), 1)
+        self.assertEqual(JSONModel.objects.filter(value__list__has_key=2).count(), 0)
+        self.assertEqual(JSONModel.objects.filter(value__dict__has_key=0).count(), 0)
+        if VERSION >= (4, 1):
+            self.assertEqual(JSONModel.objects.filter(value__dict__has_key='0').count(), 1)
+
+
+@skipUnless(VERSION >= (3, 1), "JSONField not support in Django versions < 3.1")
+@skipUnlessDBFeature('supports_json_field')
+class TestJSONPathIndex(TestCase):
+    def setUp(self):
+        self.index = JSONPathIndex('value', 'customer__id', 'int', name='jsonmodel_customer_id')
+        with connection.schema_editor() as editor:
+            editor.add_index(JSONModel, self.index)
+        JSONModel._meta.indexes.append(self.index)
+
+    def tearDown(self):
+        JSONModel._meta.indexes.remove(self.index)
+
+    def test_index_created_on_computed_column(self):
+        constraints = get_constraints(JSONModel._meta.db_table)
+        self.assertEqual(constraints['jsonmodel_customer_id']['columns'], ['value__customer__id'])
+
+    def test_key_lookup_uses_computed_column(self):
+        customer = JSONModel.objects.create(value={'customer': {'id': 5}})
+        JSONModel.objects.create(value={'customer': {'id': 6}})
+        JSONModel.objects.create(value={'customer': 'unknown'})
+        queryset = JSONModel.objects.filter(value__customer__id=5)
+        self.assertIn('[value__customer__id]', str(queryset.query))
+        self.assertSequenceEqual(queryset, [customer])
+        self.assertSequenceEqual(JSONModel.objects.filter(value__customer__id__lt=6), [customer])
+
+    def test_other_paths_unchanged(self):
+        self.assertNotIn('[value__customer__id]', str(JSONModel.objects.filter(value__customer=5).query))
+
+    def test_only_scalar_lookups_of_the_column_type(self):
+        JSONModel.objects.create(value={'customer': {'id': 5}})
+        JSONModel.objects.create(value={'customer': {'id': {'nested': True}}})
+        self.assertIn('[value__customer__id]', str(JSONModel.objects.filter(value__customer__id__in=[5, 6]).query))
+        for queryset in (
+            JSONModel.objects.filter(value__customer__id='5'),
+            JSONModel.objects.filter(value__customer__id={'nested': True}),
+            JSONModel.objects.filter(value__customer__id=None),
+            JSONModel.objects.filter(value__customer__id__isnull=False),
+            JSONModel.objects.values('value__customer__id'),
+            JSONModel.objects.order_by('value__customer__id'),
+        ):
+            with self.subTest(query=str(queryset.query)):
+                self.assertNotIn('[value__customer__id]', str(queryset.query))
+        self.assertEqual(JSONModel.objects.filter(value__customer__id={'nested': True}).count(), 1)
+        # Values are still read as JSON, objects included
+        self.assertCountEqual(
+            JSONModel.objects.values_list('value__customer__id', flat=True), [5, {'nested': True}],
+        )
+
+    def test_remove_index(self):
+        with connection.schema_editor() as editor:
+            editor.remove_index(JSONModel, self.index)
+        self.assertNotIn('jsonmodel_customer_id', get_constraints(JSONModel._meta.db_table))
@@ -1,8 +1,13 @@
 # Copyright (c) Microsoft Corporation.
 # Licensed under the BSD license.
 
+from unittest import mock
+
+from django.db import connection, models
 from django.test import TestCase
-from ..models import Pizza, Topping
+from django.test.utils import CaptureQueriesContext, isolate_apps
+
+from ..models import Author, Pizza, Topping
 
 class TestLookups(TestCase):
     def test_large_number_of_params_UUID(self):
@@ -13,3 +18,51 @@ class TestLookups(TestCase):
         prefetch_result = Pizza.objects.prefetch_related('toppings')
 
         self.assertEqual(len(prefetch_result), iterations)
+
+
+class TestCaseInsensitiveLookups(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Author.objects.bulk_create([Author(name='Alice'), Author(name='alicia'), Author(name='Bob')])
+
+    def test_results(self):
+        self.assertEqual(Author.objects.get(name__iexact='ALICE').name, 'Alice')
+        self.assertEqual(Author.objects.filter(name__icontains='LIC').count(), 2)
+        self.assertEqual(Author.objects.filter(name__istartswith='ali').count(), 2)
+        self.assertEqual(Author.objects.filter(name__iendswith='OB').count(), 1)
+        self.assertEqual(Author.objects.filter(name__icontains='%').count(), 0)
+
+    @mock.patch.object(connection.features, 'database_collation', 'SQL_Latin1_General_CP1_CI_AS')
+    def test_case_insensitive_column(self):
+        sql = str(Author.objects.filter(name__iexact='alice').query)
+        self.assertNotIn('UPPER', sql)
+        self.assertIn('[testapp_author].[name] = alice', sql)
+        sql = str(Author.objects.filter(name__istartswith='ali').query)
+        self.assertIn("[testapp_author].[name] LIKE ali% ESCAPE", sql)
+
+    @mock.patch.object(connection.features, 'database_collation', 'Latin1_General_CS_AS')
+    def test_case_sensitive_column(self):
+        sql = str(Author.objects.filter(name__iexact='alice').query)
+        self.assertIn('[testapp_author].[name] COLLATE Latin1_General_CI_AS = alice', sql)
+        self.assertNotIn('UPPER', sql)
+
+    def test_collation_read_once(self):
+        connection.features.database_collation
+        with CaptureQueriesContext(connection) as captured:
+            str(Author.objects.filter(name__iexact='alice').query)
+        self.assertEqual(len(captured), 0)
+
+    @isolate_apps('testapp')
+    def test_db_collation(self):
+        class Account(models.Model):
+            cs = models.CharField(max_length=20, db_collation='Latin1_General_CS_AS')
+            binary = models.CharField(max_length=20, db_collation='Latin1_General_BIN2')
+
+            class Meta:
+                app_label = 'testapp'
+
+        sql = str(Account.objects.filter(cs__iexact='x').query)
+        self.assertIn('[cs] COLLATE Latin1_General_CI_AS = x', sql)
+        self.assertNotIn('UPPER', sql)
+        sql = str(Account.objects.filter(binary__icontains='x').query)
+        self.assertIn('UPPER', sql)
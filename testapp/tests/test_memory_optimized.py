@@ -0,0 +1,89 @@
+from django.db import NotSupportedError, connection, migrations, models, transaction
+from django.db.migrations.migration import Migration
+from django.db.migrations.state import ProjectState
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+
+from mssql.indexes import HashIndex
+
+from ..models import Author
+
+
+class TestHashIndex(TestCase):
+    def test_deconstruct(self):
+        index = HashIndex(fields=['name'], name='name_hash', bucket_count=1024)
+        path, args, kwargs = index.deconstruct()
+        self.assertEqual(path, 'mssql.indexes.HashIndex')
+        self.assertEqual(kwargs, {'fields': ['name'], 'name': 'name_hash', 'bucket_count': 1024})
+        self.assertEqual(index, index.clone())
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            HashIndex(fields=['name'], name='name_hash', bucket_count=0)
+
+    def test_requires_memory_optimized_table(self):
+        index = HashIndex(fields=['name'], name='name_hash', bucket_count=1024)
+        with self.assertRaises(NotSupportedError):
+            with connection.schema_editor(collect_sql=True) as editor:
+                editor.add_index(Author, index)
+
+
+@skipUnlessDBFeature('supports_memory_optimized_tables')
+class TestMemoryOptimizedTable(TransactionTestCase):
+    table = 'testapp_testmemoryoptimizedsession'
+
+    def _apply(self, state, *operations):
+        migration = Migration('name', 'testapp')
+        migration.operations = operations
+        with connection.schema_editor(atomic=False) as editor:
+            return migration.apply(state, editor)
+
+    def setUp(self):
+        self.state = self._apply(ProjectState(), migrations.CreateModel(
+            'TestMemoryOptimizedSession',
+            [
+                ('id', models.AutoField(primary_key=True)),
+                ('key', models.CharField(max_length=40)),
+                ('expires', models.DateTimeField(db_index=True)),
+            ],
+            options={
+                'memory_optimized': True,
+                'durability': 'SCHEMA_ONLY',
+                'indexes': [HashIndex(fields=['key'], name='session_key_hash', bucket_count=1024)],
+            },
+        ))
+        self.model = self.state.apps.get_model('testapp', 'TestMemoryOptimizedSession')
+
+    def tearDown(self):
+        self._apply(self.state, migrations.DeleteModel('TestMemoryOptimizedSession'))
+
+    def test_table(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT is_memory_optimized, durability_desc FROM sys.tables WHERE name = %s", [self.table],
+            )
+            self.assertEqual(cursor.fetchone(), (True, 'SCHEMA_ONLY'))
+            cursor.execute(
+                "SELECT name, bucket_count FROM sys.hash_indexes WHERE object_id = OBJECT_ID(%s)", [self.table],
+            )
+            self.assertEqual(cursor.fetchone(), ('session_key_hash', 1024))
+            cursor.execute(
+                "SELECT COUNT(*) FROM sys.indexes WHERE object_id = OBJECT_ID(%s) AND type = 2", [self.table],
+            )
+            # The primary key and the expires index
+            self.assertEqual(cursor.fetchone()[0], 2)
+
+    def test_select_for_update(self):
+        self.model.objects.create(key='a', expires='2030-01-01T00:00:00')
+        with transaction.atomic(), CaptureQueriesContext(connection) as captured:
+            self.assertEqual(self.model.objects.select_for_update().get(key='a').key, 'a')
+        sql = captured[0]['sql']
+        self.assertIn('WITH (SERIALIZABLE)', sql)
+        self.assertNotIn('UPDLOCK', sql)
+        with self.assertRaises(NotSupportedError):
+            with transaction.atomic():
+                list(self.model.objects.select_for_update(skip_locked=True))
+
+    def test_explicit_identity_insert(self):
+        with self.assertRaises(NotSupportedError):
+            self.model.objects.create(id=10, key='a', expires='2030-01-01T00:00:00')
@@ -0,0 +1,157 @@
+import datetime
+
+from django.db import NotSupportedError, connection, migrations, models
+from django.db.migrations.autodetector import MigrationAutodetector
+from django.db.migrations.migration import Migration
+from django.db.migrations.state import ModelState, ProjectState
+from django.test import TestCase
+from django.test.utils import isolate_apps
+
+from mssql.partitions import PartitionedQuerySet, PartitionFunction, PartitionScheme
+
+from . import get_constraints
+
+SCHEME = PartitionScheme(
+    'ps_test_monthly',
+    PartitionFunction(
+        'pf_test_monthly', 'date', [datetime.date(2024, 1, 1), datetime.date(2024, 2, 1)],
+    ),
+)
+
+
+class TestPartitionedModel(TestCase):
+    table = 'testapp_testpartitionedreading'
+
+    def setUp(self):
+        operation = migrations.CreateModel(
+            'TestPartitionedReading',
+            [
+                ('id', models.AutoField(primary_key=True)),
+                ('taken_on', models.DateField()),
+                ('value', models.IntegerField(db_index=True)),
+            ],
+            options={'partition_scheme': SCHEME, 'partition_field': 'taken_on'},
+        )
+        migration = Migration('name', 'testapp')
+        migration.operations = [operation]
+        with connection.schema_editor() as editor:
+            state = migration.apply(ProjectState(), editor)
+        self.model = state.apps.get_model('testapp', 'TestPartitionedReading')
+
+    def test_table_and_indexes_on_scheme(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT ds.type FROM sys.indexes i "
+                "INNER JOIN sys.data_spaces ds ON i.data_space_id = ds.data_space_id "
+                "WHERE i.object_id = OBJECT_ID(%s)", [self.table],
+            )
+            data_spaces = [row[0] for row in cursor.fetchall()]
+            cursor.execute(
+                "SELECT COUNT(*) FROM sys.partitions WHERE object_id = OBJECT_ID(%s) AND index_id IN (0, 1)",
+                [self.table],
+            )
+            partitions = cursor.fetchone()[0]
+        self.assertEqual(len(data_spaces), 2)
+        self.assertEqual(set(data_spaces), {'PS'})
+        self.assertEqual(partitions, 3)
+        primary_key = [c for c in get_constraints(self.table).values() if c['primary_key']]
+        self.assertEqual(primary_key[0]['columns'], ['id', 'taken_on'])
+
+    def test_truncate_partitions(self):
+        self.model.objects.bulk_create([
+            self.model(taken_on=datetime.date(2023, 12, 31), value=1),
+            self.model(taken_on=datetime.date(2024, 1, 1), value=2),
+            self.model(taken_on=datetime.date(2024, 1, 31), value=3),
+            self.model(taken_on=datetime.date(2024, 2, 1), value=4),
+        ])
+        PartitionedQuerySet(self.model).truncate_partitions(datetime.date(2024, 1, 15))
+        self.assertEqual(
+            sorted(self.model.objects.values_list('value', flat=True)),
+            [1, 4],
+        )
+
+    def test_not_partitioned(self):
+        from ..models import Author
+        with self.assertRaises(ValueError):
+            PartitionedQuerySet(Author).truncate_partitions(1)
+
+
+class TestPartitionOptions(TestCase):
+    @isolate_apps('testapp')
+    def test_meta_options_in_migration_state(self):
+        class Reading(models.Model):
+            taken_on = models.DateField()
+
+            class Meta:
+                app_label = 'testapp'
+                partition_scheme = SCHEME
+                partition_field = 'taken_on'
+
+        model_state = ModelState.from_model(Reading)
+        self.assertEqual(model_state.options['partition_scheme'], SCHEME)
+        self.assertEqual(model_state.options['partition_field'], 'taken_on')
+
+        from_state = ProjectState()
+        to_state = ProjectState()
+        to_state.add_model(model_state)
+        changes = MigrationAutodetector(from_state, to_state)._detect_changes()
+        operation = changes['testapp'][0].operations[0]
+        self.assertEqual(operation.options['partition_scheme'], SCHEME)
+
+    @isolate_apps('testapp')
+    def test_unique_without_partition_column(self):
+        class Reading(models.Model):
+            taken_on = models.DateField()
+            serial = models.CharField(max_length=20, unique=True)
+
+            class Meta:
+                app_label = 'testapp'
+                partition_scheme = SCHEME
+                partition_field = 'taken_on'
+
+        with connection.schema_editor(collect_sql=True) as editor:
+            with self.assertRaisesMessage(ValueError, 'must include its partition column taken_on'):
+                editor.create_model(Reading)
+
+    @isolate_apps('testapp')
+    def test_unique_together_with_partition_column(self):
+        class Reading(models.Model):
+            taken_on = models.DateField()
+            serial = models.CharField(max_length=20)
+
+            class Meta:
+                app_label = 'testapp'
+                partition_scheme = SCHEME
+                partition_field = 'taken_on'
+                unique_together = [('serial', 'taken_on')]
+
+        with connection.schema_editor(collect_sql=True) as editor:
+            editor.create_model(Reading)
+        self.assertTrue(any('UNIQUE' in sql for sql in editor.collected_sql))
+
+    @isolate_apps('testapp')
+    def test_foreign_key_to_partitioned_model(self):
+        class Reading(models.Model):
+            taken_on = models.DateField()
+
+            class Meta:
+                app_label = 'testapp'
+                partition_scheme = SCHEME
+                partition_field = 'taken_on'
+
+        class Note(models.Model):
+            reading = models.ForeignKey(Reading, models.CASCADE)
+
+            class Meta:
+                app_label = 'testapp'
+
+        class UnconstrainedNote(models.Model):
+            reading = models.ForeignKey(Reading, models.CASCADE, db_constraint=False)
+
+            class Meta:
+                app_label = 'testapp'
+
+        with connection.schema_editor(collect_sql=True) as editor:
+            with self.assertRaisesMessage(NotSupportedError, 'set db_constraint=False'):
+                editor.create_model(Note)
+            editor.create_model(UnconstrainedNote)
@@ -0,0 +1,151 @@
+import itertools
+import re
+
+from django.test import SimpleTestCase, TestCase
+
+from mssql.regex import translate
+
+from ..models import Author
+
+PATTERNS = [
+    '', 'a', 'abc', '^abc', 'abc$', '^abc$', r'\Aabc', '^$', '^',
+    'a.c', '^a.c$', '^a..', '^.', '.$', '^a.*', '.*c$', '^a.+', '.+c$', 'a.*', '.*a',
+    '^ab*', 'ab+', 'x*y', '^x?y', 'ab?c', '^ab?c$', 'a(bc)?d', '^(ab)?(cd)?$',
+    'a|b', '^a|b$', '^(a|b)c', '^(ab|cd)$', '(^a|b$)', 'x(y|z)?$', '^(?:foo|bar)baz',
+    '[abc]', '^[abc]$', '[^abc]', '^[^abc]', '^[a-c]', '[a-c]$', '^[a-cx-z]+', '[0-9]',
+    '^[0-9]{3}$', '^[0-9]{2,3}$', '^a{2}', '^a{0,2}b', '^a{1,}', 'a{2,}', 'a+$', '.+c', r'^\.', r'a\.c',
+    r'\$', r'^\^', r'\(', r'\[', r'\]', ']', '}', r'\*', r'a\+', r'^\\', r'\n', '\n$', r'^a\nb',
+    '%', '_', '^100%', '^a_b', '^[%_]', r'[\n]', '^[^\n]', r'^a\tb', 'é', '^[à-ÿ]',
+    '^a.*?', '^ab+?', '^ab??c', 'c{2}?',
+]
+
+UNSUPPORTED = [
+    r'\d', r'\w+', r'\s', r'\bword', r'(a)\1', '(?i)abc', '(?=a)', '(?!a)', '^a.*b', '^a+$', 'a.+c',
+    '[[:alpha:]]', '[a-]', '[]a]', '[\\\\]', '^a{,3}', 'a{', '^(a|b)*c$', '(', ')', 'a**',
+    '^(a|b|c|d)(e|f|g|h)(i|j)$', '^[0-9]+$', '^a{1,40}$', r'\x41', '^a{2,}$', 'a?b+c', '^a{3,2}',
+]
+
+STRINGS = [
+    '', 'a', 'b', 'c', 'abc', 'ABC', 'aBc', 'xabc', 'abcx', 'abc\n', 'abc\n\n', '\nabc', 'ab', 'ac', 'abbc',
+    'abd', 'cd', 'abcd', 'ad', 'abcdd', 'y', 'xy', 'xxy', 'xz', 'xyz', 'foobaz', 'barbaz', 'bazbar',
+    '123', '12', '1234', 'a1', 'aa', 'aaa', 'aab', 'b', 'ba', 'a.c', 'a-c', 'a\nc', 'a\nb', 'a\tb', '.a',
+    '$', '^a', '(', '[', ']', '}', '*', 'a+', 'aa+', '\\', '\\a', '\n', '100%', '1000', 'a_b', 'axb',
+    '%', '_x', 'é', 'É', 'àb', 'ÿ', 'zz', 'Z', '[abc]', 'cc', 'ccc', 'x', 'y\n', 'xy\n',
+]
+
+
+def like_to_regex(pattern):
+    """Python equivalent of a LIKE pattern under a binary collation."""
+    regex = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if char == '%':
+            regex.append('.*')
+        elif char == '_':
+            regex.append('.')
+        elif char == '[':
+            end = pattern.index(']', i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith('^'):
+                regex.append('[^%s]' % re.escape(body[1:]).replace('\\-', '-'))
+            else:
+                regex.append('[%s]' % re.escape(body).replace('\\-', '-'))
+            i = end
+        elif char == '\\':
+            i += 1
+            regex.append(re.escape(pattern[i]))
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return re.compile(''.join(regex) + r'\Z', re.DOTALL)
+
+
+def like(string, pattern):
+    return like_to_regex(pattern).match(string) is not None
+
+
+class TestRegexTranslation(SimpleTestCase):
+    def assertEquivalent(self, pattern, case_insensitive):
+        patterns = translate(pattern, case_insensitive=case_insensitive)
+        self.assertIsNotNone(patterns, pattern)
+        flags = re.IGNORECASE if case_insensitive else 0
+        for string in STRINGS:
+            if case_insensitive and not string.isascii():
+                continue
+            subject = string.upper() if case_insensitive else string
+            expected = re.search(pattern, string, flags) is not None
+            with self.subTest(pattern=pattern, string=string, case_insensitive=case_insensitive):
+                self.assertEqual(any(like(subject, like_pattern) for like_pattern, _ in patterns), expected)
+                for like_pattern, prefix in patterns:
+                    if prefix and like(subject, like_pattern):
+                        self.assertTrue(like(string, prefix))
+
+    def test_regex(self):
+        for pattern in PATTERNS:
+            self.assertEquivalent(pattern, case_insensitive=False)
+
+    def test_iregex(self):
+        for pattern in PATTERNS:
+            if pattern.isascii():
+                self.assertEquivalent(pattern, case_insensitive=True)
+
+    def test_unsupported(self):
+        for pattern in UNSUPPORTED:
+            with self.subTest(pattern=pattern):
+                self.assertIsNone(translate(pattern))
+
+    def test_iregex_unsupported(self):
+        for pattern in ('é', '^[à-ÿ]', '[A-z]', '[0-z]'):
+            with self.subTest(pattern=pattern):
+                self.assertIsNone(translate(pattern, case_insensitive=True))
+
+    def test_prefix(self):
+        self.assertEqual(translate('^abc'), [('abc%', 'abc%')])
+        self.assertEqual(translate('^ab[cd]e'), [('ab[cd]e%', 'ab%')])
+        self.assertEqual(translate('^100%'), [('100[%]%', '100[%]%')])
+        self.assertEqual(translate('abc'), [('%abc%', None)])
+        self.assertEqual(translate('^abc', case_insensitive=True), [('ABC%', None)])
+
+    def test_end_anchors(self):
+        # Like $, .NET's \Z also matches before a final newline, \z doesn't.
+        self.assertEqual(translate(r'abc\Z'), translate('abc$'))
+        self.assertEqual(translate(r'^abc\z'), [('abc', 'abc%')])
+
+    def test_expansion(self):
+        patterns = [pattern for pattern, _ in translate('^(ab|cd)$')]
+        self.assertEqual(patterns, ['ab', 'ab\n', 'cd', 'cd\n'])
+        self.assertEqual(list(itertools.chain(*translate('^a.+'))), ['a[^\n]%', 'a%'])
+
+
+class TestRegexLookup(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Author.objects.bulk_create(Author(name=name) for name in STRINGS if name)
+
+    def assertMatches(self, lookup, pattern):
+        flags = re.IGNORECASE if lookup == 'iregex' else 0
+        self.assertEqual(
+            sorted(Author.objects.filter(**{'name__%s' % lookup: pattern}).values_list('name', flat=True)),
+            sorted(name for name in STRINGS if name and re.search(pattern, name, flags)),
+        )
+
+    def test_translated(self):
+        for pattern in ('^abc', 'abc$', '^a.c$', '^[0-9]{3}$', '^(foo|bar)baz', 'a_b', '^100%', r'^\\'):
+            with self.subTest(pattern=pattern):
+                sql = str(Author.objects.filter(name__regex=pattern).query)
+                self.assertNotIn('REGEXP_LIKE', sql)
+                self.assertMatches('regex', pattern)
+        for pattern in ('^abc', '^[a-c]', 'x(y|z)?$'):
+            with self.subTest(pattern=pattern):
+                self.assertMatches('iregex', pattern)
+
+    def test_sargable_prefix(self):
+        sql = str(Author.objects.filter(name__regex='^abc').query)
+        self.assertIn('[testapp_author].[name] LIKE abc%', sql)
+        self.assertIn('[testapp_author].[name] COLLATE Latin1_General_100_BIN2 LIKE abc%', sql)
+
+    def test_fallback(self):
+        sql = str(Author.objects.filter(name__regex=r'^\d+$').query)
+        self.assertIn('REGEXP_LIKE', sql)
+        self.assertNotIn('COLLATE', sql)
@@ -0,0 +1,453 @@
+from unittest import mock
+
+from django.db import DatabaseError, NotSupportedError, connection, migrations, models, transaction
+from django.db.backends.ddl_references import Columns, Statement as DjStatement, Table
+from django.db.migrations.migration import Migration
+from django.db.migrations.state import ProjectState
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext, isolate_apps
+
+from mssql.migration_operations import AlterFieldOnline
+from mssql.schema import DeferredSQL, Statement
+
+from . import get_constraints
+
+
+class CountingName:
+    """Index name part counting how often it's rendered."""
+    renders = 0
+
+    def __init__(self, name):
+        self.name = name
+
+    def rename_column_references(self, table, old_column, new_column):
+        self.name = self.name.replace(old_column, new_column)
+
+    def __str__(self):
+        CountingName.renders += 1
+        return '[%s]' % self.name
+
+
+def quote_name(name):
+    return '[%s]' % name
+
+
+def index_statement(column):
+    return Statement(
+        'CREATE INDEX %(name)s ON %(table)s (%(columns)s)%(condition)s',
+        name=CountingName('idx_%s' % column),
+        table=Table('testapp_table', quote_name),
+        columns=Columns('testapp_table', [column], quote_name),
+        condition='',
+    )
+
+
+class TestDeferredSQL(SimpleTestCase):
+    def test_ordered_set(self):
+        statements = [index_statement('c%d' % i) for i in range(5)]
+        deferred = DeferredSQL(statements)
+        deferred.append('ALTER TABLE [testapp_table] ADD [c] int')
+        deferred.append(index_statement('c1'))
+        self.assertEqual(list(deferred), statements + ['ALTER TABLE [testapp_table] ADD [c] int'])
+        deferred.remove(statements[2])
+        self.assertNotIn(statements[2], deferred)
+        self.assertEqual(len(deferred), 5)
+        with self.assertRaises(ValueError):
+            deferred.remove(statements[2])
+
+    def test_rendering_memoized(self):
+        statements = [index_statement('c%d' % i) for i in range(100)]
+        deferred = DeferredSQL(statements)
+        CountingName.renders = 0
+        for statement in statements:
+            self.assertIn(statement, deferred)
+            self.assertTrue(deferred.contains_sql(str(statement)))
+        deferred.remove(statements[50])
+        self.assertEqual(CountingName.renders, 0)
+
+    def test_rename_invalidates(self):
+        statement = index_statement('old')
+        deferred = DeferredSQL([statement, index_statement('other')])
+        self.assertTrue(deferred.contains_sql('CREATE INDEX [idx_old] ON [testapp_table] ([old])'))
+        statement.rename_column_references('testapp_table', 'old', 'new')
+        self.assertEqual(str(statement), 'CREATE INDEX [idx_new] ON [testapp_table] ([new])')
+        self.assertIn(statement, deferred)
+        self.assertTrue(deferred.contains_sql(str(statement)))
+        self.assertFalse(deferred.contains_sql('CREATE INDEX [idx_old] ON [testapp_table] ([old])'))
+        deferred.remove(statement)
+        self.assertEqual(len(deferred), 1)
+
+    def test_rename_rekeys_only_renamed_statement(self):
+        statements = [index_statement('c%d' % i) for i in range(100)]
+        deferred = DeferredSQL(statements)
+        other = DeferredSQL([index_statement('other')])
+        CountingName.renders = 0
+        statements[10].rename_column_references('testapp_table', 'c10', 'renamed')
+        other.append(index_statement('more'))
+        deferred.remove(statements[50])
+        self.assertTrue(deferred.contains_sql('CREATE INDEX [idx_renamed] ON [testapp_table] ([renamed])'))
+        # Only the renamed and the new statement render, for their key and SQL
+        self.assertEqual(CountingName.renders, 2 + 2)
+        self.assertEqual(list(deferred)[10], statements[10])
+
+    def test_rename_to_duplicate(self):
+        statement = index_statement('old')
+        deferred = DeferredSQL([index_statement('new'), statement])
+        statement.rename_column_references('testapp_table', 'old', 'new')
+        self.assertEqual(len(deferred), 1)
+
+    def test_django_statement_renamed(self):
+        statement = DjStatement('DROP INDEX %(table)s', table=Table('testapp_table', quote_name))
+        deferred = DeferredSQL([statement])
+        statement.rename_table_references('testapp_table', 'testapp_other')
+        self.assertTrue(deferred.contains_sql('DROP INDEX [testapp_other]'))
+        self.assertFalse(deferred.contains_sql('DROP INDEX [testapp_table]'))
+
+    def test_parts_replaced(self):
+        statement = index_statement('old')
+        deferred = DeferredSQL([statement])
+        self.assertEqual(str(statement), 'CREATE INDEX [idx_old] ON [testapp_table] ([old])')
+        statement.parts['condition'] = ' WHERE [old] IS NOT NULL'
+        self.assertEqual(str(statement), 'CREATE INDEX [idx_old] ON [testapp_table] ([old]) WHERE [old] IS NOT NULL')
+        self.assertTrue(deferred.contains_sql(str(statement)))
+
+
+@skipUnlessDBFeature('supports_session_context')
+@mock.patch.dict(connection.settings_dict['OPTIONS'], {'ddl_batch_size': 50})
+class TestDDLBatches(TestCase):
+    def batches(self, captured):
+        return [query['sql'] for query in captured if query['sql'].startswith('BEGIN TRY')]
+
+    @isolate_apps('testapp')
+    def test_create_models(self):
+        class Parent(models.Model):
+            class Meta:
+                app_label = 'testapp'
+
+        class Child(models.Model):
+            parent = models.ForeignKey(Parent, models.CASCADE)
+            name = models.CharField(max_length=10, db_index=True)
+
+            class Meta:
+                app_label = 'testapp'
+
+        with CaptureQueriesContext(connection) as captured:
+            with connection.schema_editor() as editor:
+                editor.create_model(Parent)
+                editor.create_model(Child)
+        # One batch per model, then one with the deferred index and foreign key
+        self.assertEqual(len(self.batches(captured)), 3)
+        self.assertFalse([query for query in captured if query['sql'].startswith('CREATE')])
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Child._meta.db_table)
+        self.assertTrue(any(c['foreign_key'] for c in constraints.values()))
+        self.assertTrue(any(c['index'] and c['columns'] == ['name'] for c in constraints.values()))
+
+    def test_batch_size(self):
+        with CaptureQueriesContext(connection) as captured:
+            with connection.schema_editor() as editor, editor.batch():
+                for i in range(120):
+                    editor.execute('CREATE TABLE [testapp_batch_%d] ([id] int)' % i)
+        self.assertEqual(len(self.batches(captured)), 3)
+
+    def test_params_formatting(self):
+        with connection.schema_editor() as editor, editor.batch():
+            # As when run on their own, '%%' stands for '%' unless params is None
+            editor.execute("CREATE TABLE [testapp_batch] ([name] nvarchar(10) DEFAULT '%%')")
+            editor.execute("CREATE TABLE [testapp_batch_raw] ([name] nvarchar(10) DEFAULT '%')", params=None)
+            self.assertEqual([sql for sql, _ in editor._ddl_batch], [
+                "CREATE TABLE [testapp_batch] ([name] nvarchar(10) DEFAULT '%')",
+                "CREATE TABLE [testapp_batch_raw] ([name] nvarchar(10) DEFAULT '%')",
+            ])
+
+    def test_error_names_statement(self):
+        with self.assertRaises(DatabaseError) as cm, transaction.atomic():
+            with connection.schema_editor() as editor, editor.batch():
+                editor.execute('CREATE TABLE [testapp_batch] ([id] int)')
+                editor.execute('CREATE TABLE [testapp_batch] ([id] int)')
+                editor.execute('DROP TABLE [testapp_batch]')
+        self.assertIn('Statement 2 of 3 in the DDL batch failed: CREATE TABLE [testapp_batch]', str(cm.exception))
+
+    def test_statements_returning_results_flush_the_batch(self):
+        with connection.schema_editor() as editor, editor.batch():
+            editor.execute('CREATE TABLE [testapp_batch] ([id] int)')
+            rows = editor.execute("SELECT COUNT(*) FROM sys.tables WHERE name = 'testapp_batch'", has_result=True)
+            self.assertEqual(rows[0][0], 1)
+
+
+@isolate_apps('testapp')
+class TestAddField(TransactionTestCase):
+    def setUp(self):
+        class Reading(models.Model):
+            class Meta:
+                app_label = 'testapp'
+
+        self.model = Reading
+        with connection.schema_editor() as editor:
+            editor.create_model(Reading)
+        Reading.objects.bulk_create(Reading() for _ in range(5))
+
+    def tearDown(self):
+        with connection.schema_editor() as editor:
+            editor.delete_model(self.model)
+
+    def add_field(self, field, batch_size=2, atomic=False):
+        field.set_attributes_from_name('value')
+        with mock.patch.object(connection.features, 'supports_metadata_only_add_column', False), \
+                mock.patch.dict(connection.settings_dict['OPTIONS'], {'backfill_batch_size': batch_size}), \
+                CaptureQueriesContext(connection) as captured, connection.schema_editor(atomic=atomic) as editor:
+            editor.add_field(self.model, field)
+        updates = [query['sql'] for query in captured if query['sql'].startswith('UPDATE')]
+        return editor.add_field_paths[(self.model._meta.db_table, 'value')], updates
+
+    def column(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT DISTINCT [value] FROM %s" % self.model._meta.db_table)
+            values = [row[0] for row in cursor.fetchall()]
+            description = connection.introspection.get_table_description(cursor, self.model._meta.db_table)
+        return values, next(column for column in description if column.name == 'value')
+
+    def test_backfill(self):
+        path, updates = self.add_field(models.PositiveIntegerField(default=3))
+        self.assertEqual(path, 'backfill')
+        self.assertEqual(len(updates), 3)
+        values, column = self.column()
+        self.assertEqual(values, [3])
+        self.assertFalse(column.null_ok)
+        # The CHECK constraint of the positive integer is enforced
+        with self.assertRaises(DatabaseError), transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute('UPDATE %s SET [value] = -1' % self.model._meta.db_table)
+
+    def test_atomic_block(self):
+        # The chunks couldn't commit on their own
+        path, updates = self.add_field(models.IntegerField(default=3), atomic=True)
+        self.assertEqual(path, 'size-of-data')
+        self.assertEqual(updates, [])
+        self.assertEqual(self.column()[0], [3])
+
+    def test_backfill_nullable(self):
+        path, updates = self.add_field(models.CharField(max_length=10, default='x', null=True))
+        self.assertEqual(path, 'backfill')
+        values, column = self.column()
+        self.assertEqual(values, ['x'])
+        self.assertTrue(column.null_ok)
+
+    def test_small_table(self):
+        path, updates = self.add_field(models.IntegerField(default=3), batch_size=10)
+        self.assertEqual(path, 'size-of-data')
+        self.assertEqual(updates, [])
+        self.assertEqual(self.column()[0], [3])
+
+    def test_no_default(self):
+        path, updates = self.add_field(models.IntegerField(null=True))
+        self.assertEqual(path, 'metadata-only')
+        self.assertEqual(updates, [])
+
+    def test_metadata_only(self):
+        field = models.IntegerField(default=3)
+        field.set_attributes_from_name('value')
+        with mock.patch.object(connection.features, 'supports_metadata_only_add_column', True), \
+                connection.schema_editor() as editor:
+            editor.add_field(self.model, field)
+        self.assertEqual(editor.add_field_paths[(self.model._meta.db_table, 'value')], 'metadata-only')
+        self.assertEqual(self.column()[0], [3])
+
+
+@isolate_apps('testapp')
+class TestAlterFieldDependents(TestCase):
+    def setUp(self):
+        class Tag(models.Model):
+            class Meta:
+                app_label = 'testapp'
+
+        class Label(models.Model):
+            name = models.CharField(max_length=20, db_index=True)
+            code = models.CharField(max_length=10, unique=True)
+            size = models.IntegerField(db_index=True)
+            tag = models.ForeignKey(Tag, models.CASCADE, null=True)
+
+            class Meta:
+                app_label = 'testapp'
+                unique_together = [('name', 'size')]
+
+        self.tag, self.model = Tag, Label
+        with connection.schema_editor() as editor:
+            editor.create_model(Tag)
+            editor.create_model(Label)
+
+    def alter(self, name, new_field):
+        old_field = self.model._meta.get_field(name)
+        new_field.set_attributes_from_name(name)
+        new_field.model = self.model
+        with connection.schema_editor() as editor:
+            plan = editor.alter_field_plan(self.model, old_field, new_field, strict=True)
+            editor.alter_field(self.model, old_field, new_field, strict=True)
+        return plan
+
+    def constraints(self):
+        with connection.cursor() as cursor:
+            return connection.introspection.get_constraints(cursor, self.model._meta.db_table)
+
+    def test_lengthen_keeps_indexes(self):
+        before = self.constraints()
+        plan = self.alter('name', models.CharField(max_length=50, db_index=True))
+        self.assertEqual(plan.dropped, [])
+        self.assertEqual(self.constraints(), before)
+        plan = self.alter('code', models.CharField(max_length=20, unique=True))
+        self.assertEqual(plan.dropped, [])
+        self.assertEqual(self.constraints(), before)
+
+    def test_nullability_keeps_indexes(self):
+        before = set(self.constraints())
+        plan = self.alter('name', models.CharField(max_length=20, db_index=True, null=True))
+        self.assertEqual(plan.dropped, [])
+        self.assertEqual(set(self.constraints()), before)
+
+    def test_nullability_of_unique_column(self):
+        plan = self.alter('code', models.CharField(max_length=10, unique=True, null=True))
+        self.assertTrue(plan.dropped)
+        unique = [c for c in self.constraints().values() if c['unique'] and c['columns'] == ['code']]
+        self.assertEqual(len(unique), 1)
+        # The filtered unique index lets several rows leave the column NULL
+        self.model.objects.create(name='a', code=None, size=1)
+        self.model.objects.create(name='b', code=None, size=2)
+
+    def test_nullability_keeps_foreign_key(self):
+        fk_names = [name for name, c in self.constraints().items() if c['foreign_key']]
+        plan = self.alter('tag', models.ForeignKey(self.tag, models.CASCADE))
+        self.assertEqual(plan.dropped, [])
+        self.assertEqual([name for name, c in self.constraints().items() if c['foreign_key']], fk_names)
+
+    def test_type_change_drops_dependent_indexes(self):
+        plan = self.alter('size', models.BigIntegerField(db_index=True))
+        dropped = {name for _, name in plan.dropped}
+        constraints = self.constraints()
+        self.assertTrue(dropped)
+        # Only the indexes on the column, which are created again
+        self.assertFalse(any(c['columns'] == ['code'] for name, c in constraints.items() if name in dropped))
+        self.assertTrue(any(c['index'] and c['columns'] == ['size'] for c in constraints.values()))
+        self.assertTrue(any(c['unique'] and c['columns'] == ['name', 'size'] for c in constraints.values()))
+
+    def test_plan_leaves_database_alone(self):
+        before = self.constraints()
+        old_field = self.model._meta.get_field('size')
+        new_field = models.BigIntegerField(db_index=True)
+        new_field.set_attributes_from_name('size')
+        with connection.schema_editor() as editor:
+            plan = editor.alter_field_plan(self.model, old_field, new_field)
+        self.assertTrue(any(statement.startswith('ALTER TABLE') for statement in plan.statements))
+        self.assertEqual(self.constraints(), before)
+
+
+class TestAlterFieldOnline(TransactionTestCase):
+    table = 'testapp_counter'
+
+    def _apply(self, state, *operations):
+        migration = Migration('name', 'testapp')
+        migration.operations = operations
+        migration.atomic = False
+        with connection.schema_editor(atomic=False) as editor:
+            return migration.apply(state, editor)
+
+    def setUp(self):
+        # testapp.settings enables return_rows_bulk_insert, which online
+        # alters refuse; test_return_rows_bulk_insert covers that.
+        patcher = mock.patch.object(connection.features, 'can_return_rows_from_bulk_insert', False)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.state = self._apply(ProjectState(), migrations.CreateModel(
+            'Counter',
+            [
+                ('id', models.AutoField(primary_key=True)),
+                ('value', models.IntegerField(db_index=True)),
+                ('name', models.CharField(max_length=10)),
+            ],
+            options={'unique_together': [('name', 'value')]},
+        ))
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                'INSERT INTO %s (value, name) VALUES (%%s, %%s)' % self.table,
+                [(i, 'n%d' % i) for i in range(10)],
+            )
+
+    def tearDown(self):
+        with connection.schema_editor() as editor:
+            editor.delete_model(self.state.apps.get_model('testapp', 'Counter'))
+
+    def test_alter_field_online(self):
+        before = get_constraints(self.table)
+        with CaptureQueriesContext(connection) as captured:
+            self._apply(self.state, AlterFieldOnline(
+                'Counter', 'value', models.BigIntegerField(db_index=True), batch_size=3,
+            ))
+        updates = [query['sql'] for query in captured if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 4)
+        self.assertFalse([query['sql'] for query in captured if 'ALTER COLUMN [value]' in query['sql']])
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT value FROM %s ORDER BY id' % self.table)
+            self.assertEqual([row[0] for row in cursor.fetchall()], list(range(10)))
+            description = connection.introspection.get_table_description(cursor, self.table)
+        column = next(column for column in description if column.name == 'value')
+        self.assertEqual(connection.introspection.get_field_type(column.type_code, column), 'BigIntegerField')
+        self.assertFalse(column.null_ok)
+        self.assertEqual(set(get_constraints(self.table)), set(before))
+
+    def test_resume(self):
+        model = self.state.apps.get_model('testapp', 'Counter')
+        old_field = model._meta.get_field('value')
+        new_field = models.BigIntegerField(db_index=True)
+        new_field.set_attributes_from_name('value')
+        # Interrupted after the backfill
+        with connection.schema_editor(atomic=False) as editor:
+            with mock.patch.object(editor, '_index_options_sql', side_effect=DatabaseError('interrupted')):
+                with self.assertRaises(DatabaseError):
+                    editor.alter_field_online(model, old_field, new_field, batch_size=4)
+        with connection.cursor() as cursor:
+            cursor.execute('INSERT INTO %s (value, name) VALUES (42, %%s)' % self.table, ['new'])
+        with CaptureQueriesContext(connection) as captured, connection.schema_editor(atomic=False) as editor:
+            editor.alter_field_online(model, old_field, new_field, batch_size=4)
+        # Rows copied before the interruption aren't copied again
+        updates = [query['sql'] for query in captured if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT value FROM %s WHERE name = %%s' % self.table, ['new'])
+            self.assertEqual(cursor.fetchone()[0], 42)
+
+    def test_not_null_without_scan(self):
+        with mock.patch.object(connection.features, 'supports_metadata_only_add_column', True), \
+                CaptureQueriesContext(connection) as captured:
+            self._apply(self.state, AlterFieldOnline(
+                'Counter', 'value', models.BigIntegerField(db_index=True, default=0),
+            ))
+        # The shadow column is added NOT NULL with a constant default, which
+        # is dropped by the swap
+        self.assertFalse([query['sql'] for query in captured if 'ALTER COLUMN [value__online]' in query['sql']])
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT value FROM %s ORDER BY id' % self.table)
+            self.assertEqual([row[0] for row in cursor.fetchall()], list(range(10)))
+            description = connection.introspection.get_table_description(cursor, self.table)
+            cursor.execute(
+                "SELECT COUNT(*) FROM sys.default_constraints WHERE parent_object_id = OBJECT_ID(%s)", [self.table],
+            )
+            self.assertEqual(cursor.fetchone()[0], 0)
+        self.assertFalse(next(column for column in description if column.name == 'value').null_ok)
+
+    def test_return_rows_bulk_insert(self):
+        with mock.patch.object(connection.features, 'can_return_rows_from_bulk_insert', True), \
+                self.assertRaisesMessage(NotSupportedError, 'return_rows_bulk_insert'):
+            self._apply(self.state, AlterFieldOnline('Counter', 'value', models.BigIntegerField(db_index=True)))
+
+    def test_not_supported(self):
+        with self.assertRaisesMessage(NotSupportedError, 'must not be renamed'):
+            self._apply(self.state, AlterFieldOnline(
+                'Counter', 'value', models.BigIntegerField(db_index=True, db_column='amount'),
+            ))
+        with self.assertRaisesMessage(NotSupportedError, 'must not be a primary key'):
+            self._apply(self.state, AlterFieldOnline('Counter', 'id', models.BigAutoField(primary_key=True)))
+
+    def test_requires_non_atomic_migration(self):
+        migration = Migration('name', 'testapp')
+        migration.operations = [AlterFieldOnline('Counter', 'value', models.BigIntegerField(db_index=True))]
+        with self.assertRaises(transaction.TransactionManagementError):
+            with connection.schema_editor() as editor:
+                migration.apply(self.state, editor)
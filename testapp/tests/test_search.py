@@ -0,0 +1,125 @@
+import time
+
+from django.db import NotSupportedError, connection
+from django.db.models import Q
+from django.db.transaction import TransactionManagementError
+from django.test import TestCase, TransactionTestCase, skipUnlessDBFeature
+
+from mssql.indexes import FullTextIndex
+from mssql.search import FullTextRank
+
+from ..models import Author
+
+
+class TestFullTextSQL(TestCase):
+    def test_contains_ft_lookup(self):
+        sql = str(Author.objects.filter(name__contains_ft='"data*"').query)
+        self.assertIn('CONTAINS([testapp_author].[name], ', sql)
+        self.assertNotIn('LIKE', sql)
+
+    def test_freetext_lookup(self):
+        sql = str(Author.objects.filter(name__freetext='database').query)
+        self.assertIn('FREETEXT([testapp_author].[name], ', sql)
+
+    def test_rank(self):
+        sql = str(Author.objects.annotate(rank=FullTextRank('name', 'database')).query)
+        self.assertIn('CONTAINSTABLE([testapp_author], [name], ', sql)
+        self.assertIn('[ft_rank].[KEY] = [testapp_author].[id]', sql)
+        sql = str(Author.objects.annotate(rank=FullTextRank('name', 'database', freetext=True)).query)
+        self.assertIn('FREETEXTTABLE([testapp_author], [name], ', sql)
+
+    def test_rank_requires_field(self):
+        with self.assertRaises(ValueError):
+            str(Author.objects.annotate(rank=FullTextRank(FullTextRank('name', 'x'), 'x')).query)
+
+    def test_index_sql(self):
+        index = FullTextIndex(fields=['name'], name='author_name_ft', catalog='books', language=1033)
+        with connection.schema_editor(collect_sql=True) as editor:
+            editor.add_index(Author, index)
+            editor.remove_index(Author, index)
+        create_sql, delete_sql = editor.collected_sql
+        self.assertIn("CREATE FULLTEXT CATALOG [books]", create_sql)
+        self.assertIn('CREATE FULLTEXT INDEX ON [testapp_author] ([name] LANGUAGE 1033)', create_sql)
+        self.assertIn('WITH CHANGE_TRACKING = AUTO', create_sql)
+        self.assertEqual(delete_sql, 'DROP FULLTEXT INDEX ON [testapp_author];')
+
+    def test_index_sql_quotes_names(self):
+        index = FullTextIndex(fields=['name'], name='author_name_ft', catalog="o'brien", language='British English')
+        with connection.schema_editor(collect_sql=True) as editor:
+            editor.add_index(Author, index)
+        create_sql = editor.collected_sql[0]
+        self.assertIn("WHERE name = 'o''brien'", create_sql)
+        self.assertIn("EXEC(N'CREATE FULLTEXT CATALOG [o''brien]')", create_sql)
+        self.assertIn("N' ON [o''brien] WITH", create_sql)
+        self.assertIn("([name] LANGUAGE ''British English'')", create_sql)
+
+    def test_index_options_not_supported(self):
+        for options in ({'db_tablespace': 'fg'}, {'condition': Q(name='a')}, {'include': ['id']}):
+            with self.subTest(**options), self.assertRaises(ValueError):
+                FullTextIndex(fields=['name'], name='author_name_ft', **options)
+
+    def test_index_in_transaction(self):
+        index = FullTextIndex(fields=['name'], name='author_name_ft')
+        with self.assertRaises(TransactionManagementError):
+            with connection.schema_editor() as editor:
+                editor.add_index(Author, index)
+
+    def test_index_deconstruct(self):
+        index = FullTextIndex(fields=['name'], name='author_name_ft', catalog='books')
+        path, args, kwargs = index.deconstruct()
+        self.assertEqual(path, 'mssql.indexes.FullTextIndex')
+        self.assertEqual(kwargs, {'fields': ['name'], 'name': 'author_name_ft', 'catalog': 'books'})
+        self.assertEqual(index, index.clone())
+
+
+@skipUnlessDBFeature('supports_fulltext_search')
+class TestFullTextSearch(TransactionTestCase):
+    def setUp(self):
+        Author.objects.bulk_create([
+            Author(name='Database systems'),
+            Author(name='Databases and database design'),
+            Author(name='Gardening'),
+        ])
+        self.index = FullTextIndex(fields=['name'], name='author_name_ft')
+        with connection.schema_editor(atomic=False) as editor:
+            editor.add_index(Author, self.index)
+        self.wait_for_population()
+
+    def tearDown(self):
+        with connection.schema_editor(atomic=False) as editor:
+            editor.remove_index(Author, self.index)
+
+    def wait_for_population(self):
+        with connection.cursor() as cursor:
+            for _ in range(300):
+                cursor.execute(
+                    "SELECT OBJECTPROPERTYEX(OBJECT_ID('testapp_author'), 'TableFulltextPopulateStatus')"
+                )
+                if cursor.fetchone()[0] == 0:
+                    return
+                time.sleep(0.1)
+        self.fail('Full-text population did not complete.')
+
+    def test_contains_ft(self):
+        self.assertQuerysetEqual(
+            Author.objects.filter(name__contains_ft='"databas*"').order_by('name'),
+            ['Database systems', 'Databases and database design'],
+            lambda author: author.name,
+        )
+
+    def test_freetext(self):
+        self.assertFalse(Author.objects.filter(name__freetext='gardening').exclude(name='Gardening').exists())
+        self.assertTrue(Author.objects.filter(name__freetext='gardening').exists())
+
+    def test_rank(self):
+        authors = list(Author.objects.annotate(rank=FullTextRank('name', 'database')).order_by('-rank', 'name'))
+        self.assertEqual(authors[-1].name, 'Gardening')
+        self.assertEqual(authors[-1].rank, 0)
+        self.assertGreater(authors[0].rank, 0)
+
+
+class TestNotSupported(TestCase):
+    def test_other_vendor(self):
+        lookup = Author._meta.get_field('name').get_lookup('contains_ft')
+        with self.assertRaises(NotSupportedError):
+            lookup(Author._meta.get_field('name').get_col('t'), 'x').as_sql(None, None)
@@ -3,8 +3,10 @@
 
 import datetime
 from django.db import connection
-from django.test import TestCase
+from django.db.models.functions import ExtractHour, TruncDay
+from django.test import TestCase, skipUnlessDBFeature
 from django.test.utils import override_settings
+from django.utils import timezone
 
 from ..models import TimeZone
 
@@ -105,3 +107,31 @@ class TestDateTimeToDateTimeOffsetMigration(TestCase):
             # Migrate back to DATETIME2 for other unit tests
             with connection.schema_editor() as cursor:
                 cursor.execute("ALTER TABLE [testapp_timezone] ALTER column [date] datetime2")
+
+
+@override_settings(USE_TZ=True)
+class TestAtTimeZone(TestCase):
+
+    def test_dst_aware_extract(self):
+        winter = TimeZone.objects.create(date=datetime.datetime(2022, 1, 15, 12, tzinfo=datetime.timezone.utc))
+        summer = TimeZone.objects.create(date=datetime.datetime(2022, 7, 15, 12, tzinfo=datetime.timezone.utc))
+        with timezone.override('America/New_York'):
+            hours = dict(TimeZone.objects.annotate(hour=ExtractHour('date')).values_list('id', 'hour'))
+        if connection.features.has_zoneinfo_database:
+            self.assertEqual(hours, {winter.id: 7, summer.id: 8})
+        else:
+            # Fixed offset fallback
+            self.assertEqual(hours[winter.id], hours[summer.id])
+
+    @skipUnlessDBFeature('has_zoneinfo_database')
+    def test_sql(self):
+        with timezone.override('Europe/Paris'):
+            sql = str(TimeZone.objects.annotate(day=TruncDay('date')).query)
+        self.assertIn("AT TIME ZONE 'UTC' AT TIME ZONE 'Romance Standard Time'", sql)
+        self.assertNotIn('DATEADD(second', sql)
+
+    @skipUnlessDBFeature('has_zoneinfo_database')
+    def test_windows_time_zone(self):
+        self.assertEqual(connection.ops._get_windows_time_zone('Asia/Kolkata'), 'India Standard Time')
+        self.assertEqual(connection.ops._get_windows_time_zone('UTC'), 'UTC')
+        self.assertIsNone(connection.ops._get_windows_time_zone('Mars/Olympus_Mons'))